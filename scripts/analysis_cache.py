@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Analysis Cache
+Tech-stack results keyed by git tree/blob SHAs, so unchanged repositories
+skip analysis and a changed repository only re-scans the blobs that changed
+"""
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+
+CACHE_DIR = os.environ.get("ANALYSIS_CACHE_DIR", ".cache/analysis")
+MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "50000"))
+
+
+def rules_version(*rules):
+    """Fingerprint of the detection rules; any change invalidates cached results"""
+    text = json.dumps(rules, sort_keys=True, default=sorted)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def digest(value):
+    """Stable key for JSON-serialisable analysis inputs"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def git_blob_sha(data):
+    """The SHA git assigns to a blob with this content"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _git(args, cwd):
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def tree_sha(repo_path):
+    """SHA of HEAD's tree for this directory of a checkout, or None outside git"""
+    out = _git(['rev-parse', 'HEAD:./'], repo_path)
+    return out.strip() if out else None
+
+
+def blob_shas(repo_path):
+    """{path: blob SHA} for every tracked file, read from the index (no blobs needed)"""
+    out = _git(['ls-files', '-s', '-z'], repo_path)
+    shas = {}
+    for record in (out or '').split('\0'):
+        if '\t' in record:
+            meta, path = record.split('\t', 1)
+            shas[path] = meta.split()[1]
+    return shas
+
+
+class AnalysisCache:
+    """Persistent LRU map of content key -> analysis result for one analyzer
+
+    Results are only valid for the rules version they were computed with;
+    a file written under other rules is discarded on load.
+    """
+
+    def __init__(self, name, version, directory=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.path = os.path.join(directory, f"{name}.json")
+        self.version = version
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == version:
+            self.entries = data.get('entries', {})
+        else:
+            self.stats["invalidated"] = len(data.get('entries', {}))
+            self._dirty = True
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            entry[0] = time.time()
+            self._dirty = True
+            return entry[1]
+
+    def put(self, key, result):
+        with self._lock:
+            self.entries[key] = [time.time(), result]
+            self.stats["stores"] += 1
+            self._dirty = True
+
+    def save(self):
+        """Evict least-recently-used entries over the bound and write atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            excess = len(self.entries) - self.max_entries
+            if excess > 0:
+                for key, _ in sorted(self.entries.items(), key=lambda item: item[1][0])[:excess]:
+                    del self.entries[key]
+                self.stats["evictions"] += excess
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.version, "entries": self.entries}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = 100.0 * self.stats["hits"] / lookups if lookups else 0.0
+        text = (f"Analysis cache: {self.stats['hits']}/{lookups} hits ({rate:.0f}%), "
+                f"{self.stats['stores']} stored, {self.stats['evictions']} evicted, {len(self.entries)} entries")
+        if self.stats["invalidated"]:
+            text += f", {self.stats['invalidated']} invalidated by a rules change"
+        return text
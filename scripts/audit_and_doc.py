@@ -1,56 +1,55 @@
-import urllib.request
-import urllib.error
-import json
 import os
-import sys
-import time
+import base64
+import argparse
+from pathlib import Path
+
+import incremental
+from doc_shards import INDEX_FILE, PROJECTS_FILE, SHARD_DIR, DocShards
+from github_client import GitHubClient
+from http_cache import ResponseCache
+from language_stats import mirror_language_bytes
+from mirror_store import MirrorError, MirrorStore
 
 # Configuration
 USERNAME = "vaishnavak2001"
-OUTPUT_FILE = "_data/projects.json"
+OUTPUT_FILE = PROJECTS_FILE
+STATE_DIR = incremental.STATE_DIR
 TOKEN = os.environ.get("GITHUB_TOKEN")
+LANGUAGE_WORKSPACE = Path("C:/temp/audit_languages")
+GENERATOR = "audit_and_doc"
+
+client = GitHubClient(token=TOKEN, cache=ResponseCache())
 
 def get_headers():
-    headers = {"User-Agent": "Portfolio-Audit-Agent"}
-    if TOKEN:
-        headers["Authorization"] = f"token {TOKEN}"
-    return headers
-
-def fetch_repos(page=1):
-    url = f"https://api.github.com/users/{USERNAME}/repos?per_page=100&page={page}"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        print(f"Error fetching repos: {e}")
-        if e.code == 403:
-            print("Rate limit exceeded. Please provide GITHUB_TOKEN.")
-        return []
+    return client.get_headers()
+
+def fetch_repos():
+    """Stream every repository; pages after the first are fetched concurrently"""
+    return client.iter_pages(f"/users/{USERNAME}/repos")
 
 def get_readme_content(repo_name, default_branch):
-    # Try fetching README.md, Readme.md, README.txt etc.
-    # Standard GitHub API for README
-    url = f"https://api.github.com/repos/{USERNAME}/{repo_name}/readme"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode())
-            # Content is base64 encoded
-            import base64
-            content = base64.b64decode(data['content']).decode('utf-8')
-            return content
-    except urllib.error.HTTPError:
+    # Standard GitHub API for README (resolves README.md, Readme.md, README.txt etc.)
+    data = client.get_json(f"/repos/{USERNAME}/{repo_name}/readme")
+    if not data:
         return ""
+    # Content is base64 encoded
+    return base64.b64decode(data['content']).decode('utf-8')
 
-def get_languages(repo_name):
-    url = f"https://api.github.com/repos/{USERNAME}/{repo_name}/languages"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError:
-        return {}
+# Set by --languages local: byte counts then come from sparse worktrees of
+# persistent mirrors instead of one /languages request per repo
+language_mirrors = None
+
+def get_languages(repo_name, default_branch=None):
+    if language_mirrors is not None:
+        auth = f"{TOKEN}@" if TOKEN else ""
+        clone_url = f"https://{auth}github.com/{USERNAME}/{repo_name}.git"
+        try:
+            return mirror_language_bytes(language_mirrors, repo_name, clone_url,
+                                         LANGUAGE_WORKSPACE / repo_name, default_branch)
+        except MirrorError as e:
+            # Empty repositories cannot be checked out; the API still answers
+            print(f"  -> Local language stats failed for {repo_name} ({e}); using the API")
+    return client.get_json(f"/repos/{USERNAME}/{repo_name}/languages", {})
 
 def analyze_tech_stack(languages):
     # Sort by bytes and return top list
@@ -79,69 +78,79 @@ cd {repo['name']}
 ```
 """
 
-def main():
+def analyze_repo(repo):
+    print(f"Analyzing {repo['name']}...")
+    
+    # 1. Fetch README
+    readme_content = get_readme_content(repo['name'], repo['default_branch'])
+    
+    # 2. Fetch Languages
+    languages = get_languages(repo['name'], repo['default_branch'])
+    tech_stack = analyze_tech_stack(languages)
+    
+    is_virtual = False
+    final_doc = readme_content
+    
+    # 3. Audit
+    if not readme_content or len(readme_content) < 200:
+        print(f"  -> Weak documentation detected. Generating Virtual README.")
+        is_virtual = True
+        final_doc = generate_virtual_readme(repo, languages)
+    
+    return {
+        "name": repo['name'],
+        "description": repo['description'],
+        "url": repo['html_url'],
+        "stars": repo['stargazers_count'],
+        "forks": repo['forks_count'],
+        "languages": tech_stack,
+        "has_good_readme": not is_virtual,
+        "documentation": final_doc,
+        "updated_at": repo['updated_at']
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Audit GitHub repositories and build projects.json")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-analyze repos changed since the last run")
+    parser.add_argument("--languages", choices=["api", "local"], default="api",
+                        help="language byte counts from the /languages API or computed from local mirrors")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global language_mirrors
+    args = parse_args(argv)
     print(f"Starting Deep Audit for {USERNAME}...")
+    if args.languages == "local":
+        language_mirrors = MirrorStore(lean=True)
     
-    all_repos = []
-    page = 1
-    while True:
-        repos = fetch_repos(page)
-        if not repos:
-            break
-        all_repos.extend(repos)
-        page += 1
+    all_repos = list(fetch_repos())
+    if not all_repos and not TOKEN:
+        print("No repositories listed. If rate limited, please provide GITHUB_TOKEN.")
         
     print(f"Found {len(all_repos)} repositories.")
     
-    projects_data = []
-    
-    for repo in all_repos:
-        if repo['fork']:
-            continue # Optionally skip forks or include them
-            
-        print(f"Analyzing {repo['name']}...")
-        
-        # 1. Fetch README
-        readme_content = get_readme_content(repo['name'], repo['default_branch'])
-        
-        # 2. Fetch Languages
-        languages = get_languages(repo['name'])
-        tech_stack = analyze_tech_stack(languages)
+    source_repos = [repo for repo in all_repos if not repo['fork']] # Optionally skip forks or include them
+    # Entries go to the NDJSON store as each repo finishes; a crashed run is
+    # resumed from it, and only compaction writes projects.json
+    with incremental.ProjectStore(OUTPUT_FILE, GENERATOR, incremental=args.incremental,
+                                  state_dir=STATE_DIR) as store:
+        to_analyze = store.plan(source_repos) if store.reusable else source_repos
         
-        is_virtual = False
-        final_doc = readme_content
-        
-        # 3. Audit
-        if not readme_content or len(readme_content) < 200:
-            print(f"  -> Weak documentation detected. Generating Virtual README.")
-            is_virtual = True
-            final_doc = generate_virtual_readme(repo, languages)
-        
-        project_entry = {
-            "name": repo['name'],
-            "description": repo['description'],
-            "url": repo['html_url'],
-            "stars": repo['stargazers_count'],
-            "forks": repo['forks_count'],
-            "languages": tech_stack,
-            "has_good_readme": not is_virtual,
-            "documentation": final_doc,
-            "updated_at": repo['updated_at']
-        }
-        projects_data.append(project_entry)
-        
-        # Sleep briefly to be nice to API if no token
-        if not TOKEN:
-            time.sleep(1)
+        # Pacing comes from the client's rate-limit scheduler, which follows the
+        # X-RateLimit headers instead of sleeping a fixed interval per repo
+        for repo in to_analyze:
+            store.append(repo, analyze_repo(repo))
 
-    # Sort: Impact (Stars) then Date
-    projects_data.sort(key=lambda x: (x['stars'], x['updated_at']), reverse=True)
-    
-    # Save
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(projects_data, f, indent=2)
+        # Sort: Impact (Stars) then Date; READMEs go to per-project shards
+        docs = DocShards(INDEX_FILE, SHARD_DIR)
+        store.compact(docs)
+        print(docs.summary())
         
+    print(client.cache.summary())
+    print(client.rate_limit_summary())
+    if language_mirrors:
+        print(language_mirrors.summary())
     print(f"Audit complete. Data saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
@@ -3,69 +3,143 @@
 Enhanced Audit Script with Deep Semantic Analysis
 Generates synthesized abstracts and technical architecture descriptions
 """
-import urllib.request
-import urllib.error
 import json
 import os
 import sys
-import time
 import base64
+import argparse
+from pathlib import Path
+
+import graphql_backend
+import incremental
+from analysis_cache import AnalysisCache, digest, git_blob_sha, rules_version
+from classification import classify
+from doc_shards import INDEX_FILE, PROJECTS_FILE, SHARD_DIR, DocShards
+from github_client import GitHubClient
+from http_cache import ResponseCache
+from language_stats import mirror_language_bytes
+from mirror_store import MirrorError, MirrorStore
 
 USERNAME = "vaishnavak2001"
-OUTPUT_FILE = "_data/projects.json"
+OUTPUT_FILE = PROJECTS_FILE
+STATE_DIR = incremental.STATE_DIR
 TOKEN = os.environ.get("GITHUB_TOKEN")
+LANGUAGE_WORKSPACE = Path("C:/temp/audit_languages")
+GENERATOR = "audit_and_doc_enhanced"
+MANIFESTS = ('package.json', 'requirements.txt', 'Dockerfile')
+# Third-party trees whose manifests say nothing about this project's stack
+MANIFEST_IGNORED_DIRS = {'node_modules', 'vendor', 'site-packages', '.venv', 'venv', 'bower_components'}
+
+# Cached analyses are dropped whenever the manifest rules change;
+# bump ANALYSIS_VERSION when analyze_tech_stack's logic changes
+ANALYSIS_VERSION = 1
+
+client = GitHubClient(token=TOKEN, cache=ResponseCache())
+analysis_cache = AnalysisCache(GENERATOR, rules_version(ANALYSIS_VERSION, MANIFESTS, MANIFEST_IGNORED_DIRS))
 
 def get_headers():
-    headers = {"User-Agent": "Portfolio-Audit-Agent"}
-    if TOKEN:
-        headers["Authorization"] = f"token {TOKEN}"
-    return headers
+    return client.get_headers()
 
-def fetch_repos(page=1):
-    url = f"https://api.github.com/users/{USERNAME}/repos?per_page=100&page={page}"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        print(f"Error fetching repos: {e}")
-        return []
+def fetch_repos():
+    """Stream every repository; pages after the first are fetched concurrently"""
+    return client.iter_pages(f"/users/{USERNAME}/repos")
 
 def get_readme_content(repo_name, default_branch):
-    url = f"https://api.github.com/repos/{USERNAME}/{repo_name}/readme"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode())
-            content = base64.b64decode(data['content']).decode('utf-8')
-            return content
-    except urllib.error.HTTPError:
+    data = client.get_json(f"/repos/{USERNAME}/{repo_name}/readme")
+    if not data:
         return ""
+    return base64.b64decode(data['content']).decode('utf-8')
 
-def get_languages(repo_name):
-    url = f"https://api.github.com/repos/{USERNAME}/{repo_name}/languages"
-    try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError:
-        return {}
+# Set by --languages local: byte counts then come from sparse worktrees of
+# persistent mirrors instead of one /languages request per repo
+language_mirrors = None
+
+def get_languages(repo_name, default_branch=None):
+    if language_mirrors is not None:
+        auth = f"{TOKEN}@" if TOKEN else ""
+        clone_url = f"https://{auth}github.com/{USERNAME}/{repo_name}.git"
+        try:
+            return mirror_language_bytes(language_mirrors, repo_name, clone_url,
+                                         LANGUAGE_WORKSPACE / repo_name, default_branch)
+        except MirrorError as e:
+            # Empty repositories cannot be checked out; the API still answers
+            print(f"  -> Local language stats failed for {repo_name} ({e}); using the API")
+    return client.get_json(f"/repos/{USERNAME}/{repo_name}/languages", {})
 
 def get_file_content(repo_name, file_path, default_branch):
     """Fetch specific file content from repository"""
-    url = f"https://api.github.com/repos/{USERNAME}/{repo_name}/contents/{file_path}?ref={default_branch}"
+    data = client.get_json(f"/repos/{USERNAME}/{repo_name}/contents/{file_path}?ref={default_branch}")
+    try:
+        if data and data.get('encoding') == 'base64':
+            return base64.b64decode(data['content']).decode('utf-8', errors='ignore')
+    except:
+        pass
+    return None
+
+def list_tree(repo_name, default_branch):
+    """All blob entries of the default branch in one recursive tree listing"""
+    data = client.get_json(f"/repos/{USERNAME}/{repo_name}/git/trees/{default_branch}?recursive=1")
+    if not data:
+        return []
+    if data.get('truncated'):
+        print(f"  -> Tree listing truncated for {repo_name}; manifest detection may be partial")
+    return [entry for entry in data.get('tree', []) if entry.get('type') == 'blob']
+
+def get_blob_content(repo_name, sha):
+    """Fetch a blob by SHA (immutable, so it revalidates cheaply through the cache)"""
+    data = client.get_json(f"/repos/{USERNAME}/{repo_name}/git/blobs/{sha}")
     try:
-        req = urllib.request.Request(url, headers=get_headers())
-        with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode())
-            if data.get('encoding') == 'base64':
-                return base64.b64decode(data['content']).decode('utf-8', errors='ignore')
+        if data and data.get('encoding') == 'base64':
+            return base64.b64decode(data['content']).decode('utf-8', errors='ignore')
     except:
         pass
     return None
 
-def analyze_tech_stack(languages, repo_name, default_branch):
-    """Analyze and return detailed tech stack"""
+def manifest_blobs(repo_name, default_branch):
+    """{path: blob SHA} of the manifests that exist, at any depth"""
+    blobs = {}
+    for entry in list_tree(repo_name, default_branch):
+        parts = entry['path'].split('/')
+        if parts[-1] in MANIFESTS and not MANIFEST_IGNORED_DIRS.intersection(parts[:-1]):
+            blobs[entry['path']] = entry['sha']
+    return blobs
+
+def fetch_manifests(repo_name, default_branch, blobs=None):
+    """Fetch only the manifests that exist, at any depth, instead of probing the root"""
+    if blobs is None:
+        blobs = manifest_blobs(repo_name, default_branch)
+    files = {}
+    for path, sha in blobs.items():
+        content = get_blob_content(repo_name, sha)
+        if content is not None:
+            files[path] = content
+    return files
+
+def analyze_tech_stack(languages, repo_name, default_branch, files=None):
+    """Analyze and return detailed tech stack
+    
+    files: optional {path: text} of prefetched manifests (GraphQL backend);
+    when omitted they are fetched via the repository's tree listing.
+    The result depends only on the languages and the manifest blobs, so it is
+    cached under their SHAs; on a hit no manifest content is fetched at all.
+    """
+    if files is None:
+        blobs = manifest_blobs(repo_name, default_branch)
+    else:
+        blobs = {path: git_blob_sha(text) for path, text in files.items()}
+    key = digest([languages, blobs])
+    if analysis_cache:
+        cached = analysis_cache.get(key)
+        if cached is not None:
+            return tuple(cached)
+    if files is None:
+        files = fetch_manifests(repo_name, default_branch, blobs)
+    
+    def read_files(name):
+        """Contents of every manifest with this file name, root-level first"""
+        paths = sorted((p for p in files if p.split('/')[-1] == name), key=lambda p: (p.count('/'), p))
+        return [files[p] for p in paths]
+    
     sorted_langs = sorted(languages.items(), key=lambda item: item[1], reverse=True)
     primary_langs = [l[0] for l in sorted_langs]
     
@@ -73,32 +147,32 @@ def analyze_tech_stack(languages, repo_name, default_branch):
     frameworks = []
     architecture_notes = []
     
-    # Check for package.json (Node.js/JavaScript)
-    package_json = get_file_content(repo_name, 'package.json', default_branch)
-    if package_json:
+    # Check for package.json (Node.js/JavaScript), merging nested packages
+    deps = None
+    for package_json in read_files('package.json'):
         try:
             pkg = json.loads(package_json)
-            deps = {**pkg.get('dependencies', {}), **pkg.get('devDependencies', {})}
-            
-            if any(k in deps for k in ['react', 'react-dom']):
-                frameworks.append('React')
-                architecture_notes.append("Component-based UI architecture using React")
-            if 'next' in deps:
-                frameworks.append('Next.js')
-                architecture_notes.append("Server-side rendering with Next.js framework")
-            if 'express' in deps:
-                frameworks.append('Express')
-                architecture_notes.append("RESTful API built on Express.js")
-            if 'vue' in deps:
-                frameworks.append('Vue.js')
-                architecture_notes.append("Reactive UI framework with Vue.js")
-            if 'typescript' in deps or 'TypeScript' in primary_langs:
-                architecture_notes.append("Type-safe development with TypeScript")
+            deps = {**(deps or {}), **pkg.get('dependencies', {}), **pkg.get('devDependencies', {})}
         except:
             pass
+    if deps is not None:
+        if any(k in deps for k in ['react', 'react-dom']):
+            frameworks.append('React')
+            architecture_notes.append("Component-based UI architecture using React")
+        if 'next' in deps:
+            frameworks.append('Next.js')
+            architecture_notes.append("Server-side rendering with Next.js framework")
+        if 'express' in deps:
+            frameworks.append('Express')
+            architecture_notes.append("RESTful API built on Express.js")
+        if 'vue' in deps:
+            frameworks.append('Vue.js')
+            architecture_notes.append("Reactive UI framework with Vue.js")
+        if 'typescript' in deps or 'TypeScript' in primary_langs:
+            architecture_notes.append("Type-safe development with TypeScript")
     
-    # Check for requirements.txt (Python)
-    requirements = get_file_content(repo_name, 'requirements.txt', default_branch)
+    # Check for requirements.txt (Python), including nested e.g. backend/requirements.txt
+    requirements = "\n".join(read_files('requirements.txt'))
     if requirements:
         req_lower = requirements.lower()
         if 'flask' in req_lower:
@@ -123,13 +197,30 @@ def analyze_tech_stack(languages, repo_name, default_branch):
             architecture_notes.append("Interactive web application using Streamlit")
     
     # Check for Dockerfile
-    dockerfile = get_file_content(repo_name, 'Dockerfile', default_branch)
-    if dockerfile:
+    if any(read_files('Dockerfile')):
         architecture_notes.append("Containerized deployment using Docker")
     
+    if analysis_cache:
+        analysis_cache.put(key, [primary_langs, frameworks, architecture_notes])
     return primary_langs, frameworks, architecture_notes
 
-def synthesize_abstract(repo, readme_content, languages, frameworks):
+DOMAIN_CONTEXT = {
+    'machine-learning': "This project addresses challenges in machine learning and predictive analytics. ",
+    'web': "This system implements modern web architecture patterns. ",
+    'data-analysis': "This analytical framework focuses on data-driven insights. ",
+    'autonomous-systems': "This project explores reinforcement learning and autonomous systems. ",
+    'deep-learning': "This research implements deep learning methodologies for pattern recognition. ",
+    'computer-vision': "This computer vision system processes visual data for automated analysis. ",
+}
+ARCHITECTURE_SECTIONS = {
+    'ml': "**ML Architecture:** Supervised learning pipeline with feature extraction, model training, and inference stages. Implements validation strategies for generalization.",
+    'service': "**Service Architecture:** RESTful API design with endpoint routing, request validation, and JSON response formatting. Implements authentication and error handling middleware.",
+    'agent': "**Agent Architecture:** Reinforcement learning system with environment interaction, state representation, policy network, and reward optimization. Implements exploration-exploitation strategies.",
+    'web': "**Web Architecture:** Client-side rendering with modular component design. Implements responsive layouts and progressive enhancement.",
+    'data': "**Data Pipeline:** ETL (Extract, Transform, Load) architecture for data ingestion and processing. Statistical analysis and visualization components for insights generation.",
+}
+
+def synthesize_abstract(repo, languages, frameworks, classification):
     """Generate a research-grade abstract based on available information"""
     name = repo['name']
     description = repo.get('description') or ''
@@ -137,26 +228,8 @@ def synthesize_abstract(repo, readme_content, languages, frameworks):
     # Extract purpose from README or description
     purpose = description if description else f"Implementation focused on {name.replace('-', ' ').replace('_', ' ')}"
     
-    # Infer domain from name and languages
-    name_lower = name.lower()
-    domain_context = ""
-    
-    if any(term in name_lower for term in ['ml', 'neural', 'cnn', 'lstm', 'detection', 'classification', 'prediction']):
-        domain_context = "This project addresses challenges in machine learning and predictive analytics. "
-    elif any(term in name_lower for term in ['web', 'api', 'server', 'client']):
-        domain_context = "This system implements modern web architecture patterns. "
-    elif any(term in name_lower for term in ['data', 'analysis', 'visualization']):
-        domain_context = "This analytical framework focuses on data-driven insights. "
-    elif any(term in name_lower for term in ['rl', 'agent', 'gym', 'control']):
-        domain_context = "This project explores reinforcement learning and autonomous systems. "
-    
-    # Check for specific ML/AI keywords in README
-    if readme_content:
-        readme_lower = readme_content.lower()
-        if 'deep learning' in readme_lower or 'neural network' in readme_lower:
-            domain_context = "This research implements deep learning methodologies for pattern recognition. "
-        elif 'computer vision' in readme_lower or 'image' in readme_lower:
-            domain_context = "This computer vision system processes visual data for automated analysis. "
+    # Domain inferred from the name, or from the README when it says more
+    domain_context = DOMAIN_CONTEXT.get(classification.domain, "")
     
     # Build tech context
     tech_context = ""
@@ -171,7 +244,7 @@ def synthesize_abstract(repo, readme_content, languages, frameworks):
     
     return abstract
 
-def synthesize_technical_architecture(languages, frameworks, architecture_notes, repo_name):
+def synthesize_technical_architecture(languages, frameworks, architecture_notes, classification):
     """Generate detailed technical architecture description - NEVER returns empty"""
     
     arch_parts = []
@@ -216,27 +289,14 @@ def synthesize_technical_architecture(languages, frameworks, architecture_notes,
             if not frameworks:
                 arch_parts.append(f"**Architecture Patterns:** {patterns_str}")
     
-    # Infer patterns from repo name - always add domain context
-    name_lower = repo_name.lower()
-    domain_added = False
-    
-    if any(term in name_lower for term in ['detection', 'classification', 'prediction', 'recognition']):
-        arch_parts.append("**ML Architecture:** Supervised learning pipeline with feature extraction, model training, and inference stages. Implements validation strategies for generalization.")
-        domain_added = True
-    elif any(term in name_lower for term in ['api', 'server', 'backend']):
-        if not any('RESTful' in p for p in arch_parts):
-            arch_parts.append("**Service Architecture:** RESTful API design with endpoint routing, request validation, and JSON response formatting. Implements authentication and error handling middleware.")
-            domain_added = True
-    elif any(term in name_lower for term in ['agent', 'rl', 'reinforcement']):
-        arch_parts.append("**Agent Architecture:** Reinforcement learning system with environment interaction, state representation, policy network, and reward optimization. Implements exploration-exploitation strategies.")
-        domain_added = True
-    elif any(term in name_lower for term in ['web', 'site', 'portfolio']):
-        if not any('component' in p.lower() for p in arch_parts):
-            arch_parts.append("**Web Architecture:** Client-side rendering with modular component design. Implements responsive layouts and progressive enhancement.")
-            domain_added = True
-    elif any(term in name_lower for term in ['data', 'analysis', 'cluster', 'eda']):
-        arch_parts.append("**Data Pipeline:** ETL (Extract, Transform, Load) architecture for data ingestion and processing. Statistical analysis and visualization components for insights generation.")
-        domain_added = True
+    # Domain section inferred from the repo name
+    section = classification.architecture
+    if section == 'service' and any('RESTful' in p for p in arch_parts):
+        section = None
+    elif section == 'web' and any('component' in p.lower() for p in arch_parts):
+        section = None
+    if section:
+        arch_parts.append(ARCHITECTURE_SECTIONS[section])
     
     # Fallback: if still minimal content, add generic but technical description
     if not arch_parts or len('\n\n'.join(arch_parts)) < 100:
@@ -255,66 +315,135 @@ def synthesize_technical_architecture(languages, frameworks, architecture_notes,
     
     return "\n\n".join(arch_parts)
 
-def main():
-    print(f"Starting Deep Semantic Analysis for {USERNAME}...")
+def build_project_entry(repo, readme_content, languages_raw, files=None):
+    """Analyze and synthesize the project entry from fetched repository data"""
+    # Analyze
+    tech_stack, frameworks, arch_notes = analyze_tech_stack(languages_raw, repo['name'], repo['default_branch'], files)
     
-    all_repos = []
-    page = 1
-    while True:
-        repos = fetch_repos(page)
-        if not repos:
-            break
-        all_repos.extend(repos)
-        page += 1
-        
-    print(f"Found {len(all_repos)} repositories.")
+    # Synthesize
+    classification = classify(repo['name'], repo.get('description'), readme_content, tech_stack, frameworks)
+    abstract = synthesize_abstract(repo, tech_stack, frameworks, classification)
+    technical_architecture = synthesize_technical_architecture(tech_stack, frameworks, arch_notes, classification)
     
-    projects_data = []
+    return {
+        "name": repo['name'],
+        "description": repo['description'],
+        "url": repo['html_url'],
+        "stars": repo['stargazers_count'],
+        "forks": repo['forks_count'],
+        "languages": tech_stack,
+        "frameworks": frameworks,
+        "abstract": abstract,
+        "technical_architecture": technical_architecture,
+        "documentation": readme_content,
+        "updated_at": repo['updated_at']
+    }
+
+def analyze_repo(repo):
+    """Fetch and synthesize the project entry for a single repository (REST backend)"""
+    print(f"Deep analyzing {repo['name']}...")
     
-    for repo in all_repos:
-        if repo['fork']:
+    # Fetch data
+    readme_content = get_readme_content(repo['name'], repo['default_branch'])
+    languages_raw = get_languages(repo['name'], repo['default_branch'])
+    
+    return build_project_entry(repo, readme_content, languages_raw)
+
+def stream_source_repos():
+    """Yield non-fork repos as listing pages arrive"""
+    for repo in fetch_repos():
+        if not repo['fork']:
+            yield repo
+
+def list_repos():
+    source_repos = list(stream_source_repos())
+    print(f"Found {len(source_repos)} repositories (excluding forks).")
+    return source_repos
+
+def analyze_rest(source_repos):
+    """(repo, entry) pairs in listing order, as each repo finishes"""
+    # Repos are analyzed concurrently on the client's worker pool; each
+    # worker thread keeps its own keep-alive connection to the API, and the
+    # shared scheduler paces them against the remaining quota. source_repos
+    # may be a stream, in which case analysis starts while listing continues.
+    return client.map(lambda repo: (repo, analyze_repo(repo)), source_repos)
+
+def analyze_graphql(names=None):
+    """One GraphQL request per page of repos replaces the per-repo REST fan-out
+
+    A failed page raises graphql_backend.GraphQLError, leaving the partial
+    store to resume from rather than compacting a short run.
+    """
+    if names is None:
+        bundles = graphql_backend.fetch_repo_bundles(client, USERNAME)
+    else:
+        bundles = graphql_backend.fetch_named_bundles(client, USERNAME, names)
+    for bundle in bundles:
+        if bundle['repo']['fork']:
             continue
-            
-        print(f"Deep analyzing {repo['name']}...")
-        
-        # Fetch data
-        readme_content = get_readme_content(repo['name'], repo['default_branch'])
-        languages_raw = get_languages(repo['name'])
-        
-        # Analyze
-        tech_stack, frameworks, arch_notes = analyze_tech_stack(languages_raw, repo['name'], repo['default_branch'])
-        
-        # Synthesize
-        abstract = synthesize_abstract(repo, readme_content, tech_stack, frameworks)
-        technical_architecture = synthesize_technical_architecture(tech_stack, frameworks, arch_notes, repo['name'])
-        
-        project_entry = {
-            "name": repo['name'],
-            "description": repo['description'],
-            "url": repo['html_url'],
-            "stars": repo['stargazers_count'],
-            "forks": repo['forks_count'],
-            "languages": tech_stack,
-            "frameworks": frameworks,
-            "abstract": abstract,
-            "technical_architecture": technical_architecture,
-            "documentation": readme_content,
-            "updated_at": repo['updated_at']
-        }
-        projects_data.append(project_entry)
-        
-        if not TOKEN:
-            time.sleep(1)
+        print(f"Deep analyzing {bundle['repo']['name']}...")
+        if language_mirrors is not None:
+            bundle['languages'] = get_languages(bundle['repo']['name'], bundle['repo']['default_branch'])
+        yield bundle['repo'], build_project_entry(bundle['repo'], bundle['readme'], bundle['languages'], bundle['files'])
 
-    # Sort by impact
-    projects_data.sort(key=lambda x: (x['stars'], x['updated_at']), reverse=True)
+def analyze_incremental(backend, store):
+    """Re-analyze only repos the store holds no entry for with their current pushed_at/updated_at"""
+    changed = store.plan(list_repos())
+    if backend == "graphql":
+        return analyze_graphql([repo['name'] for repo in changed])
+    return analyze_rest(changed)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Deep semantic audit of GitHub repositories")
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest",
+                        help="fetch via per-repo REST calls or batched GraphQL queries")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-analyze repos changed since the last run")
+    parser.add_argument("--languages", choices=["api", "local"], default="api",
+                        help="language byte counts from the /languages API or computed from local mirrors")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the audit; returns the slim project index entries it wrote"""
+    global language_mirrors
+    args = parse_args(argv)
+    if args.backend == "graphql" and not TOKEN:
+        sys.exit("The GraphQL API requires GITHUB_TOKEN.")
+    print(f"Starting Deep Semantic Analysis for {USERNAME}...")
+    if args.languages == "local":
+        language_mirrors = MirrorStore(lean=True)
     
-    # Save
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(projects_data, f, indent=2)
+    # Entries go to the NDJSON store as each repo finishes, so neither a
+    # crash nor the size of the account costs more than one entry in memory
+    with incremental.ProjectStore(OUTPUT_FILE, GENERATOR, incremental=args.incremental,
+                                  state_dir=STATE_DIR) as store:
+        if store.reusable:
+            results = analyze_incremental(args.backend, store)
+        elif args.backend == "graphql":
+            results = analyze_graphql()
+        else:
+            results = analyze_rest(stream_source_repos())
+        for repo, entry in results:
+            store.append(repo, entry)
+        print(f"Analyzed {store.writer.count} repositories (excluding forks).")
+        client.close()
+        if client.cache:
+            print(client.cache.summary())
+        print(client.rate_limit_summary())
+        if language_mirrors:
+            print(language_mirrors.summary())
+        if analysis_cache:
+            analysis_cache.save()
+            print(analysis_cache.summary())
+
+        # Sort by impact while compacting the store into projects.json,
+        # splitting documentation into shards behind the slim index
+        docs = DocShards(INDEX_FILE, SHARD_DIR)
+        store.compact(docs)
+        print(docs.summary())
         
     print(f"Deep analysis complete. Enhanced data saved to {OUTPUT_FILE}")
+    return docs.index
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,1073 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+Run offline against local stubs and fixtures: python scripts/benchmarks.py <name>
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_github_server import StubGitHub
+
+USERNAME = "vaishnavak2001"
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn with its progress output (and that of child processes) suppressed; return (result, seconds)"""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        os.dup2(devnull.fileno(), 1)
+        try:
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            return result, time.perf_counter() - start
+        finally:
+            os.dup2(saved, 1)
+            os.close(saved)
+
+
+def import_audit():
+    """The deep audit module with its analysis cache off, so every run does the full work"""
+    import audit_and_doc_enhanced as audit
+    audit.analysis_cache = None
+    return audit
+
+
+def redirect_audit(audit, directory, output_name):
+    """Point the audit's projects.json, project index, doc shards and run state into directory"""
+    audit.OUTPUT_FILE = os.path.join(directory, output_name)
+    audit.INDEX_FILE = os.path.join(directory, "project_index.json")
+    audit.SHARD_DIR = os.path.join(directory, "docs")
+    audit.STATE_DIR = os.path.join(directory, "state")
+
+
+def bench_api_client(args):
+    """Sequential urlopen audit vs pooled concurrent client, same output file"""
+    audit = import_audit()
+    from github_client import GitHubClient
+
+    def legacy_get_json(url, default=None):
+        # Mirrors the original per-call urlopen behaviour (new socket each time)
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": "Portfolio-Audit-Agent"})
+            with urllib.request.urlopen(req) as response:
+                return json.loads(response.read().decode())
+        except Exception:
+            return default
+
+    class LegacyClient(GitHubClient):
+        def get_json(self, path, default=None):
+            return legacy_get_json(f"{self.scheme}://{self.host}{self._target(path)}", default)
+
+        def map(self, fn, items):
+            return map(fn, items)
+
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, client in (("sequential-urlopen", LegacyClient(token="x", base_url=stub.url)),
+                              ("pooled-concurrent", GitHubClient(token="x", base_url=stub.url,
+                                                                 max_workers=args.workers))):
+            audit.client = client
+            audit.TOKEN = "x"
+            redirect_audit(audit, tmp, f"{label}.json")
+            stub.request_count = 0
+            _, elapsed = timed(audit.main, [])
+            results[label] = audit.OUTPUT_FILE
+            print(f"{label:>20}: {elapsed:7.2f}s  {stub.request_count} requests  "
+                  f"{stub.request_count / elapsed:8.1f} req/s  "
+                  f"{client.stats['connections']} connections opened")
+        outputs = [open(path, encoding='utf-8').read() for path in results.values()]
+        print(f"Outputs identical: {outputs[0] == outputs[1]}")
+
+
+def bench_http_cache(args):
+    """Cold vs warm nightly run of the deep audit with the conditional-request cache"""
+    audit = import_audit()
+    from github_client import GitHubClient
+    from http_cache import ResponseCache
+
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        audit.TOKEN = "x"
+        redirect_audit(audit, tmp, "projects.json")
+        for label in ("cold", "warm"):
+            cache = ResponseCache(os.path.join(tmp, "cache"))
+            audit.client = GitHubClient(token="x", base_url=stub.url, max_workers=args.workers, cache=cache)
+            _, elapsed = timed(audit.main, [])
+            print(f"{label:>5}: {elapsed:6.2f}s  {cache.summary()}")
+
+
+def bench_graphql(args):
+    """Per-repo REST fan-out vs batched GraphQL pages against the stub endpoint"""
+    audit = import_audit()
+    from github_client import GitHubClient
+
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        audit.TOKEN = "x"
+        outputs = []
+        for backend in ("rest", "graphql"):
+            audit.client = GitHubClient(token="x", base_url=stub.url, max_workers=args.workers)
+            redirect_audit(audit, tmp, f"{backend}.json")
+            stub.request_count = 0
+            _, elapsed = timed(audit.main, ["--backend", backend])
+            print(f"{backend:>8}: {elapsed:6.2f}s  {stub.request_count} requests")
+            with open(audit.OUTPUT_FILE, encoding='utf-8') as f:
+                outputs.append(f.read())
+        print(f"Outputs identical: {outputs[0] == outputs[1]}")
+
+
+def bench_incremental(args):
+    """Full rebuild vs incremental run after a handful of repos change"""
+    audit = import_audit()
+    from github_client import GitHubClient
+
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        audit.TOKEN = "x"
+        redirect_audit(audit, tmp, "projects.json")
+
+        def run(label, argv):
+            audit.client = GitHubClient(token="x", base_url=stub.url, max_workers=args.workers)
+            stub.request_count = 0
+            _, elapsed = timed(audit.main, argv)
+            print(f"{label:>22}: {elapsed:6.2f}s  {stub.request_count} requests")
+            with open(audit.OUTPUT_FILE, encoding='utf-8') as f:
+                return f.read()
+
+        run("initial full", [])
+        for repo in stub.repos[1:4]:
+            repo['pushed_at'] = repo['updated_at'] = "2026-01-01T00:00:00Z"
+            repo['description'] = "Changed since the last run"
+        del stub.repos[5]
+        incremental_output = run("incremental (3 changed)", ["--incremental"])
+        full_output = run("full rebuild", [])
+        print(f"Outputs identical: {incremental_output == full_output}")
+
+
+def bench_rate_limit(args):
+    """Audit against a stub that exhausts its quota and throws secondary limits"""
+    audit = import_audit()
+    from github_client import GitHubClient
+    from rate_limit import RateLimitScheduler
+
+    outputs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.TOKEN = "x"
+        redirect_audit(audit, tmp, "projects.json")
+        for label, limits in (("unlimited", {}),
+                              ("quota+secondary", {"quota": args.repos * 2, "window": 2.0, "secondary_every": 50})):
+            with StubGitHub(repo_count=args.repos, latency=args.latency, **limits) as stub:
+                scheduler = RateLimitScheduler(reserve=2)
+                audit.client = GitHubClient(token="x", base_url=stub.url, max_workers=args.workers,
+                                            scheduler=scheduler)
+                _, elapsed = timed(audit.main, [])
+                print(f"{label:>16}: {elapsed:6.2f}s  {stub.request_count} requests, "
+                      f"{stub.rejected} rejected  {scheduler.summary()}")
+            with open(audit.OUTPUT_FILE, encoding='utf-8') as f:
+                outputs.append(f.read())
+    print(f"Outputs identical: {outputs[0] == outputs[1]}")
+
+
+def bench_listing(args):
+    """Sequential page walk (with trailing empty page) vs Link-header concurrent listing"""
+    from github_client import GitHubClient
+
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub:
+        client = GitHubClient(token="x", base_url=stub.url)
+
+        def sequential():
+            repos, page = [], 1
+            while True:
+                _, _, data = client.get(f"/users/x/repos?per_page=100&page={page}")
+                batch = json.loads(data.decode())
+                if not batch:
+                    return repos
+                repos.extend(batch)
+                page += 1
+
+        for label, fn in (("sequential", sequential),
+                          ("link-concurrent", lambda: list(client.iter_pages("/users/x/repos")))):
+            stub.request_count = 0
+            repos, elapsed = timed(fn)
+            print(f"{label:>16}: {elapsed:6.2f}s  {len(repos)} repos  {stub.request_count} requests")
+
+        # Streaming: time until the first repo is available to downstream work
+        start = time.perf_counter()
+        next(iter(client.iter_pages("/users/x/repos")))
+        print(f"first repo streamed after {time.perf_counter() - start:.3f}s")
+
+
+def make_fixture_repo(path, files=200, commits=15, heavy_kb=0):
+    """Create a bare repo with some history, returning its file:// URL
+
+    heavy_kb adds a dataset and model weights of that size, rewritten in
+    every commit, the way checked-in artifacts bloat real repositories.
+    """
+    import subprocess
+    work = f"{path}.work"
+    git = lambda *a: subprocess.run(['git', *a], cwd=work, check=True, capture_output=True)
+    os.makedirs(work)
+    git('init', '--quiet', '-b', 'main')
+    git('config', 'user.email', 'bench@example.com')
+    git('config', 'user.name', 'bench')
+    for commit in range(commits):
+        for i in range(files):
+            subdir = os.path.join(work, "src", f"pkg{i % 20}")
+            os.makedirs(subdir, exist_ok=True)
+            with open(os.path.join(subdir, f"mod{i}.py"), 'w') as f:
+                f.write(f"# revision {commit} {i}\n" + os.urandom(600).hex())
+        if heavy_kb:
+            os.makedirs(os.path.join(work, "data"), exist_ok=True)
+            for artifact in ("data/train.csv", "model.h5"):
+                with open(os.path.join(work, artifact), 'wb') as f:
+                    f.write(os.urandom(heavy_kb * 1024))
+        git('add', '-A')
+        git('commit', '--quiet', '-m', f"revision {commit}")
+    with open(os.path.join(work, "requirements.txt"), 'w') as f:
+        f.write("flask\nnumpy\n")
+    with open(os.path.join(work, "README.md"), 'w') as f:
+        f.write("# fixture\n")
+    git('add', '-A')
+    git('commit', '--quiet', '-m', "docs")
+    subprocess.run(['git', 'clone', '--bare', '--quiet', work, path], check=True)
+    # Partial clones need the server to honour --filter
+    subprocess.run(['git', 'config', 'uploadpack.allowFilter', 'true'], cwd=path, check=True)
+    return "file://" + os.path.abspath(path)
+
+
+def bench_mirror(args):
+    """Fresh clone per run vs persistent bare mirror + worktree, over repeated runs"""
+    import shutil
+    import subprocess
+    from mirror_store import MirrorStore
+
+    runs = 3
+    count = min(args.repos, 10)
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = {f"repo{i}": make_fixture_repo(os.path.join(tmp, "origin", f"repo{i}.git"))
+                for i in range(count)}
+        dest = os.path.join(tmp, "work")
+
+        def fresh_clones():
+            for name, url in urls.items():
+                shutil.rmtree(dest, ignore_errors=True)
+                subprocess.run(['git', 'clone', '--quiet', url, dest], check=True)
+            shutil.rmtree(dest, ignore_errors=True)
+
+        store = MirrorStore(root=os.path.join(tmp, "mirrors"))
+
+        def mirror_checkouts():
+            for name, url in urls.items():
+                with store.checkout(name, url, dest):
+                    pass
+
+        for label, fn in (("fresh-clone", fresh_clones), ("mirror-worktree", mirror_checkouts)):
+            for run in range(1, runs + 1):
+                _, elapsed = timed(fn)
+                print(f"{label:>16} run {run}: {elapsed:6.2f}s  ({count} repos)")
+        print(store.summary())
+
+        # A budget below the combined mirror size evicts the coldest mirrors
+        small = MirrorStore(root=os.path.join(tmp, "mirrors"), budget=store.index["repo0"]["size"] * 3)
+        small.sync("repo0", urls["repo0"])
+        print(f"budget of 3x one mirror -> {small.summary()}")
+
+
+def bench_checkout(args):
+    """Full clone vs lean (depth-1, blob-less, sparse) checkout for a README update"""
+    import shutil
+    import subprocess
+    from pathlib import Path
+    import global_repo_update as updater_module
+    from analysis_cache import AnalysisCache
+    from mirror_store import MirrorStore, dir_size
+
+    for var, value in (("GIT_AUTHOR_NAME", "bench"), ("GIT_AUTHOR_EMAIL", "bench@example.com"),
+                       ("GIT_COMMITTER_NAME", "bench"), ("GIT_COMMITTER_EMAIL", "bench@example.com")):
+        os.environ.setdefault(var, value)
+    count = min(args.repos, 4)
+    with tempfile.TemporaryDirectory() as tmp:
+        origins = {f"repo{i}": make_fixture_repo(os.path.join(tmp, "origin", f"repo{i}.git"),
+                                                 files=100, commits=10, heavy_kb=1024)
+                   for i in range(count)}
+        dest = Path(tmp) / "work"
+        updater = updater_module.RepoUpdater()
+        store = MirrorStore(root=os.path.join(tmp, "mirrors"), lean=True)
+        results = {}
+
+        def update(name, path):
+            results.setdefault(label, []).append(updater.analyze_tech_stack(path))
+            updater.update_checkout({'name': name, 'description': None, 'default_branch': 'main'}, path)
+            return dir_size(path)
+
+        def full_clone(name, url):
+            shutil.rmtree(dest, ignore_errors=True)
+            subprocess.run(['git', 'clone', '--quiet', url, str(dest)], check=True)
+            checkout_bytes = update(name, dest) - dir_size(dest / ".git")
+            received = dir_size(dest / ".git" / "objects")
+            shutil.rmtree(dest)
+            return received, checkout_bytes
+
+        def lean(name, url):
+            with store.checkout(name, url, dest, 'main', sparse=updater_module.SPARSE_PATTERNS):
+                checkout_bytes = update(name, dest)
+            return dir_size(store.path(name) / "objects"), checkout_bytes
+
+        for label, job in (("full-clone", full_clone), ("lean-sparse", lean)):
+            # Each mode pushes to its own copy of the origins
+            urls = {}
+            for name, url in origins.items():
+                copy = os.path.join(tmp, label, f"{name}.git")
+                shutil.copytree(url[len("file://"):], copy)
+                urls[name] = "file://" + copy
+            pushed = updater.stats['success']
+            updater.analysis_cache = AnalysisCache("bench", label, directory=os.path.join(tmp, label))
+            sizes, elapsed = timed(lambda: [job(name, url) for name, url in urls.items()])
+            received = sum(r for r, _ in sizes) / 1024 / 1024
+            on_disk = sum(c for _, c in sizes) / 1024 / 1024
+            print(f"{label:>12}: {elapsed:6.2f}s  {received:7.2f} MB objects received  "
+                  f"{on_disk:6.2f} MB checked out  {updater.stats['success'] - pushed}/{count} pushed")
+        print("same analysis:", results["full-clone"] == results["lean-sparse"])
+
+
+def bench_publish(args):
+    """Clone + commit + push vs lean mirror worktree vs Git Data API, writing one README per repo"""
+    import shutil
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+    from git_publisher import GitDataPublisher
+    from github_client import GitHubClient
+    from mirror_store import MirrorStore
+
+    for var, value in (("GIT_AUTHOR_NAME", "bench"), ("GIT_AUTHOR_EMAIL", "bench@example.com"),
+                       ("GIT_COMMITTER_NAME", "bench"), ("GIT_COMMITTER_EMAIL", "bench@example.com")):
+        os.environ.setdefault(var, value)
+    count = args.repos_publish
+    workers = min(args.workers, 8)
+    readme = lambda name: f"# {name}\n\nPublished README for {name}.\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        template = make_fixture_repo(os.path.join(tmp, "template.git"), files=40, commits=3)[len("file://"):]
+        store = MirrorStore(root=os.path.join(tmp, "mirrors"), lean=True)
+
+        def write_readme(name, work, branch):
+            with open(os.path.join(work, "README.md"), 'w', encoding='utf-8') as f:
+                f.write(readme(name))
+            git = lambda *a: subprocess.run(['git', *a], cwd=work, check=True, capture_output=True)
+            git('add', 'README.md')
+            git('commit', '--quiet', '-m', "docs")
+            git('push', '--quiet', 'origin', branch)
+
+        def full_clone(name, url):
+            work = os.path.join(tmp, "work", name)
+            subprocess.run(['git', 'clone', '--quiet', url, work], check=True, capture_output=True)
+            write_readme(name, work, 'main')
+            shutil.rmtree(work)
+
+        def lean_mirror(name, url):
+            work = os.path.join(tmp, "work", name)
+            with store.checkout(name, url, work, 'main', sparse=['/README.md']):
+                write_readme(name, work, 'main')
+
+        for label, job in (("clone+push", full_clone), ("mirror+push", lean_mirror)):
+            # Each mode pushes to its own copies of the origin
+            urls = {}
+            for i in range(count):
+                copy = os.path.join(tmp, label, f"repo{i}.git")
+                shutil.copytree(template, copy)
+                urls[f"repo{i}"] = "file://" + copy
+            if job is lean_mirror:
+                # The nightly runs keep their mirrors; only warm ones are timed
+                for name, url in urls.items():
+                    store.sync(name, url)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                _, elapsed = timed(lambda: list(pool.map(job, urls, urls.values())))
+            landed = sum(subprocess.run(['git', 'show', 'main:README.md'], cwd=url[len("file://"):],
+                                        capture_output=True, text=True).stdout == readme(name)
+                         for name, url in urls.items())
+            print(f"{label:>14}: {elapsed:6.2f}s  {landed}/{count} READMEs landed  ({workers} workers, local file:// remotes)")
+
+        for label, race_every in (("git-data-api", 0), ("api, contended", 10)):
+            with StubGitHub(repo_count=count, latency=args.latency, race_every=race_every) as stub:
+                client = GitHubClient(token="x", base_url=stub.url, max_workers=workers)
+                publisher = GitDataPublisher(client, "x")
+                jobs = [(repo['name'], repo['default_branch'], {"README.md": readme(repo['name'])}, "docs")
+                        for repo in stub.repos]
+                results, elapsed = timed(publisher.publish_many, jobs)
+                landed = sum(stub.files[repo['name']]['README.md'] == readme(repo['name']) for repo in stub.repos)
+                print(f"{label:>14}: {elapsed:6.2f}s  {landed}/{count} READMEs landed  {stub.request_count} requests "
+                      f"({workers} workers, {args.latency * 1000:.0f} ms stub latency)  {publisher.summary()}")
+                client.close()
+
+
+def bench_project_store(args):
+    """In-memory list + json.dump vs NDJSON store + external compaction, peak traced memory"""
+    import random
+    import tracemalloc
+    import incremental
+
+    doc = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 70
+    for count in (args.repos_store // 16, args.repos_store // 4, args.repos_store):
+        rng = random.Random(count)
+        repos = [{"name": f"repo-{i:06d}", "pushed_at": "2025-01-01T00:00:00Z", "updated_at": f"2025-01-{1 + i % 28:02d}"}
+                 for i in range(count)]
+        entry = lambda repo: {"name": repo['name'], "stars": rng.randint(0, 5), "updated_at": repo['updated_at'],
+                              "documentation": doc + repo['name']}
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, "projects.json")
+
+            def in_memory():
+                projects = [entry(repo) for repo in repos]
+                projects.sort(key=lambda x: (x['stars'], x['updated_at']), reverse=True)
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(projects, f, indent=2)
+
+            def store():
+                with incremental.ProjectStore(output_file, "bench", state_dir=tmp) as project_store:
+                    for repo in repos:
+                        project_store.append(repo, entry(repo))
+                    project_store.compact()
+
+            line = f"{count:>7} repos:"
+            for label, fn in (("list+dump", in_memory), ("ndjson-store", store)):
+                rng.seed(count)
+                tracemalloc.start()
+                _, elapsed = timed(fn)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                with open(output_file, 'rb') as f:
+                    outputs.append(f.read())
+                line += f"  {label} {elapsed:6.2f}s peak {peak / 1024 / 1024:7.1f} MB"
+            print(f"{line}  ({len(outputs[0]) / 1024 / 1024:.0f} MB output)  identical: {outputs[0] == outputs[1]}")
+
+
+_INDEX_PROBE = """
+import hashlib, json, sys, time
+sys.path.insert(0, sys.argv[3])
+import binary_index
+mode, path = sys.argv[1], sys.argv[2]
+
+def peak_kb():
+    # VmHWM is this process's own peak; ru_maxrss carries the parent's across exec
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))
+
+before = peak_kb()
+start = time.perf_counter()
+if mode == 'json':
+    with open(path, 'r', encoding='utf-8') as f:
+        projects = json.load(f)
+else:
+    projects = binary_index.open_sidecar(path)
+loaded = time.perf_counter()
+load_kb = peak_kb() - before
+one = projects[len(projects) // 2]['name']
+first = time.perf_counter()
+# The fields generate_research_data reads from every project, digested as they stream past
+digest = hashlib.sha256()
+for p in projects:
+    digest.update(repr((p['name'], p.get('languages', []), p.get('frameworks', []), p.get('abstract'), p['url'],
+                        p.get('stars', 0))).encode())
+done = time.perf_counter()
+print(json.dumps([loaded - start, first - start, done - start, load_kb, peak_kb() - before, digest.hexdigest()]))
+"""
+
+
+def bench_binary_index(args):
+    """json.load of the project index vs its memory-mapped binary sidecar: load time and RSS"""
+    import subprocess
+    import binary_index
+    from ndjson_store import write_json_array
+
+    languages = ["Python", "Jupyter Notebook", "JavaScript", "TypeScript", "HTML", "CSS", "C++", "Shell"]
+    frameworks = ["TensorFlow", "PyTorch", "Flask", "React", "scikit-learn", "FastAPI"]
+    for count in (args.repos_index // 10, args.repos_index):
+        entries = [{
+            "name": f"repo-{i:06d}",
+            "description": f"Synthetic project number {i}" if i % 3 else None,
+            "url": f"https://github.com/{USERNAME}/repo-{i:06d}",
+            "stars": i % 7,
+            "forks": i % 3,
+            "languages": [languages[(i + k) % len(languages)] for k in range(1 + i % 4)],
+            "frameworks": [frameworks[(i * 5) % len(frameworks)]] if i % 2 else [],
+            "abstract": f"Implementation focused on repo {i}. " + "Built on a robust scientific computing stack. " * 4,
+            "updated_at": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+            "docs": f"repo-{i:06d}.{i:016x}.json",
+        } for i in range(count)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "project_index.json")
+            write_json_array(entries, path)
+            binary_index.write(entries, path)
+            sizes = os.path.getsize(path), os.path.getsize(binary_index.sidecar_path(path))
+            results = {}
+            for mode in ("json", "binary"):
+                out = subprocess.run([sys.executable, "-c", _INDEX_PROBE, mode, path, os.path.dirname(__file__)],
+                                     capture_output=True, text=True, check=True).stdout
+                results[mode] = json.loads(out)
+            print(f"{count:>7} projects  (json {sizes[0] / 1e6:5.1f} MB, sidecar {sizes[1] / 1e6:5.1f} MB)")
+            for mode, (load, first, scan, load_kb, scan_kb, _) in results.items():
+                print(f"  {mode:>6}: load {load * 1000:7.1f} ms  first field {first * 1000:7.1f} ms  "
+                      f"full scan {scan * 1000:7.1f} ms  peak RSS +{load_kb / 1024:6.1f} MB loaded, "
+                      f"+{scan_kb / 1024:6.1f} MB scanned")
+            print("  identical scan:", results["json"][5] == results["binary"][5])
+
+
+def bench_sanitize(args):
+    """Dump + re-read/rebuild/encode('ascii', 'ignore') rewrite vs one transliterating dump"""
+    import tracemalloc
+    import unicode_sanitizer
+
+    def legacy_sanitize(data):
+        # sanitize_unicode.sanitize_data as it was
+        if isinstance(data, dict):
+            return {k: legacy_sanitize(v) for k, v in data.items()}
+        if isinstance(data, list):
+            return [legacy_sanitize(v) for v in data]
+        if isinstance(data, str):
+            return data.encode('ascii', 'ignore').decode('ascii')
+        return data
+
+    words = "the model uses a convolutional pipeline for data analysis and evaluation of results".split()
+    special = ["Café", "naïve", "— “quoted” —", "🚀", "Straße", "résumé"]
+
+    def text(i, count):
+        # README-like prose: one word in fifty is non-ASCII
+        return " ".join(special[(i * k) % len(special)] if (i * 7 + k) % 50 == 0 else words[(i + k) % len(words)]
+                        for k in range(count))
+
+    projects = [{
+        "name": f"repo-{i:06d}",
+        "description": f"Synthetic project number {i}",
+        "languages": ["Python", "Jupyter Notebook"],
+        "abstract": text(i, 40),
+        "documentation": text(i, 600),
+    } for i in range(args.repos_sanitize)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects.json")
+
+        def legacy():
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(projects, f, indent=2)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(legacy_sanitize(data), f, indent=2)
+
+        def streaming():
+            with open(path, 'w', encoding='utf-8') as f:
+                unicode_sanitizer.dump(projects, f, indent=2)
+
+        outputs = {}
+        for label, fn in (("dump + rewrite", legacy), ("single pass", streaming)):
+            _, elapsed = timed(fn)
+            # Memory from a second, traced run, so tracing does not skew the time
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            with open(path, 'r', encoding='utf-8') as f:
+                outputs[label] = f.read()
+            print(f"{label:>15}: {elapsed:6.2f}s  peak {peak / 1024 / 1024:7.1f} MB  "
+                  f"{len(outputs[label]) / 1024 / 1024:6.1f} MB written")
+        old, new = outputs.values()
+        print("ASCII output:", old.isascii() and new.isascii(),
+              " sample:", json.loads(old)[0]['abstract'][:40], "|", json.loads(new)[0]['abstract'][:40])
+        print("matches a per-string NFKD transliteration:",
+              json.loads(new) == unicode_sanitizer.sanitize(projects))
+
+
+def bench_pipeline(args):
+    """Audit, research data and sanitize as separate processes vs the pipeline, cold and warm"""
+    import filecmp
+    import subprocess
+    from doc_shards import INDEX_FILE, PROJECTS_FILE
+
+    scripts = os.path.dirname(os.path.abspath(__file__))
+    outputs = (PROJECTS_FILE, INDEX_FILE, "_data/research_data.json")
+    with StubGitHub(repo_count=args.repos, latency=args.latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, GITHUB_API_URL=stub.url, GITHUB_TOKEN="bench")
+
+        def run(cwd, *commands):
+            for command in commands:
+                subprocess.run([sys.executable, os.path.join(scripts, command[0])] + list(command[1:]),
+                               cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+
+        chain = os.path.join(tmp, "chain")
+        pipeline = os.path.join(tmp, "pipeline")
+        os.makedirs(chain)
+        os.makedirs(pipeline)
+        steps = [("separate processes", chain, [("audit_and_doc_enhanced.py",), ("generate_research_data.py",),
+                                                ("sanitize_unicode.py",)]),
+                 ("pipeline (cold)", pipeline, [("pipeline.py",)]),
+                 ("pipeline (warm)", pipeline, [("pipeline.py",)]),
+                 ("pipeline --offline", pipeline, [("pipeline.py", "--offline")])]
+        for label, cwd, commands in steps:
+            _, elapsed = timed(run, cwd, *commands)
+            print(f"{label:>20}: {elapsed:6.2f}s")
+        print("identical outputs:", all(filecmp.cmp(os.path.join(chain, path), os.path.join(pipeline, path),
+                                                    shallow=False) for path in outputs))
+
+
+def make_file_tree(root, files):
+    """Lay out a synthetic checkout of empty files, a third of them under node_modules and .git"""
+    exts = ['.py', '.js', '.ts', '.json', '.md', '.png', '.csv', '.txt', '.java', '.go']
+    for i in range(files):
+        if i % 3 == 0:
+            sub = os.path.join("node_modules", f"dep{i % 97}", "lib") if i % 2 else os.path.join(".git", "objects", f"{i % 256:02x}")
+        else:
+            sub = os.path.join("src", f"pkg{i % 50}", f"mod{i % 7}")
+        path = os.path.join(root, sub)
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, f"f{i}{exts[i % len(exts)]}"), 'w').close()
+    for marker in ("package.json", "requirements.txt", "Dockerfile"):
+        with open(os.path.join(root, marker), 'w') as f:
+            f.write('{"dependencies": {"react": "18"}}' if marker == "package.json" else "flask\n")
+
+
+def bench_fs_index(args):
+    """Per-check recursive globs vs one pruned scandir index for analyze_tech_stack"""
+    import json as json_module
+    from pathlib import Path
+    import global_repo_update as updater_module
+
+    def legacy_analyze(repo_path):
+        # The original analyzer: one recursive glob per marker file and per extension
+        stack, frameworks = [], []
+        for file, (tech, possible_frameworks) in updater_module.STACK_FILES.items():
+            if (repo_path / file).exists() or list(repo_path.glob(f"**/{file}")):
+                stack.append(tech)
+                try:
+                    if file == 'package.json':
+                        with open(repo_path / file, 'r', encoding='utf-8') as f:
+                            data = json_module.load(f)
+                            deps = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
+                            for fw in possible_frameworks:
+                                if fw.lower() in [k.lower() for k in deps.keys()]:
+                                    frameworks.append(fw)
+                    elif file == 'requirements.txt':
+                        with open(repo_path / file, 'r', encoding='utf-8') as f:
+                            content = f.read().lower()
+                            for fw in possible_frameworks:
+                                if fw.lower() in content:
+                                    frameworks.append(fw)
+                except Exception:
+                    pass
+        for ext, lang in updater_module.EXTENSIONS.items():
+            if list(repo_path.glob(f"**/*{ext}")) and lang not in stack:
+                stack.append(lang)
+        return stack, frameworks
+
+    updater = updater_module.RepoUpdater()
+    with tempfile.TemporaryDirectory() as tmp:
+        make_file_tree(tmp, args.files)
+        root = Path(tmp)
+        results = {}
+        for label, fn in (("glob-per-check", legacy_analyze), ("scandir-index", updater.analyze_tech_stack)):
+            results[label], elapsed = timed(fn, root)
+            print(f"{label:>15}: {elapsed * 1000:9.1f} ms  {results[label]}")
+
+
+def bench_content_scan(args):
+    """Legacy open-every-file framework scan vs pruned single-regex scanner"""
+    import omni_protocol
+
+    def legacy_scan(repo_path):
+        # The original Tier 2 scan: 2000 chars of every file, one substring test per signature
+        languages, frameworks = set(), set()
+        for root, dirs, files in os.walk(repo_path):
+            if '.git' in root: continue
+            for file in files:
+                ext = os.path.splitext(file)[1]
+                if ext in omni_protocol.EXT_MAP:
+                    languages.add(omni_protocol.EXT_MAP[ext])
+                try:
+                    with open(os.path.join(root, file), 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read(2000).lower()
+                        for sig, name in omni_protocol.FW_SIGS.items():
+                            if sig in content:
+                                frameworks.add(name)
+                except Exception:
+                    pass
+        return languages, frameworks
+
+    sigs = list(omni_protocol.FW_SIGS)
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.files // 10):
+            sub = os.path.join(tmp, ".git", "objects", f"{i % 256:02x}") if i % 2 else os.path.join(tmp, "src", f"pkg{i % 40}")
+            os.makedirs(sub, exist_ok=True)
+            with open(os.path.join(sub, f"f{i}.py"), 'w') as f:
+                f.write(f"import {sigs[i % len(sigs)]}\n" + "x = 1\n" * 400)
+            if i % 50 == 0:
+                os.makedirs(os.path.join(tmp, "data"), exist_ok=True)
+                for name in (f"data/set{i}.csv", f"data/w{i}.h5", f"data/img{i}.png"):
+                    with open(os.path.join(tmp, name), 'wb') as f:
+                        f.write(os.urandom(64 * 1024))
+        legacy, legacy_time = timed(legacy_scan, tmp)
+        (languages, frameworks, stats), scan_time = timed(omni_protocol.scan_repo, tmp)
+        print(f"  legacy-scan: {legacy_time * 1000:8.1f} ms")
+        print(f"   fast-scan: {scan_time * 1000:8.1f} ms  {stats['files']} files / {stats['bytes'] / 1024:.1f} KB read")
+        print("same result:", legacy == (languages, frameworks))
+
+
+def bench_analysis_cache(args):
+    """Cold vs unchanged-tree vs one-changed-file analysis with the content-addressed cache"""
+    import subprocess
+    import omni_protocol
+    from analysis_cache import AnalysisCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = make_fixture_repo(os.path.join(tmp, "origin.git"), files=args.files // 20, commits=1)
+        work = os.path.join(tmp, "work")
+        subprocess.run(['git', 'clone', '--quiet', url, work], check=True)
+        git = lambda *a: subprocess.run(['git', '-c', 'user.name=bench', '-c', 'user.email=bench@example.com', *a],
+                                        cwd=work, check=True, capture_output=True)
+
+        def run(label):
+            # A fresh instance per run, as each nightly job starts from the saved file
+            omni_protocol.analysis_cache = AnalysisCache("omni_protocol", "bench", directory=tmp)
+            result, elapsed = timed(omni_protocol.analyze_tech_stack, work)
+            omni_protocol.analysis_cache.save()
+            print(f"{label:>18}: {elapsed * 1000:8.1f} ms  {omni_protocol.analysis_cache.summary()}")
+            return result
+
+        cold = run("cold")
+        run("unchanged tree")
+        with open(os.path.join(work, "src", "pkg0", "mod0.py"), 'a') as f:
+            f.write("\nimport streamlit\n")
+        git('commit', '--quiet', '-am', "one file changed")
+        changed = run("one file changed")
+        print("change detected:", 'Streamlit' in changed[1] and 'Streamlit' not in cold[1])
+
+
+def bench_notebook(args):
+    """2000-char head vs json.load vs streaming code-cell scan of an output-heavy notebook"""
+    import base64
+    import tracemalloc
+    import omni_protocol
+    import py_imports
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "analysis.ipynb")
+        image = base64.b64encode(os.urandom(args.notebook_mb * 1024 * 1024 * 3 // 4 // 20)).decode()
+        cells = []
+        for i, sig in enumerate(["pandas", "sklearn", "tensorflow", "keras"] * 5):
+            cells.append({"cell_type": "code", "execution_count": i, "metadata": {},
+                          "outputs": [{"output_type": "display_data", "data": {"image/png": image}}],
+                          "source": [f"import {sig}\n", "model.fit(x, y)\n"]})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"cells": cells, "metadata": {"kernelspec": {"name": "python3"}},
+                       "nbformat": 4, "nbformat_minor": 5}, f, indent=1)
+        del image, cells
+
+        def head():
+            with open(path, 'rb') as f:
+                return omni_protocol.match_signatures(f.read(omni_protocol.SCAN_BYTES))
+
+        def whole():
+            with open(path, encoding='utf-8') as f:
+                nb = json.load(f)
+            return omni_protocol.match_signatures("".join(
+                "".join(c['source']) for c in nb['cells'] if c['cell_type'] == 'code').encode())
+
+        def streaming():
+            return py_imports.imports_of_file(path)[0]
+
+        print(f"notebook: {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+        for label, fn in (("head-2000", head), ("json.load", whole), ("stream+ast", streaming)):
+            tracemalloc.start()
+            found, elapsed = timed(fn)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{label:>10}: {elapsed:6.2f}s  peak {peak / 1024 / 1024:7.1f} MB  {sorted(found)}")
+
+
+def bench_imports(args):
+    """AST import extraction throughput: whole-file parse vs import-header parse vs blob-SHA memo"""
+    import ast
+    import omni_protocol
+    import py_imports
+    from analysis_cache import AnalysisCache, git_blob_sha
+    from py_imports import ImportExtractor
+
+    def full_parse(files):
+        # Every file parsed to the end, as before parsing stopped at the last import
+        results = {}
+        for path, _ in files:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read())
+            results[path] = {alias.name.split('.')[0] for node in py_imports._statements(tree.body)
+                             if isinstance(node, ast.Import) for alias in node.names}
+            results[path] |= {node.module.split('.')[0] for node in py_imports._statements(tree.body)
+                              if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module}
+        return results, len(files), 0
+
+    modules = ["tensorflow", "torch", "sklearn.svm", "pandas", "flask", "cv2", "numpy", "os", "json"]
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        # Python 2 files are left out of the whole-file comparison, which has no regex fallback
+        parseable = []
+        substring_hits = 0
+        for i in range(args.files // 2):
+            sub = os.path.join(tmp, f"pkg{i % 100}")
+            os.makedirs(sub, exist_ok=True)
+            path = os.path.join(sub, f"mod{i}.py")
+            # Comments and strings that mention a framework fool substring matching, not ast
+            source = (f"import {modules[i % len(modules)]}\nfrom {modules[(i * 7) % len(modules)]} import x\n"
+                      f"# TODO: try the gym example from the {modules[(i * 3) % len(modules)]} docs\n"
+                      + "def f(a, b):\n    return [a * k + b for k in range(10)]\n" * 20)
+            if i % 500 == 0:
+                source = "print 'python 2'\nimport keras\n"
+            with open(path, 'w') as f:
+                f.write(source)
+            files.append((path, git_blob_sha(source)))
+            if i % 500:
+                parseable.append((path, None))
+            substring_hits += len(omni_protocol.match_signatures(source.encode()))
+
+        cache = AnalysisCache("imports", "bench", directory=tmp)
+        results = {}
+        for label, fn in (("whole file", lambda: full_parse(parseable)),
+                          ("import header", lambda: ImportExtractor().extract(parseable)),
+                          ("memo (cold)", lambda: ImportExtractor().extract(files, cache)),
+                          ("memo (warm)", lambda: ImportExtractor().extract(files, cache))):
+            (imports, parsed, _), elapsed = timed(fn)
+            results[label] = imports
+            print(f"{label:>13}: {elapsed:6.2f}s  {len(imports) / max(elapsed, 1e-9):9.0f} files/s  {parsed} parsed")
+        print("identical results:", results["whole file"] == results["import header"]
+              and all(results["memo (cold)"][path] == modules for path, modules in results["whole file"].items()))
+        ast_hits = sum(len(omni_protocol.import_signatures(m)) for m in results["memo (cold)"].values())
+        print(f"framework signals: substring {substring_hits}, ast imports {ast_hits}")
+
+
+# The README generators as they were before readme_templates, verbatim, for bench_readmes
+def _legacy_omni_readme(repo_name, tier, data=None, tech_analysis=None):
+    """Generate Research Paper formatted README"""
+    if tier == 1:
+        abstract = data['abstract']
+        tech_stack = ", ".join(data['tags'])
+        category = data['category']
+    else:
+        # Synthesize for Tier 2
+        langs, fws = tech_analysis
+        tech_stack = ", ".join(langs + fws)
+        category = "Software Archive"
+        
+        # Heuristic Abstract
+        clean_name = repo_name.replace('-', ' ').replace('_', ' ').title()
+        if 'notebook' in [l.lower() for l in langs]:
+            abstract = f"Computational analysis and research implementation for **{clean_name}**. Utilizes interactive notebook environments for data exploration and algorithmic validation."
+        elif 'python' in [l.lower() for l in langs]:
+             abstract = f"Backend algorithm implementation for **{clean_name}**. Developed in Python with a focus on modular architecture and data processing efficiency."
+        else:
+             abstract = f"Source code repository for **{clean_name}**. Implements core logic and structural components for the target application domain."
+
+    readme = f"""# {repo_name.replace('-', ' ').replace('_', ' ').title()}
+
+![Status](https://img.shields.io/badge/Status-Research_Grade-002147?style=flat-square&logo=github) ![Category](https://img.shields.io/badge/Domain-{category.replace(' ', '_')}-008080?style=flat-square)
+
+## \U0001f4c4 Abstract
+
+{abstract}
+
+## \u2699\ufe0f Technical Architecture
+
+**Stack:** {tech_stack}
+
+### Implementation Details
+The system architecture adheres to rigorous software engineering standards. 
+{ 'Key components include data preprocessing pipelines, model inference engines, and modular utility wrappers.' if tier == 2 else 'The solution leverages advanced architectural patterns optimized for the specific problem domain, ensuring high performance and reproducibility.'}
+
+## \U0001f4da Citation
+
+If you utilize this work in your research, please cite:
+
+```bibtex
+@software{{{repo_name.lower().replace('-', '_')}_2025,
+  author = {{Vaishnav AK}},
+  title = {{{repo_name.replace('-', ' ').replace('_', ' ').title()}}},
+  year = {{2025}},
+  url = {{https://github.com/{USERNAME}/{repo_name}}},
+  note = {{Bio-Intelligence Research Ecosystem}}
+}}
+```
+
+---
+*© {time.strftime('%Y')} Vaishnav AK. Engineered for Biomedical Innovation.*
+"""
+    return readme
+
+
+def _legacy_bio_readme(repo_name, data):
+    """Generate research-grade README using verified data"""
+    abstract = data['abstract']
+    keywords = data['tech_keywords']
+    
+    readme = f"""# {repo_name.replace('-', ' ').replace('_', ' ').title()}
+
+## Abstract
+
+{abstract}
+
+## Technical Architecture
+
+**Core Technologies:** {', '.join(keywords)}
+
+**Architecture Overview:**
+This implementation follows a rigorous scientific methodology:
+
+1. **Data Pipeline:** Robust preprocessing with validation splits for unbiased evaluation
+2. **Model Architecture:** State-of-the-art neural network design optimized for the target domain
+3. **Training Protocol:** Systematic hyperparameter tuning with cross-validation
+4. **Evaluation Metrics:** Comprehensive performance analysis using standard benchmarks
+
+## Installation & Usage
+
+### Prerequisites
+- Python 3.7 or higher
+- CUDA-capable GPU (recommended for training)
+
+### Setup
+```bash
+git clone https://github.com/{USERNAME}/{repo_name}.git
+cd {repo_name}
+pip install -r requirements.txt
+```
+
+### Running the Model
+```python
+# See notebooks or main.py for execution details
+python main.py
+```
+
+## Research Context
+
+This project contributes to the broader field of AI in healthcare/data science, demonstrating practical applications of machine learning for real-world problem-solving.
+
+## Citation
+
+If you use this work in your research, please cite:
+
+```bibtex
+@software{{{repo_name.lower().replace('-', '_')}_2024,
+  author = {{Vaishnav AK}},
+  title = {{{repo_name.replace('-', ' ').replace('_', ' ').title()}}},
+  year = {{2024}},
+  url = {{https://github.com/{USERNAME}/{repo_name}}}
+}}
+```
+
+## License
+
+This project is part of the research portfolio by [Vaishnav AK](https://github.com/{USERNAME}).
+
+---
+
+**Status:** Research Implementation  
+**Author:** Vaishnav AK, Data Scientist & Biomedical Engineer
+"""
+    return readme
+
+
+def bench_readmes(args):
+    """Per-repo f-string README generators vs the same f-strings fed shared fragments by render_many"""
+    import random
+    import bio_ai_upgrade
+    import omni_protocol
+    from readme_templates import render_many
+
+    rng = random.Random(18)
+    words = ['deep', 'retina', 'pneumonia', 'stock', 'price', 'agent', 'rl', 'portfolio', 'ecg', 'web', 'api', 'gym']
+    langs = ['Python', 'Jupyter Notebook', 'JavaScript', 'TypeScript', 'Docker', 'Node.js', 'Go']
+    fws = ['Flask', 'Django', 'PyTorch', 'TensorFlow', 'React', 'Express']
+    repos = []
+    for i in range(args.repos_readme):
+        name = rng.choice('-_').join(rng.sample(words, 3)) + f"-{i}"
+        stack = rng.sample(langs, rng.randint(0, 3))
+        frameworks = rng.sample(fws, rng.randint(0, 2))
+        repos.append({
+            "name": name, "stack": stack, "frameworks": frameworks,
+            "tier1": {"abstract": f"Abstract of {name}.", "tags": frameworks + stack, "category": rng.choice(["Medical AI", "Computer Vision"])},
+            "bio": {"abstract": f"Abstract of {name}.", "tech_keywords": frameworks + stack},
+        })
+
+    generators = {
+        "omni tier 1": (
+            lambda r: _legacy_omni_readme(r['name'], 1, data=r['tier1']),
+            lambda r: omni_protocol.generate_readme(r['name'], 1, data=r['tier1']),
+            lambda rs: render_many(omni_protocol.generate_readme, ((r['name'], 1, r['tier1']) for r in rs), 2025)),
+        "omni tier 2": (
+            lambda r: _legacy_omni_readme(r['name'], 2, tech_analysis=(r['stack'], r['frameworks'])),
+            lambda r: omni_protocol.generate_readme(r['name'], 2, tech_analysis=(r['stack'], r['frameworks'])),
+            lambda rs: render_many(omni_protocol.generate_readme,
+                                   ((r['name'], 2, None, (r['stack'], r['frameworks'])) for r in rs), 2025)),
+        "bio-ai research": (
+            lambda r: _legacy_bio_readme(r['name'], r['bio']),
+            lambda r: bio_ai_upgrade.generate_research_readme(r['name'], r['bio']),
+            lambda rs: render_many(bio_ai_upgrade.generate_research_readme, ((r['name'], r['bio']) for r in rs), 2024)),
+    }
+    def best_of(fn, *fn_args, runs=5):
+        # Rendering is quick enough for scheduler noise to matter; report the best run
+        results = [timed(fn, *fn_args) for _ in range(runs)]
+        return results[0][0], min(elapsed for _, elapsed in results)
+
+    print(f"{len(repos)} synthetic repos, best of 5 runs")
+    for label, (legacy, single, many) in generators.items():
+        old, legacy_time = best_of(lambda: [legacy(r) for r in repos])
+        new, single_time = best_of(lambda: [single(r) for r in repos])
+        batch, batch_time = best_of(many, repos)
+        print(f"{label:>16}: inline f-strings {legacy_time * 1000:7.1f} ms  fragments {single_time * 1000:7.1f} ms  "
+              f"render_many {batch_time * 1000:7.1f} ms  identical: {old == new == batch}")
+
+
+BENCHMARKS = {
+    "analysis-cache": bench_analysis_cache,
+    "api-client": bench_api_client,
+    "binary-index": bench_binary_index,
+    "checkout": bench_checkout,
+    "content-scan": bench_content_scan,
+    "http-cache": bench_http_cache,
+    "fs-index": bench_fs_index,
+    "graphql": bench_graphql,
+    "imports": bench_imports,
+    "incremental": bench_incremental,
+    "rate-limit": bench_rate_limit,
+    "sanitize": bench_sanitize,
+    "listing": bench_listing,
+    "mirror": bench_mirror,
+    "notebook": bench_notebook,
+    "pipeline": bench_pipeline,
+    "project-store": bench_project_store,
+    "publish": bench_publish,
+    "readmes": bench_readmes,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repos", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub server latency per request (s)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--files", type=int, default=100000, help="files in synthetic checkouts")
+    parser.add_argument("--repos-store", type=int, default=64000, help="largest synthetic account for project-store")
+    parser.add_argument("--repos-index", type=int, default=100000, help="largest synthetic index for binary-index")
+    parser.add_argument("--repos-sanitize", type=int, default=20000, help="synthetic projects for sanitize")
+    parser.add_argument("--repos-publish", type=int, default=100, help="repos written by the publish benchmark")
+    parser.add_argument("--repos-readme", type=int, default=10000, help="synthetic repos for the readmes benchmark")
+    parser.add_argument("--notebook-mb", type=int, default=200, help="size of the synthetic notebook")
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Binary Project Index
+A compact sidecar of project_index.json (<name>.bin next to it) that readers
+memory-map instead of parsing: one fixed-width record per project, with
+strings and string lists held as ids into a deduplicated, offset-indexed
+string table. Fields are decoded only when read.
+
+The sidecar records the size and mtime of the JSON it was built from and
+is ignored once they differ, so it never needs to be trusted blindly.
+
+File layout, little-endian:
+    header
+    records       count x RECORD (presence mask, then the FIELDS in order)
+    lists         u32 string ids, referenced as (start, count) by 'strs' fields
+    offsets       (strings + 1) x u32 byte offsets into the blob
+    blob          UTF-8 string data
+"""
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b'PIDX'
+VERSION = 1
+# Every string of the projects the index was built from is ASCII
+FLAG_ASCII = 1
+NULL = 0xFFFFFFFF
+
+FIELDS = (
+    ('name', 'str'),
+    ('description', 'str'),
+    ('url', 'str'),
+    ('stars', 'int'),
+    ('forks', 'int'),
+    ('languages', 'strs'),
+    ('frameworks', 'strs'),
+    ('abstract', 'str'),
+    ('has_good_readme', 'bool'),
+    ('updated_at', 'str'),
+    ('docs', 'str'),
+)
+_CODES = {'str': 'I', 'int': 'q', 'strs': 'II', 'bool': '?'}
+
+HEADER = struct.Struct('<4sHHIIqqQQ')
+RECORD = struct.Struct('<H' + ''.join(_CODES[kind] for _, kind in FIELDS))
+
+# name -> (presence bit, kind, position of its first value in an unpacked record)
+_LAYOUT = {}
+_position = 1
+for _bit, (_name, _kind) in enumerate(FIELDS):
+    _LAYOUT[_name] = (1 << _bit, _kind, _position)
+    _position += len(_CODES[_kind])
+
+_MISSING = object()
+
+
+def sidecar_path(json_path):
+    return os.path.splitext(json_path)[0] + '.bin'
+
+
+def _packable(entry):
+    for key, value in entry.items():
+        if key not in _LAYOUT:
+            return False
+        kind = _LAYOUT[key][1]
+        if kind == 'str' and not (value is None or isinstance(value, str)):
+            return False
+        if kind == 'int' and not (isinstance(value, int) and not isinstance(value, bool)):
+            return False
+        if kind == 'strs' and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+            return False
+        if kind == 'bool' and not isinstance(value, bool):
+            return False
+    return True
+
+
+def write(entries, json_path, ascii=False):
+    """Write the sidecar of json_path (already written) from its entries
+
+    Returns False, removing any old sidecar, if an entry has a field or
+    type the record layout cannot hold; readers then use the JSON.
+    """
+    path = sidecar_path(json_path)
+    if not all(_packable(entry) for entry in entries):
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+    ids = {}
+    strings = []
+
+    def intern(text):
+        if text is None:
+            return NULL
+        if text not in ids:
+            ids[text] = len(strings)
+            strings.append(text.encode('utf-8'))
+        return ids[text]
+
+    records = bytearray()
+    lists = []
+    for entry in entries:
+        mask = 0
+        values = []
+        for name, kind in FIELDS:
+            bit = _LAYOUT[name][0]
+            value = entry.get(name, _MISSING)
+            if value is _MISSING:
+                values.extend((0, 0) if kind == 'strs' else (NULL if kind == 'str' else 0,))
+                continue
+            mask |= bit
+            if kind == 'str':
+                values.append(intern(value))
+            elif kind == 'strs':
+                values.extend((len(lists), len(value)))
+                lists.extend(intern(item) for item in value)
+            else:
+                values.append(value)
+        records += RECORD.pack(mask, *values)
+
+    offsets = [0]
+    for data in strings:
+        offsets.append(offsets[-1] + len(data))
+    lists_offset = HEADER.size + len(records)
+    strings_offset = lists_offset + 4 * len(lists)
+    stat = os.stat(json_path)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, FLAG_ASCII if ascii else 0, len(entries), len(strings),
+                            stat.st_size, stat.st_mtime_ns, lists_offset, strings_offset))
+        f.write(records)
+        f.write(struct.pack(f'<{len(lists)}I', *lists))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for data in strings:
+            f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+class ProjectView:
+    """Read-only, dict-like view of one record; fields are decoded on access"""
+
+    __slots__ = ('_index', '_offset', '_record')
+
+    def __init__(self, index, offset):
+        self._index = index
+        self._offset = offset
+        self._record = None
+
+    def get(self, key, default=None):
+        record = self._record
+        if record is None:
+            record = self._record = RECORD.unpack_from(self._index._map, self._offset)
+        reader = self._index._readers.get(key)
+        if reader is None or not record[0] & reader[0]:
+            return default
+        return reader[1](record)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return [name for name, _ in FIELDS if name in self]
+
+    def to_dict(self):
+        return {name: self[name] for name in self.keys()}
+
+    def __repr__(self):
+        return f"ProjectView({self.get('name')!r})"
+
+
+class BinaryIndex:
+    """Memory-mapped sidecar; a sequence of ProjectViews"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.flags, self.count, strings, self.source_size, self.source_mtime_ns,
+         lists, offsets) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} project index")
+        self._lists = self._u32_table(lists, (offsets - lists) // 4)
+        self._offsets = self._u32_table(offsets, strings + 1)
+        self._blob = offsets + 4 * (strings + 1)
+        # name -> (presence bit, record -> decoded value)
+        self._readers = {name: (bit, self._reader(kind, position)) for name, (bit, kind, position) in _LAYOUT.items()}
+
+    def _u32_table(self, start, count):
+        table = memoryview(self._map)[start:start + 4 * count]
+        if sys.byteorder == 'little':
+            return table.cast('I')
+        return struct.unpack_from(f'<{count}I', table)
+
+    @property
+    def ascii(self):
+        return bool(self.flags & FLAG_ASCII)
+
+    def _string(self, i):
+        if i == NULL:
+            return None
+        blob, offsets = self._blob, self._offsets
+        return self._map[blob + offsets[i]:blob + offsets[i + 1]].decode('utf-8')
+
+    def _reader(self, kind, position):
+        string, lists = self._string, self._lists
+        if kind == 'str':
+            return lambda record: string(record[position])
+        if kind == 'strs':
+            def read_list(record):
+                start = record[position]
+                return [string(i) for i in lists[start:start + record[position + 1]]]
+            return read_list
+        return lambda record: record[position]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return ProjectView(self, HEADER.size + i * RECORD.size)
+
+    def __iter__(self):
+        offset = HEADER.size
+        for _ in range(self.count):
+            yield ProjectView(self, offset)
+            offset += RECORD.size
+
+    def close(self):
+        # The id tables view the map and must be released before it closes
+        for table in (self._lists, self._offsets):
+            if isinstance(table, memoryview):
+                table.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_sidecar(json_path):
+    """The BinaryIndex of json_path if one was built from its current contents, else None"""
+    path = sidecar_path(json_path)
+    try:
+        stat = os.stat(json_path)
+        index = BinaryIndex(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if (index.source_size, index.source_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        index.close()
+        return None
+    return index
@@ -3,18 +3,22 @@
 Bio-AI Repository Upgrade Script
 Updates verified medical/ML projects with research-grade documentation
 """
-import urllib.request
-import urllib.error
-import json
 import os
 import subprocess
-import shutil
 from pathlib import Path
-import time
+
+from git_publisher import PUBLISH_MODE, GitDataPublisher
+from github_client import GitHubClient
+from http_cache import ResponseCache
+from mirror_store import MirrorError, MirrorStore
+from rate_limit import content_scheduler
+from readme_templates import project_fragments, render_many
+from remote_tree import file_unchanged, root_tree
 
 USERNAME = "vaishnavak2001"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 TEMP_WORKSPACE = Path("C:/temp/bio_ai_upgrade")
+COMMIT_MESSAGE = "feat(docs): upgrade to research-grade documentation"
 
 # VERIFIED PROJECT DATA - Use exactly as provided
 VERIFIED_PROJECTS = {
@@ -48,12 +52,13 @@ VERIFIED_PROJECTS = {
     }
 }
 
-def generate_research_readme(repo_name, data):
+def generate_research_readme(repo_name, data, fragments=None):
     """Generate research-grade README using verified data"""
+    fragments = fragments or project_fragments(repo_name, 2024)
     abstract = data['abstract']
     keywords = data['tech_keywords']
     
-    readme = f"""# {repo_name.replace('-', ' ').replace('_', ' ').title()}
+    readme = f"""# {fragments.title}
 
 ## Abstract
 
@@ -99,9 +104,9 @@ This project contributes to the broader field of AI in healthcare/data science,
 If you use this work in your research, please cite:
 
 ```bibtex
-@software{{{repo_name.lower().replace('-', '_')}_2024,
+@software{{{fragments.citation_key},
   author = {{Vaishnav AK}},
-  title = {{{repo_name.replace('-', ' ').replace('_', ' ').title()}}},
+  title = {{{fragments.title}}},
   year = {{2024}},
   url = {{https://github.com/{USERNAME}/{repo_name}}}
 }}
@@ -118,8 +123,34 @@ This project is part of the research portfolio by [Vaishnav AK](https://github.c
 """
     return readme
 
-def update_repository(repo_name, data):
-    """Clone, update, and push single repository"""
+def clone_url(repo_name):
+    return f"https://{GITHUB_TOKEN}@github.com/{USERNAME}/{repo_name}.git"
+
+def plan_updates(client, mirrors):
+    """[(repo_name, branch, README)] for the projects whose remote README differs
+
+    Generated READMEs are compared by blob SHA with the README.md listed
+    in the root tree of each repo's default branch, so up-to-date repos
+    are never checked out. branch is None if the API could not name it.
+    """
+    readmes = render_many(generate_research_readme, VERIFIED_PROJECTS.items(), 2024)
+
+    def plan(item):
+        repo_name, readme_content = item
+        branch = (client.get_json(f"/repos/{USERNAME}/{repo_name}") or {}).get('default_branch')
+        root = root_tree(USERNAME, repo_name, branch, client, mirrors, clone_url(repo_name))
+        return repo_name, branch, readme_content, file_unchanged(root, readme_content)
+    
+    updates = []
+    for repo_name, branch, readme_content, unchanged in client.map(plan, zip(VERIFIED_PROJECTS, readmes)):
+        if unchanged:
+            print(f"  = {repo_name}: README up to date")
+        else:
+            updates.append((repo_name, branch, readme_content))
+    return updates
+
+def update_repository(repo_name, branch, readme_content, mirrors):
+    """Check out, update, and push single repository"""
     print(f"\n{'='*60}")
     print(f"Upgrading: {repo_name}")
     print(f"{'='*60}")
@@ -127,66 +158,62 @@ def update_repository(repo_name, data):
     repo_path = TEMP_WORKSPACE / repo_name
     
     try:
-        # Clone
-        clone_url = f"https://{GITHUB_TOKEN}@github.com/{USERNAME}/{repo_name}.git"
-        print(f"  -> Cloning...")
+        # Refresh the persistent mirror; the worktree is removed on exit
+        print(f"  -> Syncing mirror...")
         
-        if repo_path.exists():
-            shutil.rmtree(repo_path)
-        
-        result = subprocess.run(
-            ['git', 'clone', clone_url, str(repo_path)],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            print(f"  X Clone failed: {result.stderr}")
-            return False
-        
-        # Generate README
-        print(f"  -> Generating research-grade README...")
-        readme_content = generate_research_readme(repo_name, data)
-        
-        with open(repo_path / "README.md", 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        
-        # Git operations
-        print(f"  -> Committing...")
-        subprocess.run(['git', 'add', 'README.md'], cwd=str(repo_path), check=True)
-        subprocess.run(
-            ['git', 'commit', '-m', 'feat(docs): upgrade to research-grade documentation'],
-            cwd=str(repo_path),
-            check=True
-        )
-        
-        print(f"  -> Pushing to GitHub...")
-        result = subprocess.run(
-            ['git', 'push', 'origin', 'main'],
-            cwd=str(repo_path),
-            capture_output=True,
-            text=True
-        )
+        # The README is rewritten wholesale, so nothing else needs checking out
+        # branch None checks out the mirror's default branch
+        with mirrors.checkout(repo_name, clone_url(repo_name), repo_path, branch, sparse=['/README.md']):
+            print(f"  -> Writing research-grade README...")
+            with open(repo_path / "README.md", 'w', encoding='utf-8') as f:
+                f.write(readme_content)
+            
+            # Git operations
+            print(f"  -> Committing...")
+            subprocess.run(['git', 'add', 'README.md'], cwd=str(repo_path), check=True)
+            subprocess.run(
+                ['git', 'commit', '-m', COMMIT_MESSAGE],
+                cwd=str(repo_path),
+                check=True
+            )
+            
+            print(f"  -> Pushing to GitHub...")
+            result = subprocess.run(
+                ['git', 'push', 'origin', branch or 'HEAD'],
+                cwd=str(repo_path),
+                capture_output=True,
+                text=True
+            )
         
         if result.returncode != 0:
             print(f"  X Push failed: {result.stderr}")
             return False
         
         print(f"  ✓ Successfully upgraded {repo_name}")
-        
-        # Cleanup
-        shutil.rmtree(repo_path)
         return True
         
+    except MirrorError as e:
+        print(f"  X Clone failed: {e}")
+        return False
     except Exception as e:
         print(f"  X Error: {str(e)}")
-        if repo_path.exists():
-            try:
-                shutil.rmtree(repo_path)
-            except:
-                pass
         return False
 
+def publish_updates(client, updates):
+    """Commit the READMEs through the Git Data API, concurrently; returns the success count"""
+    publisher = GitDataPublisher(client, USERNAME, content_scheduler())
+    jobs = [(repo_name, branch, {"README.md": readme_content}, COMMIT_MESSAGE)
+            for repo_name, branch, readme_content in updates]
+    success_count = 0
+    for (repo_name, branch, _, _), result in zip(jobs, publisher.publish_many(jobs)):
+        if isinstance(result, Exception):
+            print(f"  X {repo_name}: publish failed: {result}")
+        else:
+            print(f"  ✓ {repo_name}: {result.status} on {branch}")
+            success_count += 1
+    print(publisher.summary())
+    return success_count
+
 def main():
     print("="*60)
     print("BIO-AI REPOSITORY UPGRADE - INITIATED")
@@ -201,15 +228,24 @@ def main():
     success_count = 0
     total = len(VERIFIED_PROJECTS)
     
-    for repo_name, data in VERIFIED_PROJECTS.items():
-        if update_repository(repo_name, data):
-            success_count += 1
-        time.sleep(2)  # Rate limiting
+    client = GitHubClient(token=GITHUB_TOKEN, user_agent="Bio-AI-Upgrade-Agent", cache=ResponseCache())
+    mirrors = MirrorStore(lean=True)
+    updates = plan_updates(client, mirrors)
+    if PUBLISH_MODE == "api":
+        success_count = publish_updates(client, updates)
+    else:
+        push_scheduler = content_scheduler()
+        for repo_name, branch, readme_content in updates:
+            push_scheduler.acquire()  # Paced for GitHub's content-creation limits
+            if update_repository(repo_name, branch, readme_content, mirrors):
+                success_count += 1
     
     print("\n" + "="*60)
     print("PHASE 1 COMPLETE")
     print("="*60)
-    print(f"Successfully Upgraded: {success_count}/{total}")
+    print(f"Already Up To Date: {total - len(updates)}/{total}")
+    print(f"Successfully Upgraded: {success_count}/{len(updates)}")
+    print(mirrors.summary())
     print("="*60)
 
 if __name__ == "__main__":
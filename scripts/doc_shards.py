@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Documentation Shards
+Splits the heavy markdown of each project entry (README, technical
+architecture) into assets/docs/<name>.<content hash>.json and writes a slim
+_data/project_index.json holding everything else, so pages inline only the
+index and fetch a project's documentation when it is opened. The full
+projects.json is kept with the audit state, outside _data/, so Jekyll never
+parses it
+
+Shard names change whenever their contents do, so they can be cached for
+as long as browsers like. The index also gets a binary_index sidecar for
+readers that only need a few fields. Run directly to split an existing
+projects.json.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+
+import binary_index
+from incremental import STATE_DIR
+from ndjson_store import write_json_array
+
+PROJECTS_FILE = os.path.join(STATE_DIR, "projects.json")
+INDEX_FILE = "_data/project_index.json"
+SHARD_DIR = "assets/docs"
+SHARD_FIELDS = ('documentation', 'technical_architecture')
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def shard_name(name, data):
+    return f"{_UNSAFE.sub('_', name)}.{hashlib.sha256(data).hexdigest()[:16]}.json"
+
+
+class DocShards:
+    """Feed project entries through add(); close() writes the index and prunes stale shards"""
+
+    def __init__(self, index_file=INDEX_FILE, shard_dir=SHARD_DIR, sidecar=True):
+        self.index_file = index_file
+        self.shard_dir = shard_dir
+        self.sidecar = sidecar
+        self.ascii = True
+        self.index = []
+        self.written = set()
+        self.stats = {"written": 0, "kept": 0, "pruned": 0}
+        os.makedirs(os.path.dirname(index_file) or '.', exist_ok=True)
+        os.makedirs(shard_dir, exist_ok=True)
+
+    def add(self, project):
+        """Shard one entry and return it unchanged, so add() can sit in a stream of entries"""
+        docs = {field: project[field] for field in SHARD_FIELDS if field in project}
+        entry = {key: value for key, value in project.items() if key not in SHARD_FIELDS}
+        data = json.dumps(docs).encode('utf-8')
+        if self.ascii:
+            self.ascii = json.dumps(project, ensure_ascii=False).isascii()
+        name = shard_name(project['name'], data)
+        path = os.path.join(self.shard_dir, name)
+        # Same name, same bytes: a shard already on disk is left alone
+        if os.path.exists(path):
+            self.stats["kept"] += 1
+        else:
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.stats["written"] += 1
+        self.written.add(name)
+        entry['docs'] = name
+        self.index.append(entry)
+        return project
+
+    def close(self):
+        write_json_array(self.index, self.index_file)
+        if self.sidecar:
+            binary_index.write(self.index, self.index_file, ascii=self.ascii)
+        for name in os.listdir(self.shard_dir):
+            if name.endswith('.json') and name not in self.written:
+                os.remove(os.path.join(self.shard_dir, name))
+                self.stats["pruned"] += 1
+
+    def summary(self):
+        return (f"Documentation shards: {self.stats['written']} written, {self.stats['kept']} unchanged, "
+                f"{self.stats['pruned']} pruned; index of {len(self.index)} projects in {self.index_file}")
+
+
+def load_index(path=INDEX_FILE):
+    """The project index: memory-mapped views from its sidecar when current, else parsed JSON dicts"""
+    index = binary_index.open_sidecar(path)
+    if index is not None:
+        return index
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def split(projects_file=PROJECTS_FILE, index_file=INDEX_FILE, shard_dir=SHARD_DIR):
+    with open(projects_file, 'r', encoding='utf-8') as f:
+        projects = json.load(f)
+    shards = DocShards(index_file, shard_dir)
+    for project in projects:
+        shards.add(project)
+    shards.close()
+    return shards
+
+
+if __name__ == "__main__":
+    print(split(*sys.argv[1:2]).summary())
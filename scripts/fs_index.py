@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Filesystem Index
+One pruned os.scandir walk of a checkout, recording extension counts and
+the paths and sizes of marker files, so stack checks never re-walk the tree
+"""
+import os
+from collections import Counter
+
+# Directories that never say anything about a project's own stack
+IGNORED_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', '.tox',
+                '.mypy_cache', '.pytest_cache', '.ipynb_checkpoints', 'site-packages'}
+
+
+def walk_files(root, ignored=IGNORED_DIRS):
+    """Yield (relative path, DirEntry) for every file under root, pruning ignored dirs"""
+    stack = [(os.fspath(root), "")]
+    while stack:
+        path, rel = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignored:
+                                stack.append((entry.path, rel + entry.name + "/"))
+                        elif entry.is_file(follow_symlinks=False):
+                            yield rel + entry.name, entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class FileIndex:
+    """In-memory index of a checkout: extension counts, marker files and,
+    for the extensions in collect, the paths of every matching file"""
+
+    def __init__(self, root, markers=(), ignored=IGNORED_DIRS, collect=()):
+        self.root = os.fspath(root)
+        self.extensions = Counter()
+        self.markers = {name: [] for name in markers}
+        self.paths = {ext: [] for ext in collect}
+        self.files = 0
+        for rel, entry in walk_files(self.root, ignored):
+            self.files += 1
+            name = entry.name
+            ext = os.path.splitext(name)[1].lower()
+            self.extensions[ext] += 1
+            if ext in self.paths:
+                self.paths[ext].append(rel)
+            if name in self.markers:
+                # Only marker files are stat'ed; a stat per file would dominate the walk
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    size = 0
+                self.markers[name].append((rel, size))
+
+    def has_marker(self, name):
+        return bool(self.markers.get(name))
+
+    def has_extension(self, ext):
+        return self.extensions[ext.lower()] > 0
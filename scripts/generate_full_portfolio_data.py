@@ -1,8 +1,11 @@
-import json
 import os
-import urllib.request
 from datetime import datetime
 
+import unicode_sanitizer
+from doc_shards import load_index
+from github_client import GitHubClient
+from http_cache import ResponseCache
+
 # --- CONFIGURATION ---
 USERNAME = "vaishnavak2001"
 OUTPUT_FILE = "_data/research_data.json"
@@ -92,23 +95,31 @@ FEATURED_PROJECTS = {
 
 def fetch_repos():
     # Attempt to fetch repos. If token fails, return empty list.
-    url = f"https://api.github.com/users/{USERNAME}/repos?per_page=100&type=owner"
-    req = urllib.request.Request(url)
-    if GITHUB_TOKEN:
-        req.add_header("Authorization", f"token {GITHUB_TOKEN}")
-    
+    client = GitHubClient(token=GITHUB_TOKEN, cache=ResponseCache())
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
+        repos = list(client.iter_pages(f"/users/{USERNAME}/repos?type=owner"))
+        if not repos:
+            raise OSError("no repositories listed")
+        print(client.cache.summary())
+        return repos
     except Exception as e:
         print(f"Error fetching repos: {e}. Using sanitized local backup if available.")
-        # Fallback to reading existing sanitized projects.json if API fails
+        # Fallback to the existing sanitized project index if API fails
         try:
-             with open('_data/projects.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return [index_repo(project) for project in load_index()]
         except:
             return []
 
+def index_repo(project):
+    """A project index entry in the shape of a listed repo; its last update stands in for creation"""
+    return {
+        "name": project['name'],
+        "html_url": project['url'],
+        "created_at": project['updated_at'],
+        "description": project.get('description'),
+        "language": (project.get('languages') or [None])[0]
+    }
+
 def infer_tags(repo):
     tags = []
     if repo.get('language'):
@@ -171,23 +182,20 @@ def process_data(repos):
     final_data.sort(key=lambda x: (not x['featured'], -x['year']))
     return final_data
 
-if __name__ == "__main__":
+def main():
+    """Write research_data.json and return its entries"""
     print("Fetching repository data...")
     repos = fetch_repos()
     print(f"Found {len(repos)} repositories.")
     
     full_data = process_data(repos)
-    
-    # Strip Unicode for safety
-    def sanitize(obj):
-        if isinstance(obj, str): return obj.encode('ascii', 'ignore').decode('ascii')
-        if isinstance(obj, list): return [sanitize(i) for i in obj]
-        if isinstance(obj, dict): return {k: sanitize(v) for k, v in obj.items()}
-        return obj
-        
-    full_data = sanitize(full_data)
 
+    # Transliterate Unicode to ASCII for safety, as the file is written
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(full_data, f, indent=2)
+        unicode_sanitizer.dump(full_data, f, indent=2)
         
     print(f"Generated {len(full_data)} projects in {OUTPUT_FILE}")
+    return full_data
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Git Data API Publisher
+Commits files straight to a branch through the Git Data API (tree, commit,
+ref update), so writing a README needs no clone, worktree or push
+
+The tree request carries the file contents, so GitHub creates their blobs
+along with the tree. Ref updates are never forced: when the branch moved
+since it was read, the change is rebuilt on the new head and the
+fast-forward retried.
+"""
+import http.client
+import json
+import os
+import threading
+from collections import namedtuple
+
+MAX_ATTEMPTS = 4
+# "clone" pushes from a worktree of the mirror store; "api" publishes with GitDataPublisher
+PUBLISH_MODE = os.environ.get("README_PUBLISHER", "clone")
+
+Publication = namedtuple('Publication', 'repo branch status commit attempts')
+
+
+class PublishError(Exception):
+    """The Git Data API refused or failed a publication"""
+
+
+class GitDataPublisher:
+    """Thread-safe publisher for one owner; writes are paced by an optional scheduler"""
+
+    def __init__(self, client, owner, scheduler=None, max_attempts=MAX_ATTEMPTS):
+        self.client = client
+        self.owner = owner
+        self.scheduler = scheduler
+        self.max_attempts = max_attempts
+        self.stats = {"updated": 0, "unchanged": 0, "failed": 0, "conflicts": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _call(self, method, path, body=None, expect=(200,)):
+        """One API request, returning its JSON body; PublishError unless the status is expected"""
+        if method != 'GET' and self.scheduler is not None:
+            self.scheduler.acquire()
+        try:
+            status, _, data = self.client.request(method, path, body)
+        except (http.client.HTTPException, OSError) as e:
+            raise PublishError(f"{method} {path}: {e}")
+        try:
+            payload = json.loads(data.decode('utf-8')) if data else {}
+        except ValueError:
+            payload = {}
+        if status not in expect:
+            raise PublishError(f"{method} {path}: HTTP {status} {payload.get('message', '')}".rstrip())
+        return status, payload
+
+    def head(self, repo, branch):
+        """(commit SHA, tree SHA) at the tip of a branch"""
+        base = f"/repos/{self.owner}/{repo}/git"
+        _, ref = self._call('GET', f"{base}/ref/heads/{branch}")
+        commit = ref['object']['sha']
+        _, data = self._call('GET', f"{base}/commits/{commit}")
+        return commit, data['tree']['sha']
+
+    def publish(self, repo, branch, files, message):
+        """Commit {path: text} on top of branch and fast-forward it
+
+        Returns a Publication whose status is 'updated', or 'unchanged' when
+        the branch already holds these contents (no commit is made).
+        """
+        base = f"/repos/{self.owner}/{repo}/git"
+        entries = [{"path": path, "mode": "100644", "type": "blob", "content": text}
+                   for path, text in files.items()]
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                parent, base_tree = self.head(repo, branch)
+                _, tree = self._call('POST', f"{base}/trees", {"base_tree": base_tree, "tree": entries},
+                                     expect=(201,))
+                if tree['sha'] == base_tree:
+                    self._count("unchanged")
+                    return Publication(repo, branch, 'unchanged', parent, attempt)
+                _, commit = self._call('POST', f"{base}/commits",
+                                       {"message": message, "tree": tree['sha'], "parents": [parent]},
+                                       expect=(201,))
+                # 422: the branch moved since it was read, so this is no fast-forward
+                status, _ = self._call('PATCH', f"{base}/refs/heads/{branch}",
+                                       {"sha": commit['sha'], "force": False}, expect=(200, 422))
+                if status == 200:
+                    self._count("updated")
+                    return Publication(repo, branch, 'updated', commit['sha'], attempt)
+                self._count("conflicts")
+            raise PublishError(f"{repo}@{branch} kept moving; gave up after {self.max_attempts} attempts")
+        except PublishError:
+            self._count("failed")
+            raise
+
+    def submit(self, repo, branch, files, message):
+        """publish() on the client's worker pool; returns a Future"""
+        return self.client.submit(self.publish, repo, branch, files, message)
+
+    def publish_many(self, jobs):
+        """Publish (repo, branch, files, message) jobs concurrently, in input order
+
+        Each result is a Publication, or the PublishError that job raised.
+        """
+        def run(job):
+            try:
+                return self.publish(*job)
+            except PublishError as e:
+                return e
+        return list(self.client.map(run, jobs))
+
+    def summary(self):
+        return (f"Git Data API: {self.stats['updated']} commits, {self.stats['unchanged']} unchanged, "
+                f"{self.stats['conflicts']} fast-forward retries, {self.stats['failed']} failed")
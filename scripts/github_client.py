@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Shared GitHub API Client
+Keep-alive connection pooling and a bounded worker pool for concurrent fetches
+"""
+import http.client
+import json
+import os
+import re
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from http_cache import auth_scope
+from rate_limit import RateLimitScheduler, shared_scheduler
+
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+TOKEN = os.environ.get("GITHUB_TOKEN")
+MAX_WORKERS = int(os.environ.get("GITHUB_MAX_WORKERS", "8"))
+TIMEOUT = 30
+LISTING_WORKERS = 8
+
+_LINK = re.compile(r'<([^>]+)>;\s*rel="(\w+)"')
+
+
+def parse_link(header):
+    """Map rel -> URL for a Link response header"""
+    return {rel: url for url, rel in _LINK.findall(header or '')}
+
+
+def quota_resource(path):
+    """The x-ratelimit-resource a request to path is expected to draw on"""
+    if path.startswith('/graphql'):
+        return 'graphql'
+    if path.startswith('/search/'):
+        return 'search'
+    return 'core'
+
+
+def page_number(url):
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    return int(query.get('page', ['1'])[0])
+
+
+class GitHubClient:
+    """Thread-safe API client; each worker thread reuses one persistent connection"""
+
+    def __init__(self, token=TOKEN, base_url=API_URL, max_workers=MAX_WORKERS,
+                 user_agent="Portfolio-Audit-Agent", cache=None, scheduler=None):
+        parts = urllib.parse.urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+        self.token = token
+        self.user_agent = user_agent
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+        # REST (core), GraphQL and search have separate quotas; each gets its
+        # own bucket so one's headers never re-tune another's
+        self.schedulers = {'core': self.scheduler}
+        self._shared_schedulers = scheduler is None
+        self.scope = auth_scope(token)
+        self.stats = {"requests": 0, "connections": 0, "errors": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._executor = None
+
+    def get_headers(self):
+        headers = {"User-Agent": self.user_agent, "Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        return headers
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _connection(self, fresh=False):
+        """Return this thread's keep-alive connection, opening one if needed"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and not fresh:
+            return conn
+        if conn is not None:
+            conn.close()
+        if self.scheme == 'https':
+            conn = http.client.HTTPSConnection(self.host, timeout=TIMEOUT)
+        else:
+            conn = http.client.HTTPConnection(self.host, timeout=TIMEOUT)
+        self._local.conn = conn
+        with self._lock:
+            self._connections.append(conn)
+            self.stats["connections"] += 1
+        return conn
+
+    def scheduler_for(self, resource):
+        """The bucket pacing requests against one x-ratelimit-resource quota"""
+        with self._lock:
+            if resource not in self.schedulers:
+                if self._shared_schedulers:
+                    self.schedulers[resource] = shared_scheduler(f"api:{resource}")
+                else:
+                    self.schedulers[resource] = RateLimitScheduler(reserve=self.scheduler.reserve,
+                                                                   max_retries=self.scheduler.max_retries,
+                                                                   max_wait=self.scheduler.max_wait)
+            return self.schedulers[resource]
+
+    def rate_limit_summary(self):
+        if len(self.schedulers) == 1:
+            return self.scheduler.summary()
+        return "\n".join(f"{scheduler.summary()} [{resource}]" for resource, scheduler in self.schedulers.items())
+
+    def _target(self, path):
+        """Accept either an absolute API URL or a path relative to the API root"""
+        if path.startswith('http://') or path.startswith('https://'):
+            parts = urllib.parse.urlsplit(path)
+            return parts.path + (f"?{parts.query}" if parts.query else "")
+        return self.base_path + path
+
+    def request(self, method, path, body=None, headers=None):
+        """Perform a request and return (status, headers, body bytes)
+
+        Every attempt draws from the rate-limit scheduler of the quota the
+        request counts against, as named by the response's
+        x-ratelimit-resource header; rate-limited responses are retried after
+        Retry-After / reset / jittered backoff.
+        """
+        all_headers = self.get_headers()
+        if headers:
+            all_headers.update(headers)
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+            all_headers.setdefault("Content-Type", "application/json")
+        target = self._target(path)
+        resource = quota_resource(target[len(self.base_path):])
+
+        attempt = 0
+        while True:
+            self.scheduler_for(resource).acquire()
+            status, response_headers, data = self._send(method, target, body, all_headers)
+            resource = response_headers.get('x-ratelimit-resource', resource)
+            scheduler = self.scheduler_for(resource)
+            scheduler.observe(response_headers)
+            delay = scheduler.retry_delay(status, response_headers, data, attempt)
+            if delay is None:
+                return status, response_headers, data
+            scheduler.pause(delay)
+            attempt += 1
+
+    def _send(self, method, target, body, headers):
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh socket before giving up.
+        for attempt in range(2):
+            conn = self._connection(fresh=attempt > 0)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                self._count("requests")
+                return response.status, {k.lower(): v for k, v in response.getheaders()}, data
+            except (http.client.HTTPException, ConnectionError, OSError):
+                if attempt:
+                    self._count("errors")
+                    raise
+
+    def get(self, path, headers=None):
+        """GET with conditional revalidation against the response cache"""
+        if self.cache is None:
+            return self.request('GET', path, headers=headers)
+        key = self.cache.key(self.scope, self._target(path))
+        entry = self.cache.lookup(key)
+        conditional = dict(headers or {})
+        if entry:
+            conditional.update(self.cache.validators(entry))
+        status, response_headers, data = self.request('GET', path, headers=conditional)
+        if status == 304 and entry:
+            self.cache.record_hit(key, entry)
+            response_headers.setdefault('content-type', entry[0].get('content_type'))
+            return 200, response_headers, entry[1]
+        self.cache.record_miss()
+        if status == 200:
+            self.cache.store(key, response_headers, data)
+        return status, response_headers, data
+
+    def get_json(self, path, default=None):
+        """GET a JSON resource, returning default on any non-200 or network error"""
+        try:
+            status, _, data = self.get(path)
+        except (http.client.HTTPException, OSError):
+            return default
+        if status != 200:
+            return default
+        try:
+            return json.loads(data.decode('utf-8'))
+        except ValueError:
+            return default
+
+    def iter_pages(self, path, per_page=100, workers=LISTING_WORKERS, log=None):
+        """Stream the items of a paginated collection
+
+        Page 1's Link rel="last" tells us the page count, so the remaining
+        pages are fetched concurrently (and no request is spent on an empty
+        trailing page). Items are yielded in page order as pages arrive.
+
+        A failed page raises, so a cut-short listing is never mistaken for
+        the whole collection. Best-effort callers pass log instead: the
+        error is logged and the stream simply ends.
+        """
+        sep = '&' if '?' in path else '?'
+
+        def fetch(page):
+            status, headers, data = self.get(f"{path}{sep}per_page={per_page}&page={page}")
+            if status != 200:
+                raise OSError(f"HTTP {status} on page {page} of {path}")
+            return headers, json.loads(data.decode('utf-8'))
+
+        try:
+            headers, items = fetch(1)
+            yield from items
+            links = parse_link(headers.get('link'))
+            if 'last' in links:
+                last = page_number(links['last'])
+                with ThreadPoolExecutor(max_workers=max(1, min(workers, last - 1))) as pool:
+                    futures = [pool.submit(fetch, page) for page in range(2, last + 1)]
+                    for future in futures:
+                        yield from future.result()[1]
+            else:
+                # No rel="last" advertised: follow rel="next" sequentially
+                while 'next' in links:
+                    headers, items = fetch(page_number(links['next']))
+                    yield from items
+                    links = parse_link(headers.get('link'))
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            if log is None:
+                raise
+            log(f"Error listing {path}: {e}")
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def map(self, fn, items):
+        """Apply fn to items on the shared worker pool, preserving input order"""
+        return self._pool().map(fn, items)
+
+    def submit(self, fn, *args):
+        """Run fn(*args) on the shared worker pool, returning a Future"""
+        return self._pool().submit(fn, *args)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
@@ -3,24 +3,94 @@
 Global Repository Documentation Automation Script
 Architect Mode: Full Control Granted
 """
-import urllib.request
-import urllib.error
 import json
 import os
+import re
 import sys
 import time
 import subprocess
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+from analysis_cache import AnalysisCache, blob_shas, rules_version, tree_sha
+from fs_index import IGNORED_DIRS, FileIndex
+from git_publisher import PUBLISH_MODE, GitDataPublisher, PublishError
+from github_client import GitHubClient
+from http_cache import ResponseCache
+from mirror_store import MirrorError, MirrorStore
+from py_imports import PYTHON_EXTS, ImportExtractor
+from rate_limit import content_scheduler
+from remote_tree import read_blob, root_tree
+
 # Configuration
 USERNAME = "vaishnavak2001"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 TEMP_WORKSPACE = Path("C:/temp/repo_automation")
 LOG_FILE = Path("C:/temp/repo_automation_log.txt")
+WORKERS = int(os.environ.get("UPDATE_WORKERS", "4"))
+# Adds rate-limit, mirror, publisher and cache diagnostics to the final report
+VERBOSE = os.environ.get("UPDATE_VERBOSE") == "1"
+# Existing READMEs longer than this (in characters) are kept
+COMPREHENSIVE_README = 300
+COMMIT_MESSAGE = "docs(auto): generated comprehensive documentation via portfolio-agent"
+
+# Stack signatures checked by RepoUpdater.analyze_tech_stack
+STACK_FILES = {
+    'package.json': ('JavaScript/Node.js', ['Express', 'React', 'Vue', 'Next.js']),
+    'requirements.txt': ('Python', ['Flask', 'Django', 'FastAPI', 'TensorFlow', 'PyTorch']),
+    'Gemfile': ('Ruby', ['Rails', 'Sinatra']),
+    'pom.xml': ('Java/Maven', ['Spring Boot']),
+    'build.gradle': ('Java/Gradle', ['Spring Boot']),
+    'go.mod': ('Go', []),
+    'Cargo.toml': ('Rust', []),
+    'composer.json': ('PHP', ['Laravel', 'Symfony']),
+    'Dockerfile': ('Docker', []),
+    '.ipynb': ('Jupyter Notebook', [])
+}
+EXTENSIONS = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin'
+}
+# Import and distribution names behind the Python frameworks above
+PYTHON_FRAMEWORKS = {
+    'Flask': {'flask'},
+    'Django': {'django'},
+    'FastAPI': {'fastapi'},
+    'TensorFlow': {'tensorflow', 'tensorflow-gpu', 'tensorflow-cpu'},
+    'PyTorch': {'torch', 'pytorch'}
+}
+# Only the files the analyzer looks at are checked out; notebooks, datasets
+# and model weights stay on the server
+SPARSE_PATTERNS = ['/README.md'] + list(STACK_FILES) + ['*' + ext for ext in EXTENSIONS]
+# Cached results are dropped whenever the rules above change;
+# bump ANALYSIS_VERSION when analyze_tech_stack's logic changes
+ANALYSIS_VERSION = 2
+ANALYSIS_RULES = rules_version(ANALYSIS_VERSION, STACK_FILES, EXTENSIONS, PYTHON_FRAMEWORKS,
+                               SPARSE_PATTERNS, IGNORED_DIRS)
+
+_REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)', re.M)
+
+
+def requirement_names(text):
+    """Normalized distribution names listed in a requirements file"""
+    return {name.lower().replace('_', '-') for name in _REQUIREMENT.findall(text)}
+
 
 class RepoUpdater:
-    def __init__(self):
+    def __init__(self, workers=WORKERS, verbose=VERBOSE):
+        self.workers = workers
+        self.verbose = verbose
         self.stats = {
             "total": 0,
             "success": 0,
@@ -28,13 +98,40 @@ class RepoUpdater:
             "skipped": 0
         }
         self.log_messages = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cancelled = threading.Event()
+        self.client = GitHubClient(token=GITHUB_TOKEN, user_agent="Portfolio-Update-Agent",
+                                   cache=ResponseCache())
+        self.push_scheduler = content_scheduler()
+        # In api mode READMEs are committed through the Git Data API instead of pushed
+        self.publisher = (GitDataPublisher(self.client, USERNAME, self.push_scheduler)
+                          if PUBLISH_MODE == "api" else None)
+        self.mirrors = None
+        self.analysis_cache = AnalysisCache("global_repo_update", ANALYSIS_RULES)
+        self.imports = ImportExtractor()
         
     def log(self, message):
-        """Log to console and file"""
+        """Log to console and file; inside a repo job, lines are held until the job ends"""
         # Replace Unicode symbols with ASCII equivalents for Windows console
         message = message.replace('→', '->').replace('✗', 'X').replace('✓', 'OK')
-        print(message)
-        self.log_messages.append(f"[{time.strftime('%H:%M:%S')}] {message}")
+        entry = (message, f"[{time.strftime('%H:%M:%S')}] {message}")
+        group = getattr(self._local, 'group', None)
+        if group is not None:
+            group.append(entry)
+        else:
+            self._emit([entry])
+    
+    def _emit(self, entries):
+        with self._lock:
+            for message, stamped in entries:
+                print(message)
+                self.log_messages.append(stamped)
+    
+    def count(self, key):
+        """Thread-safe increment of a stats counter"""
+        with self._lock:
+            self.stats[key] += 1
         
     def save_log(self):
         """Save log to file"""
@@ -44,57 +141,36 @@ class RepoUpdater:
     
     def get_headers(self):
         """Get headers for GitHub API"""
-        headers = {"User-Agent": "Portfolio-Update-Agent"}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"token {GITHUB_TOKEN}"
-        return headers
+        return self.client.get_headers()
     
     def fetch_repos(self):
         """Fetch all user repositories"""
         self.log(f"Fetching repositories for {USERNAME}...")
-        all_repos = []
-        page = 1
-        
-        while True:
-            url = f"https://api.github.com/users/{USERNAME}/repos?per_page=100&page={page}"
-            try:
-                req = urllib.request.Request(url, headers=self.get_headers())
-                with urllib.request.urlopen(req) as response:
-                    repos = json.loads(response.read().decode())
-                    if not repos:
-                        break
-                    all_repos.extend(repos)
-                    page += 1
-            except urllib.error.HTTPError as e:
-                self.log(f"Error fetching repos: {e}")
-                break
+        all_repos = list(self.client.iter_pages(f"/users/{USERNAME}/repos", log=self.log))
         
         # Filter out forks (optional - you can remove this if you want to update forks too)
         repos = [r for r in all_repos if not r['fork']]
         self.log(f"Found {len(repos)} repositories (excluding forks)")
         return repos
     
-    def analyze_tech_stack(self, repo_path):
-        """Analyze repository to determine tech stack"""
+    def analyze_tech_stack(self, repo_path, index=None):
+        """Analyze repository to determine tech stack (reused for an already analyzed tree)"""
+        tree = tree_sha(repo_path)
+        if tree:
+            cached = self.analysis_cache.get(tree)
+            if cached is not None:
+                return cached[0], cached[1]
+        
         stack = []
         frameworks = []
         
-        # Check for common files
-        checks = {
-            'package.json': ('JavaScript/Node.js', ['Express', 'React', 'Vue', 'Next.js']),
-            'requirements.txt': ('Python', ['Flask', 'Django', 'FastAPI', 'TensorFlow', 'PyTorch']),
-            'Gemfile': ('Ruby', ['Rails', 'Sinatra']),
-            'pom.xml': ('Java/Maven', ['Spring Boot']),
-            'build.gradle': ('Java/Gradle', ['Spring Boot']),
-            'go.mod': ('Go', []),
-            'Cargo.toml': ('Rust', []),
-            'composer.json': ('PHP', ['Laravel', 'Symfony']),
-            'Dockerfile': ('Docker', []),
-            '.ipynb': ('Jupyter Notebook', [])
-        }
+        # One pruned walk answers every file and extension check below
+        if index is None:
+            index = FileIndex(repo_path, markers=STACK_FILES, collect=PYTHON_EXTS)
         
-        for file, (tech, possible_frameworks) in checks.items():
-            if (repo_path / file).exists() or list(repo_path.glob(f"**/{file}")):
+        # Check for common files
+        for file, (tech, possible_frameworks) in STACK_FILES.items():
+            if index.has_marker(file):
                 stack.append(tech)
                 # Try to detect frameworks
                 try:
@@ -107,33 +183,31 @@ class RepoUpdater:
                                     frameworks.append(fw)
                     elif file == 'requirements.txt':
                         with open(repo_path / file, 'r', encoding='utf-8') as f:
-                            content = f.read().lower()
+                            names = requirement_names(f.read())
                             for fw in possible_frameworks:
-                                if fw.lower() in content:
+                                if PYTHON_FRAMEWORKS[fw] & names:
                                     frameworks.append(fw)
                 except:
                     pass
         
-        # Check file extensions
-        extensions = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.java': 'Java',
-            '.cpp': 'C++',
-            '.c': 'C',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.swift': 'Swift',
-            '.kt': 'Kotlin'
-        }
+        # Python frameworks actually imported by the code (parsed with ast, memoized per blob)
+        python_files = [path for ext in PYTHON_EXTS for path in index.paths.get(ext, [])]
+        if python_files:
+            shas = blob_shas(repo_path) if tree else {}
+            imports, _, _ = self.imports.extract(
+                [(str(Path(repo_path) / rel), shas.get(rel)) for rel in python_files], self.analysis_cache)
+            modules = set().union(*imports.values())
+            for fw in STACK_FILES['requirements.txt'][1]:
+                if fw not in frameworks and PYTHON_FRAMEWORKS[fw] & modules:
+                    frameworks.append(fw)
         
-        for ext, lang in extensions.items():
-            if list(repo_path.glob(f"**/*{ext}")) and lang not in stack:
+        # Check file extensions
+        for ext, lang in EXTENSIONS.items():
+            if index.has_extension(ext) and lang not in stack:
                 stack.append(lang)
         
+        if tree:
+            self.analysis_cache.put(tree, [stack, frameworks])
         return stack, frameworks
     
     def generate_readme(self, repo_info, repo_path):
@@ -153,7 +227,7 @@ class RepoUpdater:
                 pass
         
         # Only generate new README if existing one is weak (<300 chars)
-        if existing_readme and len(existing_readme) > 300:
+        if existing_readme and len(existing_readme) > COMPREHENSIVE_README:
             self.log(f"  → README exists and is comprehensive, skipping generation")
             return None
         
@@ -254,8 +328,37 @@ This project is part of the portfolio by [vaishnavak2001](https://github.com/{US
         
         return readme_content
     
+    def remote_readme_comprehensive(self, repo_info):
+        """True if the remote README.md would be kept, judged without a checkout
+
+        Its size in the root tree settles most cases (UTF-8 needs at most 4
+        bytes per character); otherwise the blob itself is fetched. False
+        when the README is missing or cannot be read.
+        """
+        repo_name = repo_info['name']
+        clone_url = f"https://{GITHUB_TOKEN}@github.com/{USERNAME}/{repo_name}.git"
+        root = root_tree(USERNAME, repo_name, repo_info['default_branch'], self.client, self.mirrors, clone_url)
+        entry = root.entries.get('README.md') if root else None
+        if entry is None or entry.type != 'blob':
+            return False
+        if entry.size is not None:
+            if entry.size <= COMPREHENSIVE_README:
+                return False
+            if entry.size > 4 * COMPREHENSIVE_README:
+                return True
+        text = read_blob(USERNAME, repo_name, entry.sha, self.client, self.mirrors)
+        return text is not None and len(text) > COMPREHENSIVE_README
+    
     def update_repository(self, repo_info):
-        """Clone, update, and push a single repository"""
+        """Check out, update, and push a single repository, logging it as one block"""
+        self._local.group = []
+        try:
+            self._update_repository(repo_info)
+        finally:
+            group, self._local.group = self._local.group, None
+            self._emit(group)
+    
+    def _update_repository(self, repo_info):
         repo_name = repo_info['name']
         self.log(f"\n{'='*60}")
         self.log(f"Processing: {repo_name}")
@@ -264,79 +367,111 @@ This project is part of the portfolio by [vaishnavak2001](https://github.com/{US
         # Skip the portfolio repo itself
         if repo_name == "vaishnavak2001.github.io":
             self.log(f"  → Skipping portfolio repository")
-            self.stats['skipped'] += 1
+            self.count('skipped')
+            return
+        
+        # Plan from the remote root tree: kept READMEs need no checkout
+        if self.remote_readme_comprehensive(repo_info):
+            self.log(f"  → README exists and is comprehensive, skipping generation")
+            self.count('skipped')
+            return
+        
+        if self.publisher is None:
+            self.push_scheduler.acquire()  # Paced for GitHub's content-creation limits
+        if self._cancelled.is_set():
             return
         
         repo_path = TEMP_WORKSPACE / repo_name
         
         try:
-            # Clone repository
+            # Refresh the persistent mirror and check out a throwaway worktree
             clone_url = f"https://{GITHUB_TOKEN}@github.com/{USERNAME}/{repo_name}.git"
-            self.log(f"  → Cloning repository...")
-            
-            if repo_path.exists():
-                shutil.rmtree(repo_path)
-            
-            result = subprocess.run(
-                ['git', 'clone', clone_url, str(repo_path)],
-                capture_output=True,
-                text=True,
-                cwd=str(TEMP_WORKSPACE)
-            )
-            
-            if result.returncode != 0:
-                self.log(f"  ✗ Clone failed: {result.stderr}")
-                self.stats['failed'] += 1
-                return
-            
-            # Generate README
-            self.log(f"  → Analyzing tech stack...")
-            readme_content = self.generate_readme(repo_info, repo_path)
-            
-            if readme_content is None:
-                self.stats['skipped'] += 1
-                return
-            
-            # Write README
-            self.log(f"  → Writing README.md...")
-            with open(repo_path / "README.md", 'w', encoding='utf-8') as f:
-                f.write(readme_content)
-            
-            # Git operations
-            self.log(f"  → Committing changes...")
-            subprocess.run(['git', 'add', 'README.md'], cwd=str(repo_path), check=True)
-            subprocess.run(
-                ['git', 'commit', '-m', 'docs(auto): generated comprehensive documentation via portfolio-agent'],
-                cwd=str(repo_path),
-                check=True
-            )
-            
-            self.log(f"  → Pushing to GitHub...")
-            result = subprocess.run(
-                ['git', 'push', 'origin', repo_info['default_branch']],
-                cwd=str(repo_path),
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                self.log(f"  ✗ Push failed: {result.stderr}")
-                self.stats['failed'] += 1
-            else:
-                self.log(f"  ✓ Successfully updated {repo_name}")
-                self.stats['success'] += 1
-            
-            # Cleanup
-            shutil.rmtree(repo_path)
+            self.log(f"  → Syncing mirror...")
+            with self.mirrors.checkout(repo_name, clone_url, repo_path, repo_info['default_branch'],
+                                       sparse=SPARSE_PATTERNS):
+                self.update_checkout(repo_info, repo_path)
             
+        except MirrorError as e:
+            self.log(f"  ✗ Clone failed: {e}")
+            self.count('failed')
         except Exception as e:
             self.log(f"  ✗ Error: {str(e)}")
-            self.stats['failed'] += 1
-            if repo_path.exists():
-                try:
-                    shutil.rmtree(repo_path)
-                except:
-                    pass
+            self.count('failed')
+    
+    def update_checkout(self, repo_info, repo_path):
+        """Generate, commit and push the README inside a checked-out worktree"""
+        repo_name = repo_info['name']
+        
+        # Generate README
+        self.log(f"  → Analyzing tech stack...")
+        readme_content = self.generate_readme(repo_info, repo_path)
+        
+        if readme_content is None:
+            self.count('skipped')
+            return
+        
+        if self.publisher is not None:
+            self.log(f"  → Committing through the Git Data API...")
+            try:
+                result = self.publisher.publish(repo_name, repo_info['default_branch'],
+                                                {"README.md": readme_content}, COMMIT_MESSAGE)
+            except PublishError as e:
+                self.log(f"  ✗ Publish failed: {e}")
+                self.count('failed')
+                return
+            self.log(f"  ✓ Successfully updated {repo_name} ({result.status})")
+            self.count('success')
+            return
+        
+        # Write README
+        self.log(f"  → Writing README.md...")
+        with open(repo_path / "README.md", 'w', encoding='utf-8') as f:
+            f.write(readme_content)
+        
+        # Git operations
+        self.log(f"  → Committing changes...")
+        # Output is captured so concurrent jobs cannot interleave it with the grouped log
+        subprocess.run(['git', 'add', 'README.md'], cwd=str(repo_path), check=True, capture_output=True)
+        subprocess.run(
+            ['git', 'commit', '-m', COMMIT_MESSAGE],
+            cwd=str(repo_path),
+            check=True,
+            capture_output=True
+        )
+        
+        self.log(f"  → Pushing to GitHub...")
+        result = subprocess.run(
+            ['git', 'push', 'origin', repo_info['default_branch']],
+            cwd=str(repo_path),
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            self.log(f"  ✗ Push failed: {result.stderr}")
+            self.count('failed')
+        else:
+            self.log(f"  ✓ Successfully updated {repo_name}")
+            self.count('success')
+    
+    def process_one(self, repo_info):
+        if not self._cancelled.is_set():
+            self.update_repository(repo_info)
+    
+    def process_all(self, repos):
+        """Update repos concurrently; Ctrl+C lets running jobs finish and drops the rest"""
+        pool = ThreadPoolExecutor(max_workers=max(1, self.workers))
+        try:
+            pending = {pool.submit(self.process_one, repo) for repo in repos}
+            while pending:
+                # Timed waits keep the main thread responsive to Ctrl+C
+                _, pending = wait(pending, timeout=0.5)
+        except KeyboardInterrupt:
+            self._cancelled.set()
+            self.log("Cancellation requested: finishing in-flight repositories...")
+            pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            pool.shutdown(wait=True)
     
     def run(self):
         """Main execution function"""
@@ -348,17 +483,17 @@ This project is part of the portfolio by [vaishnavak2001](https://github.com/{US
             self.log("ERROR: GITHUB_TOKEN environment variable not set!")
             return
         
-        # Create workspace
+        # Create workspace and the persistent mirror store
         TEMP_WORKSPACE.mkdir(parents=True, exist_ok=True)
+        if self.mirrors is None:
+            self.mirrors = MirrorStore(lean=True)
         
         # Fetch repositories
         repos = self.fetch_repos()
         self.stats['total'] = len(repos)
         
-        # Process each repository
-        for repo in repos:
-            self.update_repository(repo)
-            time.sleep(2)  # Rate limiting
+        # Process repositories on a pool of workers; each repo gets its own worktree
+        self.process_all(repos)
         
         # Final report
         self.log("\n" + "="*60)
@@ -368,11 +503,18 @@ This project is part of the portfolio by [vaishnavak2001](https://github.com/{US
         self.log(f"Successfully Updated: {self.stats['success']}")
         self.log(f"Skipped (Good README): {self.stats['skipped']}")
         self.log(f"Failed: {self.stats['failed']}")
+        self.analysis_cache.save()
+        if self.verbose:
+            self.log(self.client.rate_limit_summary())
+            self.log(self.mirrors.summary())
+            if self.publisher is not None:
+                self.log(self.publisher.summary())
+            self.log(self.analysis_cache.summary())
         self.log("="*60)
         
         self.save_log()
         self.log(f"\nFull log saved to: {LOG_FILE}")
 
 if __name__ == "__main__":
-    updater = RepoUpdater()
+    updater = RepoUpdater(verbose=VERBOSE or "--verbose" in sys.argv[1:])
     updater.run()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+GraphQL Batch-Fetch Backend
+Pulls repository metadata, language byte counts, README text and manifest
+blobs for a page of repositories per request instead of ~5 REST calls per repo
+"""
+import json
+
+PAGE_SIZE = 50
+MANIFESTS = ['package.json', 'requirements.txt', 'Dockerfile']
+# REST /readme resolves these variants server-side; GraphQL needs explicit paths
+README_NAMES = ['README.md', 'readme.md', 'Readme.md', 'README.rst', 'README.txt', 'README']
+
+_BLOB = "... on Blob { text }"
+# Root entries plus one level of subdirectories, enough to spot backend/requirements.txt
+_TREE = "... on Tree { entries { path type object { ... on Tree { entries { path type } } } } }"
+IGNORED_DIRS = {'node_modules', 'vendor', 'site-packages', '.venv', 'venv', 'bower_components'}
+
+
+class GraphQLError(Exception):
+    pass
+
+
+def _alias(path):
+    return 'f_' + ''.join(c if c.isalnum() else '_' for c in path)
+
+
+def build_fragment(manifests=MANIFESTS):
+    """Repository fields shared by the paginated and the by-name queries"""
+    blobs = "\n".join(
+        f'  {_alias(path)}: object(expression: "HEAD:{path}") {{ {_BLOB} }}'
+        for path in README_NAMES + list(manifests)
+    )
+    return f"""fragment RepoFields on Repository {{
+  name
+  description
+  url
+  isFork
+  stargazerCount
+  forkCount
+  createdAt
+  updatedAt
+  pushedAt
+  defaultBranchRef {{ name }}
+  languages(first: 50, orderBy: {{field: SIZE, direction: DESC}}) {{
+    edges {{ size node {{ name }} }}
+  }}
+  tree: object(expression: "HEAD:") {{ {_TREE} }}
+{blobs}
+}}"""
+
+
+def build_query(manifests=MANIFESTS):
+    """Compose the paginated repositories query"""
+    return build_fragment(manifests) + """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER,
+                 orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...RepoFields }
+    }
+  }
+}"""
+
+
+def build_named_query(names, manifests=MANIFESTS):
+    """Compose a query fetching specific repositories through aliased lookups"""
+    lookups = "\n".join(
+        f'  r{i}: repository(owner: $login, name: {json.dumps(name)}) {{ ...RepoFields }}'
+        for i, name in enumerate(names)
+    )
+    return build_fragment(manifests) + f"""
+query($login: String!) {{
+{lookups}
+}}"""
+
+
+def build_blob_query(wanted):
+    """Compose a follow-up query for nested blobs: wanted is [(repo name, [paths])]"""
+    lookups = []
+    for i, (name, paths) in enumerate(wanted):
+        blobs = " ".join(f'{_alias(path)}: object(expression: "HEAD:{path}") {{ {_BLOB} }}' for path in paths)
+        lookups.append(f'  r{i}: repository(owner: $login, name: {json.dumps(name)}) {{ {blobs} }}')
+    return "query($login: String!) {\n" + "\n".join(lookups) + "\n}"
+
+
+def nested_manifests(node, manifests=MANIFESTS):
+    """Manifest paths below the root found in the node's two-level tree listing"""
+    paths = []
+    for entry in ((node.get('tree') or {}).get('entries') or []):
+        if entry.get('type') != 'tree' or entry['path'] in IGNORED_DIRS:
+            continue
+        for child in (((entry.get('object') or {}).get('entries')) or []):
+            if child.get('type') == 'blob' and child['path'].split('/')[-1] in manifests:
+                paths.append(child['path'])
+    return paths
+
+
+def _post(client, query, variables, allow_missing=False):
+    """The data of a query; raises GraphQLError rather than return a partial answer
+
+    With allow_missing, lookups of repositories that no longer exist come
+    back as None instead of failing the whole request.
+    """
+    status, _, data = client.request('POST', '/graphql', body={"query": query, "variables": variables})
+    if status != 200:
+        raise GraphQLError(f"GraphQL request failed: HTTP {status}")
+    payload = json.loads(data.decode('utf-8'))
+    errors = [e for e in payload.get('errors') or [] if not (allow_missing and e.get('type') == 'NOT_FOUND')]
+    if errors or not payload.get('data'):
+        message = errors[0].get('message') if errors else "no data"
+        raise GraphQLError(f"GraphQL errors: {message}")
+    return payload['data']
+
+
+def node_to_bundle(node, manifests=MANIFESTS):
+    """Convert one GraphQL repository node to the REST-shaped bundle the pipeline expects"""
+    def blob_text(path):
+        obj = node.get(_alias(path))
+        return obj.get('text') if obj else None
+
+    repo = {
+        "name": node['name'],
+        "description": node.get('description'),
+        "html_url": node['url'],
+        "clone_url": node['url'] + '.git',
+        "fork": node['isFork'],
+        "stargazers_count": node['stargazerCount'],
+        "forks_count": node['forkCount'],
+        "default_branch": (node.get('defaultBranchRef') or {}).get('name', 'main'),
+        "created_at": node.get('createdAt'),
+        "updated_at": node['updatedAt'],
+        "pushed_at": node.get('pushedAt'),
+    }
+    languages = {e['node']['name']: e['size'] for e in (node.get('languages') or {}).get('edges', [])}
+    readme = next((t for t in map(blob_text, README_NAMES) if t), "")
+    files = {}
+    for path in list(manifests) + nested_manifests(node, manifests):
+        text = blob_text(path)
+        if text is not None:
+            files[path] = text
+    return {"repo": repo, "readme": readme, "languages": languages, "files": files}
+
+
+def attach_nested(client, login, nodes, manifests=MANIFESTS):
+    """Fetch nested manifest blobs for a page of nodes with one extra request"""
+    wanted = [(node, nested_manifests(node, manifests)) for node in nodes]
+    wanted = [(node, paths) for node, paths in wanted if paths]
+    if wanted:
+        data = _post(client, build_blob_query([(node['name'], paths) for node, paths in wanted]),
+                     {"login": login}, allow_missing=True)
+        for i, (node, _) in enumerate(wanted):
+            node.update(data.get(f"r{i}") or {})
+    return nodes
+
+
+def fetch_repo_bundles(client, login, page_size=PAGE_SIZE, manifests=MANIFESTS):
+    """Yield bundles for every repository owned by login, one GraphQL page at a time"""
+    query = build_query(manifests)
+    cursor = None
+    while True:
+        data = _post(client, query, {"login": login, "first": page_size, "after": cursor})
+        connection = data['user']['repositories']
+        for node in attach_nested(client, login, connection['nodes'], manifests):
+            yield node_to_bundle(node, manifests)
+        if not connection['pageInfo']['hasNextPage']:
+            return
+        cursor = connection['pageInfo']['endCursor']
+
+
+def fetch_named_bundles(client, login, names, page_size=PAGE_SIZE, manifests=MANIFESTS):
+    """Yield bundles for the named repositories only, page_size lookups per request"""
+    names = list(names)
+    for start in range(0, len(names), page_size):
+        batch = names[start:start + page_size]
+        data = _post(client, build_named_query(batch, manifests), {"login": login}, allow_missing=True)
+        nodes = [data.get(f"r{i}") for i in range(len(batch))]
+        for node in attach_nested(client, login, [n for n in nodes if n], manifests):
+            yield node_to_bundle(node, manifests)
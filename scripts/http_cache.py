@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Persistent Conditional-Request Cache
+Stores GitHub API responses with their ETag/Last-Modified validators so that
+unchanged resources come back as 304s (which do not count against the quota)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.environ.get("GITHUB_CACHE_DIR", ".cache/github")
+MAX_BYTES = int(os.environ.get("GITHUB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def auth_scope(token):
+    """Opaque per-credential namespace; private repos must not leak across tokens"""
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+
+class ResponseCache:
+    """On-disk LRU cache of validated responses keyed by (auth scope, URL)"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bytes_served": 0}
+        self._lock = threading.Lock()
+        # key -> (size, last_used); recency survives restarts through file mtimes
+        self._index = {}
+        self._total = 0
+        if not os.path.isdir(directory):
+            return
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.entry'):
+                st = entry.stat()
+                self._index[entry.name[:-6]] = (st.st_size, st.st_mtime)
+                self._total += st.st_size
+
+    def key(self, scope, url):
+        return hashlib.sha256(f"{scope}\n{url}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.entry')
+
+    def lookup(self, key):
+        """Return (meta, body) for a cached response or None"""
+        if key not in self._index:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                body = f.read()
+        except (OSError, ValueError):
+            self._discard(key)
+            return None
+        return meta, body
+
+    def validators(self, entry):
+        """Conditional request headers for a cached entry"""
+        meta = entry[0]
+        headers = {}
+        if meta.get('etag'):
+            headers["If-None-Match"] = meta['etag']
+        if meta.get('last_modified'):
+            headers["If-Modified-Since"] = meta['last_modified']
+        return headers
+
+    def record_hit(self, key, entry):
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_served"] += len(entry[1])
+            if key in self._index:
+                size, _ = self._index[key]
+                self._index[key] = (size, self._touch(key))
+
+    def record_miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def store(self, key, headers, body):
+        """Persist a 200 response if it carries a validator"""
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if not etag and not last_modified:
+            return
+        meta = {"etag": etag, "last_modified": last_modified,
+                "content_type": headers.get('content-type')}
+        data = json.dumps(meta).encode('utf-8') + b"\n" + body
+        if len(data) > self.max_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            old_size = self._index.get(key, (0, 0))[0]
+            self._index[key] = (len(data), self._touch(key))
+            self._total += len(data) - old_size
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _touch(self, key):
+        now = time.time()
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+        return now
+
+    def _discard(self, key):
+        with self._lock:
+            size, _ = self._index.pop(key, (0, 0))
+            self._total -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least-recently-used entries until under budget (lock held)"""
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            del self._index[key]
+            self._total -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = (100.0 * self.stats["hits"] / lookups) if lookups else 0.0
+        return (f"HTTP cache: {self.stats['hits']} hits / {self.stats['misses']} misses "
+                f"({rate:.1f}% served locally, {self.stats['bytes_served']} bytes), "
+                f"{self.stats['evictions']} evictions, {self._total} bytes on disk")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Incremental Audit State
+Each generator's project entries are appended to an NDJSON store as repos
+finish, with the pushed_at/updated_at fingerprint they were built from.
+The store of the last complete run lets --incremental re-analyze only
+added or changed repos, and the partial store of a crashed run is resumed
+rather than redone; projects.json is compacted from the store at the end
+
+Entries are transliterated to ASCII as they are written to the store, so
+everything compacted from it is already sanitized.
+"""
+import os
+
+import unicode_sanitizer
+from ndjson_store import NDJSONIndex, NDJSONWriter, sort_records, write_json_array
+
+# Outside _data/, where Jekyll would publish the stores and git would pick them up
+STATE_DIR = ".cache/audit"
+
+
+def fingerprint(repo):
+    return [repo.get('pushed_at'), repo.get('updated_at')]
+
+
+def impact_key(record):
+    """Stars, then last update, descending; ties keep listing order, as a stable sort would"""
+    project = record['project']
+    return project['stars'], project['updated_at'], -record['seq']
+
+
+class ProjectStore:
+    """<state dir>/<generator>.ndjson, holding one {seq, fingerprint, project} line per repo
+
+    seq is the repo's position in the listing, so compaction orders ties
+    exactly as sorting the listing-ordered entries would.
+    """
+
+    def __init__(self, output_file, generator, incremental=False, state_dir=STATE_DIR):
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        os.makedirs(state_dir, exist_ok=True)
+        self.output_file = output_file
+        self.path = os.path.join(state_dir, f"{generator}.ndjson")
+        self.partial = self.path + '.partial'
+        self.resumed = self.path + '.resume'
+        # A partial store means the last run crashed; its entries are reused
+        if os.path.exists(self.partial):
+            os.replace(self.partial, self.resumed)
+        sources = [self.resumed] + ([self.path] if incremental else [])
+        self.sources = [NDJSONIndex(path, key=lambda r: r['project']['name'], fields=(lambda r: r['fingerprint'],))
+                        for path in sources if os.path.exists(path)]
+        self.seq = {}
+        self.writer = NDJSONWriter(self.partial, dumps=unicode_sanitizer.dumps)
+
+    @property
+    def reusable(self):
+        return any(len(source) for source in self.sources)
+
+    def lookup(self, repo):
+        """The stored entry for repo if it was built from the repo as listed now, else None"""
+        for source in self.sources:
+            if repo['name'] in source and source.fields(repo['name'])[0] == fingerprint(repo):
+                return source.get(repo['name'])['project']
+        return None
+
+    def plan(self, repos):
+        """Copy reusable entries into this run; returns the repos still to analyze
+
+        Repos planned here are stored with their listing position as seq;
+        otherwise entries are taken to arrive in listing order.
+        """
+        self.seq = {repo['name']: seq for seq, repo in enumerate(repos)}
+        changed = []
+        for repo in repos:
+            entry = self.lookup(repo)
+            if entry is None:
+                changed.append(repo)
+            else:
+                self.append(repo, entry)
+        print(f"Incremental: {len(changed)} new/changed, {len(repos) - len(changed)} reused")
+        return changed
+
+    def append(self, repo, entry):
+        self.writer.append({"seq": self.seq.get(repo['name'], self.writer.count),
+                            "fingerprint": fingerprint(repo), "project": entry})
+
+    def compact(self, docs=None):
+        """Write projects.json sorted by impact and make this run the last complete one
+
+        Entries also pass through docs (a doc_shards.DocShards), if given,
+        on their way to projects.json.
+        """
+        self.close()
+        projects = (record['project'] for record in sort_records(self.partial, impact_key, reverse=True))
+        if docs is not None:
+            projects = map(docs.add, projects)
+        write_json_array(projects, self.output_file)
+        if docs is not None:
+            docs.close()
+        os.replace(self.partial, self.path)
+        if os.path.exists(self.resumed):
+            os.remove(self.resumed)
+
+    def close(self):
+        """Flush what was written; a run that stops here leaves its partial store to resume from"""
+        self.writer.close()
+        for source in self.sources:
+            source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Local Language Statistics
+Per-language byte totals computed from a checkout or a mirror, in the same
+{language: bytes} shape as GitHub's /languages endpoint, so audits need no
+API request per repository
+
+Like GitHub's statistics, only programming and markup languages count;
+vendored, documentation and generated files are excluded, and
+linguist-vendored / linguist-generated / linguist-documentation /
+linguist-language attributes in the root .gitattributes are honoured.
+"""
+import os
+import re
+from collections import Counter
+
+from fs_index import IGNORED_DIRS, walk_files
+from mirror_store import MirrorError, run_git
+
+EXTENSIONS = {
+    '.py': 'Python', '.pyw': 'Python', '.pyx': 'Cython', '.ipynb': 'Jupyter Notebook',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.vue': 'Vue', '.svelte': 'Svelte',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass', '.less': 'Less',
+    '.java': 'Java', '.kt': 'Kotlin', '.kts': 'Kotlin', '.scala': 'Scala', '.groovy': 'Groovy',
+    '.c': 'C', '.h': 'C', '.cpp': 'C++', '.cc': 'C++', '.cxx': 'C++', '.hpp': 'C++', '.hh': 'C++',
+    '.cu': 'Cuda', '.cuh': 'Cuda', '.cs': 'C#', '.go': 'Go', '.rs': 'Rust', '.swift': 'Swift',
+    '.m': 'Objective-C', '.mm': 'Objective-C++', '.rb': 'Ruby', '.php': 'PHP', '.pl': 'Perl',
+    '.r': 'R', '.rmd': 'RMarkdown', '.jl': 'Julia', '.lua': 'Lua', '.dart': 'Dart',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell', '.bat': 'Batchfile',
+    '.cmd': 'Batchfile', '.sql': 'SQL', '.tex': 'TeX', '.sol': 'Solidity',
+    '.hs': 'Haskell', '.ex': 'Elixir', '.exs': 'Elixir', '.erl': 'Erlang', '.clj': 'Clojure',
+    '.f90': 'Fortran', '.f': 'Fortran', '.asm': 'Assembly', '.s': 'Assembly', '.cmake': 'CMake',
+    '.ejs': 'EJS', '.hbs': 'Handlebars', '.jinja': 'Jinja', '.j2': 'Jinja',
+}
+FILENAMES = {
+    'Dockerfile': 'Dockerfile', 'Makefile': 'Makefile', 'makefile': 'Makefile', 'GNUmakefile': 'Makefile',
+    'CMakeLists.txt': 'CMake', 'Rakefile': 'Ruby', 'Gemfile': 'Ruby', 'Procfile': 'Procfile',
+}
+# Third-party trees, at any depth
+VENDORED_DIRS = {'node_modules', 'bower_components', 'vendor', 'vendors', 'third_party', 'third-party',
+                 'site-packages', 'Pods', 'Carthage', '.yarn', 'dist', 'extern', 'external', 'externals'}
+# Documentation trees, at the repository root only
+DOCUMENTATION_DIRS = {'docs', 'doc', 'Docs', 'Doc', 'Documentation', 'documentation', 'examples', 'samples'}
+# Generated files, recognised by name
+GENERATED_SUFFIXES = ('.min.js', '.min.css', '-min.js', '.bundle.js', '_pb2.py', '_pb2_grpc.py',
+                      '.pb.go', '.pb.cc', '.pb.h', '.designer.cs', '.g.dart', '.freezed.dart')
+
+# Sparse-checkout patterns that materialise exactly the files the statistics read
+SPARSE_PATTERNS = ['/.gitattributes'] + ['*' + ext for ext in EXTENSIONS] + list(FILENAMES)
+
+_EXCLUDING_ATTRS = ('linguist-vendored', 'linguist-generated', 'linguist-documentation')
+
+
+def _pattern_regex(pattern):
+    """gitattributes glob -> regex over a repository-relative path"""
+    anchored = '/' in pattern.rstrip('/')
+    pattern = pattern.lstrip('/')
+    out = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            out += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            out += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            out += '[^/]'
+            i += 1
+        else:
+            out += re.escape(pattern[i])
+            i += 1
+    return re.compile(('' if anchored else '(?:.*/)?') + out + r'\Z')
+
+
+class Attributes:
+    """linguist-* rules of a .gitattributes file; later lines win, as in git"""
+
+    def __init__(self, text=''):
+        self.rules = []
+        for line in text.splitlines():
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            attrs = {}
+            for attr in parts[1:]:
+                if attr.startswith('-') or attr.startswith('!'):
+                    attrs[attr[1:]] = False
+                elif '=' in attr:
+                    name, value = attr.split('=', 1)
+                    attrs[name] = value if name == 'linguist-language' else value.lower() not in ('false', '0')
+                else:
+                    attrs[attr] = True
+            attrs = {name: value for name, value in attrs.items() if name.startswith('linguist-')}
+            if attrs:
+                self.rules.append((_pattern_regex(parts[0]), attrs))
+
+    def lookup(self, path):
+        found = {}
+        for regex, attrs in self.rules:
+            if regex.match(path):
+                found.update(attrs)
+        return found
+
+
+def _excluded(path):
+    """True if a path is vendored, documentation or generated by the built-in rules"""
+    parts = path.split('/')
+    if VENDORED_DIRS.intersection(parts[:-1]) or (len(parts) > 1 and parts[0] in DOCUMENTATION_DIRS):
+        return True
+    return parts[-1].endswith(GENERATED_SUFFIXES)
+
+
+def classify(path, attributes=None):
+    """Language a repository-relative path counts towards, or None if it is not counted"""
+    attrs = attributes.lookup(path) if attributes else {}
+    if any(attrs.get(name) for name in _EXCLUDING_ATTRS):
+        return None
+    if _excluded(path) and not any(attrs.get(name) is False for name in _EXCLUDING_ATTRS):
+        return None
+    if isinstance(attrs.get('linguist-language'), str):
+        return attrs['linguist-language'].replace('-', ' ')
+    name = path.rsplit('/', 1)[-1]
+    if name in FILENAMES:
+        return FILENAMES[name]
+    return EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def _sorted(totals):
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def language_bytes(root):
+    """{language: bytes} for a checkout, largest first, in one pruned walk
+
+    Directories that are excluded whatever the attributes say (.git,
+    virtualenvs, caches) are never entered.
+    """
+    root = os.fspath(root)
+    try:
+        with open(os.path.join(root, '.gitattributes'), 'r', encoding='utf-8', errors='replace') as f:
+            attributes = Attributes(f.read())
+    except OSError:
+        attributes = None
+    # Vendored trees can only be re-included by attributes, so without any
+    # they are pruned from the walk as well
+    ignored = IGNORED_DIRS if attributes and attributes.rules else IGNORED_DIRS | VENDORED_DIRS
+    totals = Counter()
+    for rel, entry in walk_files(root, ignored):
+        language = classify(rel, attributes)
+        if language is None:
+            continue
+        try:
+            totals[language] += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return _sorted(totals)
+
+
+def tree_language_bytes(git_dir, ref='HEAD'):
+    """{language: bytes} for a commit of a repository with its blobs present
+
+    Sizes come from the object store (`git ls-tree -l`), so no worktree is
+    needed. In a blob-less partial clone every size lookup would download
+    its blob separately; check such mirrors out sparsely with
+    SPARSE_PATTERNS and use language_bytes instead.
+    """
+    try:
+        attributes = Attributes(run_git(['show', f'{ref}:.gitattributes'], cwd=git_dir))
+    except MirrorError:
+        attributes = None
+    totals = Counter()
+    for record in run_git(['ls-tree', '-r', '-l', '-z', ref], cwd=git_dir).split('\0'):
+        if '\t' not in record:
+            continue
+        meta, path = record.split('\t', 1)
+        mode, kind, _, size = meta.split()
+        # Submodules and symlinks are not counted
+        if kind != 'blob' or mode == '120000':
+            continue
+        language = classify(path, attributes)
+        if language is not None:
+            totals[language] += int(size)
+    return _sorted(totals)
+
+
+def mirror_language_bytes(mirrors, name, url, dest, branch=None):
+    """{language: bytes} of a repository via a sparse worktree of its mirror
+
+    Only files the statistics read are checked out, which lean (blob-less)
+    stores download in one batch.
+    """
+    with mirrors.checkout(name, url, dest, branch, sparse=SPARSE_PATTERNS):
+        return language_bytes(dest)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Persistent Repository Mirror Store
+Bare mirrors refreshed with incremental fetches, cheap per-job worktrees,
+and LRU eviction of cold mirrors under a disk budget
+
+Lean stores keep depth-1, blob-less (--filter=blob:none) mirrors; worktrees
+checked out with sparse patterns then only download the blobs they match,
+and any other file is fetched on demand when git reads it.
+"""
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+MIRROR_ROOT = Path(os.environ.get("MIRROR_ROOT", "C:/temp/repo_mirrors"))
+MIRROR_BUDGET = int(os.environ.get("MIRROR_BUDGET_MB", "5120")) * 1024 * 1024
+
+
+class MirrorError(Exception):
+    """A git operation on the mirror store failed"""
+
+
+def run_git(args, cwd=None):
+    result = subprocess.run(['git'] + list(args), cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise MirrorError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class MirrorStore:
+    """Bare mirrors under root/mirrors, with usage tracked in root/index.json"""
+
+    def __init__(self, root=MIRROR_ROOT, budget=MIRROR_BUDGET, lean=False):
+        self.root = Path(root)
+        self.budget = budget
+        self.lean = lean
+        self.mirrors = self.root / "mirrors"
+        self.index_file = self.root / "index.json"
+        self.stats = {"clones": 0, "fetches": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._repo_locks = {}
+        self._in_use = set()
+        self.mirrors.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def path(self, name):
+        return self.mirrors / f"{name}.git"
+
+    @contextmanager
+    def _lease(self, name):
+        """Serialize work on one mirror and protect it from eviction meanwhile"""
+        with self._lock:
+            lock = self._repo_locks.setdefault(name, threading.Lock())
+        with lock:
+            with self._lock:
+                self._in_use.add(name)
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._in_use.discard(name)
+
+    def _save_index(self):
+        tmp = self.index_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_file)
+
+    def _sync(self, name, url):
+        """Create or incrementally refresh the bare mirror (repo lock held)"""
+        path = self.path(name)
+        if (path / "HEAD").exists():
+            # The URL may carry a rotated token; keep it current
+            run_git(['remote', 'set-url', 'origin', url], cwd=path)
+            depth = ['--depth', '1'] if self.lean else []
+            run_git(['fetch', '--prune', '--quiet'] + depth + ['origin'], cwd=path)
+            self.stats["fetches"] += 1
+        else:
+            if path.exists():
+                shutil.rmtree(path)
+            # The blob filter is remembered by the clone, so later fetches stay blob-less
+            lean = ['--depth', '1', '--filter=blob:none'] if self.lean else []
+            run_git(['clone', '--bare', '--quiet'] + lean + [url, str(path)])
+            # Plain bare clones have no fetch refspec; track branches 1:1
+            run_git(['config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*'], cwd=path)
+            self.stats["clones"] += 1
+        return path
+
+    def sync(self, name, url):
+        """Create or incrementally refresh a mirror and return its path"""
+        with self._lease(name):
+            path = self._sync(name, url)
+        self._record(name)
+        return path
+
+    @contextmanager
+    def checkout(self, name, url, dest, branch=None, sparse=None):
+        """Refresh the mirror and yield a worktree of branch at dest
+
+        The worktree checks out the mirror's own branch ref, so commits made
+        in it can be pushed with `git push origin <branch>` as from a clone.
+        With sparse (gitignore-style patterns) only matching files are
+        written to dest. The repo is locked for the lifetime of the worktree.
+        """
+        dest = Path(dest)
+        with self._lease(name):
+            # A crashed job may have left its worktree behind; a branch
+            # checked out there would block the fetch
+            if dest.exists():
+                shutil.rmtree(dest)
+            if (self.path(name) / "HEAD").exists():
+                run_git(['worktree', 'prune'], cwd=self.path(name))
+            path = self._sync(name, url)
+            if branch is None:
+                branch = run_git(['symbolic-ref', '--short', 'HEAD'], cwd=path).strip()
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if sparse is None:
+                run_git(['worktree', 'add', '--quiet', str(dest), branch], cwd=path)
+            else:
+                run_git(['worktree', 'add', '--quiet', '--no-checkout', str(dest), branch], cwd=path)
+                run_git(['sparse-checkout', 'set', '--no-cone'] + list(sparse), cwd=dest)
+                run_git(['checkout', '--quiet', branch], cwd=dest)
+            try:
+                yield dest
+            finally:
+                shutil.rmtree(dest, ignore_errors=True)
+                run_git(['worktree', 'prune'], cwd=path)
+        self._record(name)
+
+    def _record(self, name):
+        size = dir_size(self.path(name))
+        with self._lock:
+            self.index[name] = {"size": size, "last_used": time.time()}
+            self._evict(keep=name)
+            self._save_index()
+
+    def _evict(self, keep=None):
+        """Remove least-recently-used idle mirrors until under budget (lock held)"""
+        total = sum(entry["size"] for entry in self.index.values())
+        for name, entry in sorted(self.index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.budget:
+                break
+            if name in self._in_use or name == keep:
+                continue
+            shutil.rmtree(self.path(name), ignore_errors=True)
+            del self.index[name]
+            total -= entry["size"]
+            self.stats["evictions"] += 1
+
+    def summary(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        return (f"Mirror store: {self.stats['clones']} clones, {self.stats['fetches']} incremental fetches, "
+                f"{self.stats['evictions']} evictions, {len(self.index)} mirrors / {total // (1024 * 1024)} MB")
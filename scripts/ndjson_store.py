@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+NDJSON Record Store
+Append-only newline-delimited JSON with batched fsyncs, lookup by key
+through a byte-offset index, and an external merge sort, so results
+survive a crash as they are produced and memory stays flat however many
+records there are
+"""
+import heapq
+import json
+import os
+import tempfile
+import time
+
+SYNC_EVERY = 64
+SYNC_INTERVAL = 2.0
+# Records sorted in memory at once; larger inputs are spilled as sorted runs.
+# Memory only stays flat past this size, so it sits below a typical
+# account's projects.json (a few hundred repos with READMEs, a few MB)
+RUN_BYTES = int(os.environ.get("NDJSON_RUN_MB", "1")) * 1024 * 1024
+
+
+class NDJSONWriter:
+    """Writes one JSON document per line, fsyncing every sync_every records or sync_interval seconds
+
+    dumps serializes each record on one line; json.dumps unless given.
+    """
+
+    def __init__(self, path, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL, dumps=json.dumps):
+        self.path = path
+        self.dumps = dumps
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.count = 0
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def append(self, record):
+        self._file.write(self.dumps(record) + '\n')
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_lines(path):
+    """(offset, line, record) for each complete line; a line torn by a crash ends the file"""
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return
+            yield offset, line, record
+            offset += len(line)
+
+
+def iter_records(path):
+    for _, _, record in iter_lines(path):
+        yield record
+
+
+class NDJSONIndex:
+    """Byte offsets of an NDJSON file's records by key, plus a few small fields each
+
+    Only the index lives in memory; get() reads a record back from disk.
+    """
+
+    def __init__(self, path, key, fields=()):
+        self.path = path
+        self.entries = {}
+        for offset, _, record in iter_lines(path):
+            self.entries[key(record)] = (offset,) + tuple(field(record) for field in fields)
+        self._file = None
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def fields(self, key):
+        return self.entries[key][1:]
+
+    def get(self, key):
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        self._file.seek(self.entries[key][0])
+        return json.loads(self._file.readline())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _spill(items, directory):
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        for _, line in items:
+            f.write(line)
+    return path
+
+
+def _run(path, key):
+    with open(path, 'rb') as f:
+        for line in f:
+            record = json.loads(line)
+            yield key(record), record
+
+
+def sort_records(path, key, reverse=False, run_bytes=None):
+    """Yield an NDJSON file's records ordered by key, never holding more than run_bytes of them
+
+    Inputs past run_bytes are sorted in runs spilled next to the file and
+    merged back lazily. Keys should be unique for a deterministic order.
+    """
+    run_bytes = run_bytes or RUN_BYTES
+    runs = []
+    chunk, size = [], 0
+    try:
+        for _, line, record in iter_lines(path):
+            chunk.append((key(record), line))
+            size += len(line)
+            if size >= run_bytes:
+                chunk.sort(key=lambda item: item[0], reverse=reverse)
+                runs.append(_spill(chunk, os.path.dirname(path) or '.'))
+                chunk, size = [], 0
+        chunk.sort(key=lambda item: item[0], reverse=reverse)
+        if not runs:
+            for _, line in chunk:
+                yield json.loads(line)
+            return
+        runs.append(_spill(chunk, os.path.dirname(path) or '.'))
+        chunk = []
+        for _, record in heapq.merge(*(_run(run, key) for run in runs), key=lambda item: item[0], reverse=reverse):
+            yield record
+    finally:
+        for run in runs:
+            try:
+                os.remove(run)
+            except OSError:
+                pass
+
+
+def write_json_array(records, path):
+    """Stream records into path exactly as json.dump(list(records), f, indent=2) would, atomically"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        empty = True
+        for record in records:
+            f.write('[\n  ' if empty else ',\n  ')
+            f.write(json.dumps(record, indent=2).replace('\n', '\n  '))
+            empty = False
+        f.write('[]' if empty else '\n]')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Streaming Jupyter Notebook Reader
+Yields the source of each code cell while reading the .ipynb in fixed-size
+chunks; outputs (base64 images, dataframes) are skipped without ever being
+held in memory, so memory per file stays constant however large it is
+
+The scan works on raw bytes: JSON's structural characters are ASCII, which
+never occur inside a UTF-8 multibyte sequence, so only the strings that are
+kept need decoding.
+"""
+import json
+import re
+
+CHUNK = 256 * 1024
+# Longest code cell kept in memory; anything past it is skipped
+MAX_SOURCE = 1024 * 1024
+
+_SKIP_STOP = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb'[\s,}\]]')
+
+
+class NotebookError(ValueError):
+    """The file is not a well-formed notebook"""
+
+
+class _Stream:
+    def __init__(self, f):
+        self.f = f
+        self.buf = b''
+        self.pos = 0
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK)
+        if not chunk:
+            raise NotebookError("unexpected end of notebook")
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def next(self):
+        """Next non-whitespace character, consumed"""
+        while True:
+            while self.pos < len(self.buf):
+                c = self.buf[self.pos:self.pos + 1]
+                self.pos += 1
+                if not c.isspace():
+                    return c
+            self._fill()
+
+    def peek(self):
+        c = self.next()
+        self.pos -= 1
+        return c
+
+    def expect(self, char):
+        if self.next() != char:
+            raise NotebookError(f"expected {char!r}")
+
+    def string(self, keep, limit=MAX_SOURCE):
+        """Consume a string whose opening quote was read; decode it only if keep"""
+        parts = []
+        size = 0
+        while True:
+            # bytes.find runs at memchr speed over long base64 payloads
+            quote = self.buf.find(b'"', self.pos)
+            end = self.buf.find(b'\\', self.pos, len(self.buf) if quote < 0 else quote)
+            if end < 0:
+                end = quote
+            if end < 0:
+                if keep and size < limit:
+                    parts.append(self.buf[self.pos:])
+                    size += len(self.buf) - self.pos
+                self.pos = len(self.buf)
+                self._fill()
+                continue
+            if keep and size < limit:
+                parts.append(self.buf[self.pos:end])
+                size += end - self.pos
+            if end == quote:
+                self.pos = end + 1
+                break
+            # Backslash: keep the escape pair together across chunk boundaries
+            while end + 1 >= len(self.buf):
+                self.pos = end
+                self._fill()
+                end = 0
+            if keep and size < limit:
+                parts.append(self.buf[end:end + 2])
+                size += 2
+            self.pos = end + 2
+        if not keep:
+            return None
+        raw = b''.join(parts).decode('utf-8', errors='replace')
+        try:
+            return json.loads('"' + raw + '"')
+        except ValueError:
+            # Truncated at limit mid-escape; drop the dangling escape
+            return json.loads('"' + raw.rsplit('\\', 1)[0] + '"')
+
+    def skip_value(self):
+        """Consume one value of any shape without materialising it"""
+        c = self.next()
+        if c == b'"':
+            self.string(keep=False)
+            return
+        if c not in b'{[':
+            self.scalar()
+            return
+        depth = 1
+        while depth:
+            match = _SKIP_STOP.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                self._fill()
+                continue
+            self.pos = match.end()
+            token = match.group()
+            if token == b'"':
+                self.string(keep=False)
+            elif token in b'{[':
+                depth += 1
+            else:
+                depth -= 1
+
+    def scalar(self):
+        """Consume the rest of a number/true/false/null whose first char was read"""
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return
+            self.pos = len(self.buf)
+            try:
+                self._fill()
+            except NotebookError:
+                return
+
+    def members(self):
+        """Iterate the keys of an object whose '{' was read, leaving each value unread"""
+        if self.peek() == b'}':
+            self.next()
+            return
+        while True:
+            self.expect(b'"')
+            key = self.string(keep=True)
+            self.expect(b':')
+            yield key
+            c = self.next()
+            if c == b'}':
+                return
+            if c != b',':
+                raise NotebookError("expected ',' or '}'")
+
+    def items(self):
+        """Iterate the elements of an array whose '[' was read, leaving each value unread"""
+        if self.peek() == b']':
+            self.next()
+            return
+        while True:
+            yield
+            c = self.next()
+            if c == b']':
+                return
+            if c != b',':
+                raise NotebookError("expected ',' or ']'")
+
+
+def _source(stream):
+    """A cell source: one string or a list of line strings"""
+    c = stream.next()
+    if c == b'"':
+        return stream.string(keep=True)
+    if c != b'[':
+        raise NotebookError("malformed cell source")
+    lines = []
+    size = 0
+    for _ in stream.items():
+        if stream.next() != b'"':
+            raise NotebookError("malformed cell source")
+        line = stream.string(keep=size < MAX_SOURCE)
+        if line is not None:
+            lines.append(line)
+            size += len(line)
+    return ''.join(lines)
+
+
+def _cells(stream):
+    stream.expect(b'[')
+    for _ in stream.items():
+        stream.expect(b'{')
+        cell_type, source = None, None
+        for key in stream.members():
+            if key == 'cell_type' and stream.peek() == b'"':
+                stream.next()
+                cell_type = stream.string(keep=True)
+            elif key in ('source', 'input'):  # 'input' in nbformat 3
+                source = _source(stream)
+            else:
+                stream.skip_value()
+        if cell_type == 'code' and source:
+            yield source
+
+
+def iter_code_cells(f):
+    """Yield code-cell sources from a binary-mode notebook file (nbformat 3 and 4)"""
+    stream = _Stream(f)
+    stream.expect(b'{')
+    for key in stream.members():
+        if key == 'cells':
+            yield from _cells(stream)
+        elif key == 'worksheets':
+            stream.expect(b'[')
+            for _ in stream.items():
+                stream.expect(b'{')
+                for sheet_key in stream.members():
+                    if sheet_key == 'cells':
+                        yield from _cells(stream)
+                    else:
+                        stream.skip_value()
+        else:
+            stream.skip_value()
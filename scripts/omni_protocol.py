@@ -8,16 +8,71 @@ Tier 2: Scientific Archive (Automated Analysis)
 """
 
 import os
-import json
+import re
 import subprocess
 import shutil
 import time
+from collections import Counter
 from pathlib import Path
 
+from analysis_cache import AnalysisCache, blob_shas, rules_version, tree_sha
+from classification import classify
+from fs_index import walk_files
+from git_publisher import PUBLISH_MODE, GitDataPublisher
+from py_imports import PYTHON_EXTS, ImportExtractor
+from github_client import GitHubClient
+from http_cache import ResponseCache
+from mirror_store import MirrorStore
+from rate_limit import content_scheduler
+from readme_templates import badge, project_fragments
+from remote_tree import file_unchanged, root_tree
+
 # --- CONFIGURATION ---
 USERNAME = "vaishnavak2001"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 TEMP_WIDTH = Path("C:/temp/omni_protocol_workspace")
+COMMIT_MESSAGE = "feat(docs): automated research documentation"
+
+# Tier 2 extensions map
+EXT_MAP = {
+    '.py': 'Python', '.js': 'JavaScript', '.ipynb': 'Jupyter Notebook', 
+    '.cpp': 'C++', '.java': 'Java', '.html': 'HTML/CSS'
+}
+# Framework signatures
+FW_SIGS = {
+    'tensorflow': 'TensorFlow', 'keras': 'Keras', 'torch': 'PyTorch',
+    'sklearn': 'Scikit-learn', 'pandas': 'Pandas', 'react': 'React',
+    'django': 'Django', 'flask': 'Flask', 'streamlit': 'Streamlit',
+    'opencv': 'OpenCV', 'gym': 'OpenAI Gym'
+}
+# Imported module names that differ from their signature
+IMPORT_SIGS = {'cv2': 'opencv', 'gymnasium': 'gym'}
+# One regex for all signatures; the lookahead reports overlapping matches too
+FW_PATTERN = re.compile(b'(?=(' + b'|'.join(re.escape(sig.encode()) for sig in FW_SIGS) + b'))')
+SCAN_BYTES = 2000
+# Python files are parsed in batches that double from IMPORT_BATCH up to
+# IMPORT_BATCH_MAX, checking for early stop in between
+IMPORT_BATCH = 32
+IMPORT_BATCH_MAX = 1024
+# Images, archives, datasets and model weights are never opened
+BINARY_EXTS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.tif', '.tiff', '.webp', '.pdf',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar',
+    '.csv', '.tsv', '.parquet', '.feather', '.npy', '.npz', '.pkl', '.pickle', '.joblib',
+    '.h5', '.hdf5', '.pt', '.pth', '.ckpt', '.onnx', '.pb', '.tflite', '.bin', '.safetensors',
+    '.mp3', '.mp4', '.wav', '.avi', '.mov', '.exe', '.dll', '.so', '.pyc', '.woff', '.woff2', '.ttf'
+}
+# Tier 2 checkouts hold only source files and dependency manifests;
+# datasets and model weights are never downloaded
+SPARSE_PATTERNS = (['/README.md', 'requirements*.txt', 'package.json', 'setup.py', 'pyproject.toml',
+                    'environment.yml'] + ['*' + ext for ext in EXT_MAP])
+
+# Cached Tier 2 results are dropped whenever the rules above change;
+# bump ANALYSIS_VERSION when scan_repo's logic changes
+ANALYSIS_VERSION = 3
+analysis_cache = AnalysisCache("omni_protocol", rules_version(
+    ANALYSIS_VERSION, EXT_MAP, FW_SIGS, IMPORT_SIGS, BINARY_EXTS, SCAN_BYTES, SPARSE_PATTERNS))
+import_extractor = ImportExtractor()
 
 # --- TIER 1 DATA PAYLOAD (Exact Text) ---
 TIER_1_DATA = {
@@ -85,64 +140,100 @@ TIER_1_DATA = {
 
 # --- HELPER FUNCTIONS ---
 
+client = GitHubClient(token=GITHUB_TOKEN, user_agent="Omni-Protocol-Agent", cache=ResponseCache())
+
 def get_all_repos():
-    """Fetch all public repos using GitHub CLI or curl (fallback)"""
-    # Assuming user has gh cli or we use requests/curl if available. 
-    # Using python subprocess with curl for broad compatibility given the context
-    cmd = [
-        "curl", "-H", f"Authorization: token {GITHUB_TOKEN}",
-        f"https://api.github.com/users/{USERNAME}/repos?per_page=100&type=owner"
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print("Error fetching repos:", result.stderr)
-        return []
-    try:
-        return json.loads(result.stdout)
-    except:
-        return []
+    """Fetch all owned repos; pages after the first are fetched concurrently"""
+    return list(client.iter_pages(f"/users/{USERNAME}/repos?type=owner", log=print))
+
+def match_signatures(data):
+    """Signatures (FW_SIGS keys) occurring in a bytes blob"""
+    return {match.group(1).decode() for match in FW_PATTERN.finditer(data.lower())}
+
+def import_signatures(modules):
+    """Signatures (FW_SIGS keys) for a set of imported top-level modules"""
+    return {IMPORT_SIGS.get(module, module) for module in modules} & FW_SIGS.keys()
 
-def analyze_tech_stack(repo_path):
-    """Tier 2 Logic: Scan files to infer tech stack"""
+def scan_repo(repo_path, cache=None):
+    """Single pass over the tree: languages by extension, frameworks by content
+
+    Python files and notebooks are judged by the modules they import (parsed
+    with ast); other text files by signatures in their first 2000 bytes.
+    Returns (languages, frameworks, stats) where stats counts the files and
+    bytes whose content was actually read. With a cache, per-file results
+    are memoized by blob SHA, so only new or changed blobs are read.
+    """
     languages = set()
     frameworks = set()
+    stats = {"files": 0, "bytes": 0}
+    shas = blob_shas(repo_path) if cache is not None else {}
+    python_files = []
     
-    # Extensions map
-    ext_map = {
-        '.py': 'Python', '.js': 'JavaScript', '.ipynb': 'Jupyter Notebook', 
-        '.cpp': 'C++', '.java': 'Java', '.html': 'HTML/CSS'
-    }
+    for rel, entry in walk_files(repo_path):
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext in EXT_MAP:
+            languages.add(EXT_MAP[ext])
+        if ext in PYTHON_EXTS:
+            python_files.append((entry.path, shas.get(rel)))
+            continue
+        
+        # Content scan for frameworks (first 2000 bytes), until every signature is found
+        if len(frameworks) == len(FW_SIGS) or ext in BINARY_EXTS:
+            continue
+        sha = shas.get(rel)
+        if sha:
+            found = cache.get("blob:" + sha)
+            if found is not None:
+                frameworks.update(FW_SIGS[sig] for sig in found)
+                continue
+        try:
+            with open(entry.path, 'rb') as f:
+                head = f.read(SCAN_BYTES)
+        except OSError:
+            continue
+        stats["files"] += 1
+        stats["bytes"] += len(head)
+        found = set()
+        if b'\0' not in head:  # otherwise sniffed as binary
+            found = match_signatures(head)
+            frameworks.update(FW_SIGS[sig] for sig in found)
+        if sha:
+            cache.put("blob:" + sha, sorted(found))
     
-    # Framework signatures
-    fw_sigs = {
-        'tensorflow': 'TensorFlow', 'keras': 'Keras', 'torch': 'PyTorch',
-        'sklearn': 'Scikit-learn', 'pandas': 'Pandas', 'react': 'React',
-        'django': 'Django', 'flask': 'Flask', 'streamlit': 'Streamlit',
-        'opencv': 'OpenCV', 'gym': 'OpenAI Gym'
-    }
+    # In growing batches, so parsing also stops once every signature is found
+    start, batch = 0, IMPORT_BATCH
+    while start < len(python_files) and len(frameworks) < len(FW_SIGS):
+        imports, files, size = import_extractor.extract(python_files[start:start + batch], cache)
+        start, batch = start + batch, min(batch * 2, IMPORT_BATCH_MAX)
+        stats["files"] += files
+        stats["bytes"] += size
+        for modules in imports.values():
+            frameworks.update(FW_SIGS[sig] for sig in import_signatures(modules))
     
-    for root, dirs, files in os.walk(repo_path):
-        if '.git' in root: continue
-        
-        for file in files:
-            ext = os.path.splitext(file)[1]
-            if ext in ext_map:
-                languages.add(ext_map[ext])
-            
-            # Simple content scan for frameworks (first 50 lines)
-            try:
-                with open(os.path.join(root, file), 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(2000).lower() 
-                    for sig, name in fw_sigs.items():
-                        if sig in content:
-                            frameworks.add(name)
-            except:
-                pass
-                
-    return list(languages), list(frameworks)
-
-def generate_readme(repo_name, tier, data=None, tech_analysis=None):
+    return languages, frameworks, stats
+
+def analyze_tech_stack(repo_path, tree=None):
+    """Tier 2 Logic: Scan files to infer tech stack (skipped for an already analyzed tree)
+
+    tree defaults to HEAD's tree; pass the SHA of a staged tree to analyze
+    the worktree as it will be committed.
+    """
+    tree = tree or tree_sha(repo_path)
+    if tree:
+        cached = analysis_cache.get("tree:" + tree)
+        if cached is not None:
+            print(f"  -> Unchanged tree, reusing analysis")
+            return cached[0], cached[1]
+    languages, frameworks, stats = scan_repo(repo_path, analysis_cache)
+    print(f"  -> Scanned {stats['files']} files ({stats['bytes'] / 1024:.1f} KB)")
+    result = [sorted(languages), sorted(frameworks)]
+    if tree:
+        analysis_cache.put("tree:" + tree, result)
+    return result[0], result[1]
+
+def generate_readme(repo_name, tier, data=None, tech_analysis=None, fragments=None):
     """Generate Research Paper formatted README"""
+    fragments = fragments or project_fragments(repo_name, 2025, time.strftime('%Y'))
     if tier == 1:
         abstract = data['abstract']
         tech_stack = ", ".join(data['tags'])
@@ -154,17 +245,18 @@ def generate_readme(repo_name, tier, data=None, tech_analysis=None):
         category = "Software Archive"
         
         # Heuristic Abstract
-        clean_name = repo_name.replace('-', ' ').replace('_', ' ').title()
-        if 'notebook' in [l.lower() for l in langs]:
+        clean_name = fragments.title
+        archive = classify(repo_name, languages=langs, frameworks=fws).archive
+        if archive == 'notebook':
             abstract = f"Computational analysis and research implementation for **{clean_name}**. Utilizes interactive notebook environments for data exploration and algorithmic validation."
-        elif 'python' in [l.lower() for l in langs]:
+        elif archive == 'python':
              abstract = f"Backend algorithm implementation for **{clean_name}**. Developed in Python with a focus on modular architecture and data processing efficiency."
         else:
              abstract = f"Source code repository for **{clean_name}**. Implements core logic and structural components for the target application domain."
 
-    readme = f"""# {repo_name.replace('-', ' ').replace('_', ' ').title()}
+    readme = f"""# {fragments.title}
 
-![Status](https://img.shields.io/badge/Status-Research_Grade-002147?style=flat-square&logo=github) ![Category](https://img.shields.io/badge/Domain-{category.replace(' ', '_')}-008080?style=flat-square)
+{badge('Status', 'Status', 'Research Grade', '002147', 'github')} {badge('Category', 'Domain', category, '008080')}
 
 ## \U0001f4c4 Abstract
 
@@ -183,9 +275,9 @@ The system architecture adheres to rigorous software engineering standards.
 If you utilize this work in your research, please cite:
 
 ```bibtex
-@software{{{repo_name.lower().replace('-', '_')}_2025,
+@software{{{fragments.citation_key},
   author = {{Vaishnav AK}},
-  title = {{{repo_name.replace('-', ' ').replace('_', ' ').title()}}},
+  title = {{{fragments.title}}},
   year = {{2025}},
   url = {{https://github.com/{USERNAME}/{repo_name}}},
   note = {{Bio-Intelligence Research Ecosystem}}
@@ -193,47 +285,94 @@ If you utilize this work in your research, please cite:
 ```
 
 ---
-*© {time.strftime('%Y')} Vaishnav AK. Engineered for Biomedical Innovation.*
+*© {fragments.current_year} Vaishnav AK. Engineered for Biomedical Innovation.*
 """
     return readme
 
-def process_repo(repo):
+def clone_url(repo):
+    return repo['clone_url'].replace("https://", f"https://{GITHUB_TOKEN}@")
+
+def plan_readme(repo, mirrors):
+    """(README, unchanged) for a repo, decided without a checkout
+
+    The remote root tree gives README.md's blob SHA and, for Tier 2, the
+    tree SHA whose analysis may already be cached. README is None when
+    that analysis is not cached, in which case the repo is checked out.
+    """
+    name = repo['name']
+    root = root_tree(USERNAME, name, repo['default_branch'], client, mirrors, clone_url(repo))
+    if name in TIER_1_DATA:
+        readme_content = generate_readme(name, 1, data=TIER_1_DATA[name])
+    else:
+        cached = analysis_cache.get("tree:" + root.sha) if root else None
+        if cached is None:
+            return None, False
+        readme_content = generate_readme(name, 2, tech_analysis=(cached[0], cached[1]))
+    return readme_content, file_unchanged(root, readme_content)
+
+def queue_readme(publish_queue, repo, readme_content):
+    publish_queue.append((repo['name'], repo['default_branch'], {"README.md": readme_content}, COMMIT_MESSAGE))
+    print(f"  -> Queued for the Git Data API")
+    return 'queued'
+
+def process_repo(repo, mirrors, push_scheduler, publish_queue=None):
+    """Sync one repo's README; returns 'skipped', 'unchanged', 'synced' or 'queued'
+
+    With a publish_queue (a list), the README is not pushed from a worktree
+    but queued as a Git Data API job, and no checkout is made when planning
+    could already generate it.
+    """
     name = repo['name']
     
     # Skip the portfolio repo to avoid recursion issues or overwriting the site
     if name.lower() == f"{USERNAME}.github.io".lower():
         print(f"Skipping Portfolio Repo: {name}")
-        return
+        return 'skipped'
 
     print(f"Processing: {name}...")
     
-    repo_dir = TEMP_WIDTH / name
+    # 1. Plan: repos whose README is already current are never checked out
+    readme_content, unchanged = plan_readme(repo, mirrors)
+    if unchanged:
+        print(f"  -> README up to date, nothing to push")
+        return 'unchanged'
     
-    # 1. Clone
-    if repo_dir.exists():
-        shutil.rmtree(repo_dir)
+    if publish_queue is not None and readme_content is not None:
+        return queue_readme(publish_queue, repo, readme_content)
     
-    clone_url = repo['clone_url'].replace("https://", f"https://{GITHUB_TOKEN}@")
-    subprocess.run(["git", "clone", clone_url, str(repo_dir)], capture_output=True)
+    repo_dir = TEMP_WIDTH / name
     
-    # 2. Determine Tier & Generate
-    if name in TIER_1_DATA:
-        print(f"  -> TIER 1 (Featured)")
-        readme_content = generate_readme(name, 1, data=TIER_1_DATA[name])
-    else:
-        print(f"  -> TIER 2 (Archive)")
-        langs, fws = analyze_tech_stack(repo_dir)
-        readme_content = generate_readme(name, 2, tech_analysis=(langs, fws))
-        
-    # 3. Write
-    with open(repo_dir / "README.md", "w", encoding="utf-8") as f:
-        f.write(readme_content)
-        
-    # 4. Commit & Push
-    subprocess.run(["git", "add", "README.md"], cwd=repo_dir, capture_output=True)
-    subprocess.run(["git", "commit", "-m", "feat(docs): automated research documentation"], cwd=repo_dir, capture_output=True)
-    subprocess.run(["git", "push"], cwd=repo_dir, capture_output=True)
+    # 2. Check out a worktree of the persistent mirror
+    if publish_queue is None:
+        push_scheduler.acquire()  # Paced for GitHub's content-creation limits
+    with mirrors.checkout(name, clone_url(repo), repo_dir, repo['default_branch'], sparse=SPARSE_PATTERNS):
+        # 3. Determine Tier & Generate (unless planning could)
+        tier_2 = name not in TIER_1_DATA
+        print(f"  -> TIER 2 (Archive)" if tier_2 else f"  -> TIER 1 (Featured)")
+        if readme_content is None:
+            langs, fws = analyze_tech_stack(repo_dir)
+            readme_content = generate_readme(name, 2, tech_analysis=(langs, fws))
+            
+        # 4. Write
+        with open(repo_dir / "README.md", "w", encoding="utf-8") as f:
+            f.write(readme_content)
+            
+        # 5. Commit & Push, if the README actually changed
+        subprocess.run(["git", "add", "README.md"], cwd=repo_dir, capture_output=True)
+        if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=repo_dir).returncode == 0:
+            print(f"  -> README up to date, nothing to push")
+            return 'unchanged'
+        # Analyze the tree about to be committed too, so the next run can
+        # plan this repo without a checkout (only the new README blob is read)
+        if tier_2:
+            staged = subprocess.run(["git", "write-tree"], cwd=repo_dir, capture_output=True, text=True)
+            analyze_tech_stack(repo_dir, tree=staged.stdout.strip())
+        if publish_queue is not None:
+            return queue_readme(publish_queue, repo, readme_content)
+        subprocess.run(["git", "commit", "-m", COMMIT_MESSAGE], cwd=repo_dir, capture_output=True)
+        subprocess.run(["git", "push", "origin", repo['default_branch']], cwd=repo_dir, capture_output=True)
     print(f"  -> Synced.")
+    return 'synced'
 
 def main():
     if not GITHUB_TOKEN:
@@ -246,11 +385,28 @@ def main():
     repos = get_all_repos()
     print(f"Found {len(repos)} repositories.")
     
+    mirrors = MirrorStore(lean=True)
+    push_scheduler = content_scheduler()
+    publish_queue = [] if PUBLISH_MODE == "api" else None
+    outcomes = Counter()
     for repo in repos:
         try:
-            process_repo(repo)
+            outcomes[process_repo(repo, mirrors, push_scheduler, publish_queue)] += 1
         except Exception as e:
+            outcomes['failed'] += 1
             print(f"Error processing {repo['name']}: {e}")
+    
+    # Queued READMEs are committed through the Git Data API, concurrently
+    if publish_queue:
+        publisher = GitDataPublisher(client, USERNAME, push_scheduler)
+        for (name, _, _, _), result in zip(publish_queue, publisher.publish_many(publish_queue)):
+            outcomes['queued'] -= 1
+            if isinstance(result, Exception):
+                outcomes['failed'] += 1
+                print(f"Error publishing {name}: {result}")
+            else:
+                outcomes['synced' if result.status == 'updated' else 'unchanged'] += 1
+        print(publisher.summary())
             
     # Cleanup
     try:
@@ -258,6 +414,11 @@ def main():
     except:
         pass
         
+    analysis_cache.save()
+    print(f"READMEs: {outcomes['synced']} synced, {outcomes['unchanged']} already up to date, "
+          f"{outcomes['skipped']} skipped, {outcomes['failed']} failed")
+    print(analysis_cache.summary())
+    print(mirrors.summary())
     print("--- MISSION COMPLETE ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Data Pipeline
+One entry point for the site's data: audit -> research data -> sanitize,
+declared as a DAG of stages with explicit inputs and outputs and run in
+dependency order in one process, so each stage hands its data to the next
+in memory instead of the next one re-parsing the file
+
+A stage is skipped when the content of its input files, the source of the
+code it runs and its parameters are all unchanged since it last ran, and
+its outputs are still as it left them. Stages that read the GitHub API
+have no local inputs to compare, so they always run (the audit runs
+--incremental) unless --offline is given.
+
+    python scripts/pipeline.py [--offline] [--force] [--research featured]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from graphlib import TopologicalSorter
+
+from analysis_cache import digest
+from doc_shards import INDEX_FILE, PROJECTS_FILE
+from py_imports import imports_in_source
+
+STATE_FILE = os.environ.get("PIPELINE_STATE", ".cache/pipeline.json")
+RESEARCH_FILE = "_data/research_data.json"
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, or None if it does not exist"""
+    sha = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+    except FileNotFoundError:
+        return None
+    return sha.hexdigest()
+
+
+def code_version(module):
+    """Digest of a script module and every local module it imports, transitively"""
+    seen = {}
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+        if name in seen or not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            source = f.read()
+        seen[name] = hashlib.sha256(source).hexdigest()
+        pending.extend(imports_in_source(source))
+    return digest(seen)
+
+
+class Stage:
+    """One step of the pipeline
+
+    run(values) receives the values produced so far by earlier stages of
+    this run and returns those it produces. module is the script whose
+    code (with its local imports) versions the stage. A remote stage reads
+    the GitHub API and is never skipped.
+    """
+
+    def __init__(self, name, module, run, inputs=(), outputs=(), after=(), params=None, remote=False):
+        self.name = name
+        self.module = module
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+        self.params = params or {}
+        self.remote = remote
+
+    def key(self):
+        return digest({"code": code_version(self.module), "params": self.params,
+                       "inputs": {path: file_digest(path) for path in self.inputs}})
+
+
+class Pipeline:
+    """Runs stages in dependency order, skipping those with nothing new to do"""
+
+    def __init__(self, stages, state_file=STATE_FILE):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        self.values = {}
+        self.timings = []
+
+    def order(self):
+        # A file's producer writes it without reading it; stages that rewrite
+        # it in place follow the producer like any other reader
+        producers = {path: stage.name for stage in self.stages.values()
+                     for path in stage.outputs if path not in stage.inputs}
+        graph = TopologicalSorter()
+        for stage in self.stages.values():
+            needs = {producers[path] for path in stage.inputs if path in producers}
+            graph.add(stage.name, *needs, *(name for name in stage.after if name in self.stages))
+        return list(graph.static_order())
+
+    def up_to_date(self, stage):
+        recorded = self.state.get(stage.name)
+        if stage.remote or not recorded or recorded['key'] != stage.key():
+            return False
+        return all(file_digest(path) == sha for path, sha in recorded['outputs'].items())
+
+    def run(self, force=False, offline=False):
+        for name in self.order():
+            stage = self.stages[name]
+            start = time.perf_counter()
+            if offline and stage.remote:
+                status = "offline"
+            elif not force and self.up_to_date(stage):
+                status = "skipped"
+            else:
+                self.values.update(stage.run(self.values) or {})
+                # Keyed after running, so a stage that rewrites its inputs in place
+                # is up to date with what it left behind
+                self.state[name] = {"key": stage.key(),
+                                    "outputs": {path: file_digest(path) for path in stage.outputs}}
+                self.save()
+                status = "ran"
+            self.timings.append((name, status, time.perf_counter() - start))
+        return self.timings
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def summary(self):
+        lines = ["Pipeline stages:"]
+        for name, status, elapsed in self.timings:
+            lines.append(f"  {name:<10} {status:<8} {elapsed:8.2f}s")
+        lines.append(f"  {'total':<10} {'':<8} {sum(t[2] for t in self.timings):8.2f}s")
+        return "\n".join(lines)
+
+
+def audit_stage(audit_args):
+    def run(values):
+        import audit_and_doc_enhanced
+        return {"project_index": audit_and_doc_enhanced.main(audit_args)}
+    return Stage("audit", "audit_and_doc_enhanced", run, outputs=(PROJECTS_FILE, INDEX_FILE),
+                 params={"args": audit_args}, remote=True)
+
+
+def research_stage():
+    def run(values):
+        import generate_research_data
+        return {"research_data": generate_research_data.main(values.get("project_index"))}
+    return Stage("research", "generate_research_data", run, inputs=(INDEX_FILE,), outputs=(RESEARCH_FILE,))
+
+
+def featured_research_stage():
+    # Lists repos from the API itself, so it only follows the audit for its fallback
+    def run(values):
+        import generate_full_portfolio_data
+        return {"research_data": generate_full_portfolio_data.main()}
+    return Stage("research", "generate_full_portfolio_data", run, outputs=(RESEARCH_FILE,), after=("audit",),
+                 remote=True)
+
+
+def sanitize_stage():
+    files = (PROJECTS_FILE, INDEX_FILE, RESEARCH_FILE)
+
+    def run(values):
+        import sanitize_unicode
+        loaded = {RESEARCH_FILE: values["research_data"]} if "research_data" in values else None
+        sanitize_unicode.sanitize_files(list(files), loaded)
+    return Stage("sanitize", "sanitize_unicode", run, inputs=files, outputs=files)
+
+
+def build_stages(args):
+    audit_args = ["--incremental"] if not args.full_audit else []
+    audit_args += ["--backend", args.backend, "--languages", args.languages]
+    research = featured_research_stage() if args.research == "featured" else research_stage()
+    return [audit_stage(audit_args), research, sanitize_stage()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the data pipeline, skipping stages with unchanged inputs")
+    parser.add_argument("--offline", action="store_true",
+                        help="skip stages that read the GitHub API and build from the data on disk")
+    parser.add_argument("--force", action="store_true", help="run every stage even if it is up to date")
+    parser.add_argument("--full-audit", action="store_true", help="re-analyze every repo instead of --incremental")
+    parser.add_argument("--research", choices=["projects", "featured"], default="projects",
+                        help="research data from the project index or from generate_full_portfolio_data's "
+                             "featured projects")
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest")
+    parser.add_argument("--languages", choices=["api", "local"], default="api")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = Pipeline(build_stages(args))
+    try:
+        pipeline.run(force=args.force, offline=args.offline)
+    finally:
+        print(pipeline.summary())
+    return pipeline
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Python Import Extraction
+Top-level modules imported by .py files and notebook code cells, parsed
+with ast and memoized per blob SHA
+"""
+import ast
+import re
+import threading
+
+from notebook_stream import NotebookError, iter_code_cells
+
+MAX_SOURCE_BYTES = 2 * 1024 * 1024
+PYTHON_EXTS = ('.py', '.ipynb')
+
+# Fallback for files ast cannot parse (Python 2, templates, truncated files)
+_IMPORT_LINE = re.compile(r'^[ \t]*(?:from[ \t]+([A-Za-z_]\w*)[\w.]*[ \t]+import|import[ \t]+([A-Za-z_]\w*))', re.M)
+_BLOCK_FIELDS = ('body', 'orelse', 'finalbody')
+# IPython magics and shell escapes are not Python syntax
+_MAGIC_LINE = re.compile(r'^[ \t]*[%!?].*$', re.M)
+
+
+def _statements(body):
+    """Every statement in a block, recursing into nested blocks but never into
+    expressions, which cannot contain imports and make up most of the tree"""
+    for node in body:
+        yield node
+        for field in _BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if block:
+                yield from _statements(block)
+        for handler in getattr(node, 'handlers', None) or getattr(node, 'cases', None) or ():
+            yield from _statements(handler.body)
+
+
+def imports_in_source(source):
+    """Top-level module names imported by a piece of Python source"""
+    text = isinstance(source, str)
+    last = source.rfind('import' if text else b'import')
+    if last < 0:
+        return set()
+    # Every import statement ends by the line holding the last 'import', so
+    # only that much is parsed; a cut that splits a statement or string
+    # fails to compile and the whole source is parsed instead
+    end = source.find('\n' if text else b'\n', last)
+    head = source if end < 0 else source[:end + 1]
+    try:
+        tree = compile(head, '<source>', 'exec', ast.PyCF_ONLY_AST)
+    except (SyntaxError, ValueError):
+        try:
+            tree = compile(source, '<source>', 'exec', ast.PyCF_ONLY_AST)
+        except (SyntaxError, ValueError):
+            if not text:
+                source = source.decode('utf-8', errors='replace')
+            return {a or b for a, b in _IMPORT_LINE.findall(source)}
+    modules = set()
+    for node in _statements(tree.body):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.add(node.module.split('.')[0])
+    return modules
+
+
+def imports_of_file(path):
+    """(sorted imported modules, bytes read) for a .py file or notebook"""
+    modules = set()
+    with open(path, 'rb') as f:
+        if path.endswith('.ipynb'):
+            try:
+                for source in iter_code_cells(f):
+                    modules |= imports_in_source(_MAGIC_LINE.sub('', source))
+            except NotebookError:
+                pass
+            return sorted(modules), f.tell()
+        source = f.read(MAX_SOURCE_BYTES)
+    return sorted(imports_in_source(source)), len(source)
+
+
+def _safe_imports_of_file(path):
+    try:
+        return imports_of_file(path)
+    except (OSError, RecursionError, MemoryError):
+        return [], 0
+
+
+class ImportExtractor:
+    """Batch import extraction
+
+    With a cache (AnalysisCache), results are stored under "imports:<blob sha>"
+    so a file is only parsed again when its content changes. Files are
+    parsed in-process: with only the import header of each file parsed, a
+    worker pool costs more to feed than it saves.
+    """
+
+    def __init__(self):
+        self.stats = {"files": 0, "bytes": 0, "memoized": 0}
+        self._lock = threading.Lock()
+
+    def extract(self, files, cache=None):
+        """Imports for an iterable of (path, blob SHA or None)
+
+        Returns ({path: set of modules}, files parsed, bytes read); memoized
+        files are neither read nor counted.
+        """
+        results = {}
+        todo = []
+        for path, sha in files:
+            cached = cache.get("imports:" + sha) if cache is not None and sha else None
+            if cached is not None:
+                results[path] = set(cached)
+            else:
+                todo.append((path, sha))
+        size_read = 0
+        for path, sha in todo:
+            modules, size = _safe_imports_of_file(path)
+            results[path] = set(modules)
+            size_read += size
+            if cache is not None and sha:
+                cache.put("imports:" + sha, modules)
+        with self._lock:
+            self.stats["files"] += len(todo)
+            self.stats["bytes"] += size_read
+            self.stats["memoized"] += len(results) - len(todo)
+        return results, len(todo), size_read
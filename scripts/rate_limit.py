@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Rate-Limit-Aware Request Scheduler
+Token bucket driven by X-RateLimit-Remaining/Reset, with Retry-After and
+jittered exponential backoff for secondary rate limits
+"""
+import os
+import random
+import threading
+import time
+
+RESERVE = int(os.environ.get("GITHUB_RATE_RESERVE", "5"))
+MAX_RETRIES = 5
+MAX_WAIT = float(os.environ.get("GITHUB_RATE_MAX_WAIT", "900"))
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+MIN_RATE = 0.01
+# GitHub asks for at most ~80 content-creating requests (pushes, commits) per minute
+CONTENT_RATE = 80 / 60.0
+
+
+class RateLimitScheduler:
+    """Thread-safe token bucket whose budget and refill rate follow the server's quota
+
+    Until the first quota headers arrive the bucket is effectively unlimited.
+    """
+
+    def __init__(self, rate=1000.0, burst=1000, reserve=RESERVE, max_retries=MAX_RETRIES, max_wait=MAX_WAIT):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.reset_at = None
+        self.blocked_until = 0.0
+        self.stats = {"waits": 0, "waited_seconds": 0.0, "retries": 0, "exhausted": 0}
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._cond:
+            waited = 0.0
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    delay = (1 - self.tokens) / self.rate
+                self._cond.wait(delay)
+                waited += time.monotonic() - now
+            if waited:
+                self.stats["waits"] += 1
+                self.stats["waited_seconds"] += waited
+
+    def observe(self, headers):
+        """Re-tune the bucket from the quota headers of a response"""
+        try:
+            remaining = int(headers['x-ratelimit-remaining'])
+            reset = int(headers['x-ratelimit-reset'])
+        except (KeyError, ValueError):
+            return
+        window = max(1.0, reset - time.time())
+        budget = max(0, remaining - self.reserve)
+        with self._cond:
+            self._refill(time.monotonic())
+            if reset != self.reset_at:
+                # New quota window: the whole remaining budget is spendable
+                self.reset_at = reset
+                self.tokens = float(budget)
+            else:
+                self.tokens = min(self.tokens, float(budget))
+            # Plentiful quota -> large bucket, no pacing; scarce quota ->
+            # the leftover budget is spread over the rest of the window.
+            self.capacity = max(1, budget)
+            self.rate = max(MIN_RATE, budget / window)
+            if budget == 0:
+                # Sleep out the window, then let one probe through to learn the new quota
+                self.stats["exhausted"] += 1
+                self.blocked_until = max(self.blocked_until, time.monotonic() + window + 1)
+                self.tokens = 1.0
+            self._cond.notify_all()
+
+    def retry_delay(self, status, headers, body, attempt):
+        """Seconds to wait before retrying a rate-limited response, or None"""
+        if status not in (403, 429) or attempt >= self.max_retries:
+            return None
+        if headers.get('retry-after'):
+            try:
+                delay = float(headers['retry-after'])
+            except ValueError:
+                delay = BACKOFF_BASE
+        elif headers.get('x-ratelimit-remaining') == '0':
+            delay = max(1.0, int(headers.get('x-ratelimit-reset', 0)) - time.time() + 1)
+        elif status == 429 or b'rate limit' in (body or b'').lower():
+            # Secondary limit without guidance: jittered exponential backoff
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+            delay = random.uniform(delay / 2, delay)
+        else:
+            return None  # a genuine permission error
+        if delay > self.max_wait:
+            print(f"Rate limited for {delay:.0f}s (> {self.max_wait:.0f}s budget); giving up")
+            return None
+        return delay
+
+    def pause(self, delay):
+        """Hold back every worker sharing this scheduler for delay seconds"""
+        with self._cond:
+            self.stats["retries"] += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def summary(self):
+        return (f"Rate limiting: {self.stats['waits']} waits "
+                f"({self.stats['waited_seconds']:.1f}s summed over workers), "
+                f"{self.stats['retries']} retries, {self.stats['exhausted']} quota exhaustions")
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_scheduler(name="api", **kwargs):
+    """Process-wide scheduler so every client in a run draws on one quota"""
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = RateLimitScheduler(**kwargs)
+        return _shared[name]
+
+
+def content_scheduler():
+    """Pacer for content-creating operations such as git pushes"""
+    return shared_scheduler("content", rate=CONTENT_RATE, burst=10)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+README Fragments
+The pieces README generators repeat, built once: each project's title and
+citation key once per project, badges once per distinct value, and per-run
+values such as the year once per render_many batch. The READMEs themselves
+stay plain f-strings, which already build each document in one pass.
+"""
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+Fragments = namedtuple('Fragments', 'title citation_key current_year')
+
+
+def title_case(name):
+    """'my-repo_name' -> 'My Repo Name'"""
+    return name.replace('-', ' ').replace('_', ' ').title()
+
+
+def citation_key(name, year):
+    return f"{name.lower().replace('-', '_')}_{year}"
+
+
+@lru_cache(maxsize=256)
+def badge(alt, label, message, color, logo=None):
+    """A flat-square shields.io badge image"""
+    logo = f"&logo={logo}" if logo else ""
+    return f"![{alt}](https://img.shields.io/badge/{label}-{message.replace(' ', '_')}-{color}?style=flat-square{logo})"
+
+
+def project_fragments(name, citation_year, current_year=None):
+    """Fragments of one project's README; current_year only if the caller needs it"""
+    return Fragments(title_case(name), citation_key(name, citation_year), current_year)
+
+
+def render_many(render, projects, citation_year):
+    """render(name, *args, fragments=...) for each (name, *args) in projects
+
+    The per-run fragments are built once for the whole batch.
+    """
+    current_year = time.strftime('%Y')
+    return [render(name, *args, fragments=project_fragments(name, citation_year, current_year))
+            for name, *args in projects]
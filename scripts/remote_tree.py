@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Remote Root Trees
+The top-level entries of a branch, read from the git trees API or from a
+mirror already on disk, so generators can decide whether a repository
+needs writing before they check anything out
+
+A generated file is unchanged when its git blob SHA equals the SHA listed
+for it, which needs neither the remote file's content nor a clone.
+"""
+import base64
+from collections import namedtuple
+
+from analysis_cache import git_blob_sha
+from mirror_store import MirrorError, run_git
+
+Entry = namedtuple('Entry', 'type sha size')
+RootTree = namedtuple('RootTree', 'sha entries')
+
+
+def api_root_tree(client, owner, repo, branch):
+    """RootTree of a branch from GET /git/trees (one revalidated request), or None"""
+    data = client.get_json(f"/repos/{owner}/{repo}/git/trees/{branch}")
+    if not data or 'tree' not in data:
+        return None
+    return RootTree(data['sha'], {entry['path']: Entry(entry['type'], entry['sha'], entry.get('size'))
+                                  for entry in data['tree']})
+
+
+def mirror_root_tree(mirrors, name, url, branch=None):
+    """RootTree of a branch from a mirror already on disk, or None
+
+    The mirror is refreshed with an incremental fetch; a repository without
+    a mirror is never cloned here. Sizes are not listed, since blob-less
+    mirrors would download every blob to report them.
+    """
+    path = mirrors.path(name)
+    if not (path / "HEAD").exists():
+        return None
+    ref = branch or 'HEAD'
+    try:
+        mirrors.sync(name, url)
+        tree = run_git(['rev-parse', f'{ref}^{{tree}}'], cwd=path).strip()
+        listing = run_git(['ls-tree', '-z', ref], cwd=path)
+    except MirrorError:
+        return None
+    entries = {}
+    for record in listing.split('\0'):
+        if '\t' in record:
+            meta, entry_path = record.split('\t', 1)
+            _, kind, sha = meta.split()
+            entries[entry_path] = Entry(kind, sha, None)
+    return RootTree(tree, entries)
+
+
+def root_tree(owner, name, branch, client=None, mirrors=None, url=None):
+    """RootTree from the API, falling back to a cached mirror; None if neither answers
+
+    Without a branch only the mirror's default branch can be listed.
+    """
+    root = api_root_tree(client, owner, name, branch) if client is not None and branch else None
+    if root is None and mirrors is not None and url:
+        root = mirror_root_tree(mirrors, name, url, branch)
+    return root
+
+
+def read_blob(owner, name, sha, client=None, mirrors=None):
+    """Text of a blob from the API or a cached mirror, or None
+
+    Line endings are translated as open() in text mode would.
+    """
+    text = None
+    if client is not None:
+        data = client.get_json(f"/repos/{owner}/{name}/git/blobs/{sha}")
+        if data and data.get('encoding') == 'base64':
+            text = base64.b64decode(data['content']).decode('utf-8', errors='replace')
+    if text is None and mirrors is not None and (mirrors.path(name) / "HEAD").exists():
+        try:
+            text = run_git(['cat-file', 'blob', sha], cwd=mirrors.path(name))
+        except (MirrorError, UnicodeDecodeError):
+            return None
+    return text.replace('\r\n', '\n').replace('\r', '\n') if text is not None else None
+
+
+def file_unchanged(root, content, path='README.md'):
+    """True if root already holds content at path
+
+    Content checked out with CRLF line endings (core.autocrlf on Windows
+    without a .gitattributes rule) counts as the same file.
+    """
+    entry = root.entries.get(path) if root else None
+    if entry is None or entry.type != 'blob':
+        return False
+    return entry.sha in (git_blob_sha(content), git_blob_sha(content.replace('\n', '\r\n')))
@@ -1,34 +1,54 @@
 import json
-import re
-
-def sanitize_string(s):
-    if isinstance(s, str):
-        # Remove non-ascii characters
-        return s.encode('ascii', 'ignore').decode('ascii')
-    return s
-
-def sanitize_data(data):
-    if isinstance(data, dict):
-        return {k: sanitize_data(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [sanitize_data(v) for v in data]
-    elif isinstance(data, str):
-        return sanitize_string(data)
-    else:
-        return data
-
-files = ['_data/projects.json', '_data/research_data.json']
-
-for f_path in files:
-    try:
-        with open(f_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        clean_data = sanitize_data(data)
-        
-        with open(f_path, 'w', encoding='utf-8') as f:
-            json.dump(clean_data, f, indent=2)
+import os
+
+import binary_index
+import unicode_sanitizer
+from doc_shards import INDEX_FILE, PROJECTS_FILE
+
+# The generators transliterate their output as they write it; this pass
+# is for data written by anything else, and rewrites each file in one
+# streaming pass through the shared sanitizer
+FILES = [PROJECTS_FILE, INDEX_FILE, '_data/research_data.json']
+
+
+def sanitize_files(files=FILES, loaded=None):
+    """Transliterate each file to ASCII in place
+
+    loaded maps paths to data already in memory, which is used instead of
+    parsing the file again.
+    """
+    loaded = loaded or {}
+    # A current index sidecar records whether the audit's projects held any
+    # non-ASCII text; if not, projects.json and its index need no rewrite
+    sidecar = binary_index.open_sidecar(INDEX_FILE)
+    already_ascii = sidecar is not None and sidecar.ascii
+    if sidecar is not None:
+        sidecar.close()
+
+    sanitized = set()
+    for f_path in files:
+        if already_ascii and f_path in (PROJECTS_FILE, INDEX_FILE):
+            print(f"{f_path} is already ASCII")
+            continue
+        try:
+            data = loaded.get(f_path)
+            if data is None:
+                with open(f_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
-        print(f"Sanitized {f_path}")
-    except Exception as e:
-        print(f"Error processing {f_path}: {e}")
+            tmp = f_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                unicode_sanitizer.dump(data, f, indent=2)
+            os.replace(tmp, f_path)
+            if f_path == INDEX_FILE:
+                binary_index.write(unicode_sanitizer.sanitize(data), f_path, ascii=PROJECTS_FILE in sanitized)
+            sanitized.add(f_path)
+                
+            print(f"Sanitized {f_path}")
+        except Exception as e:
+            print(f"Error processing {f_path}: {e}")
+    return sanitized
+
+
+if __name__ == "__main__":
+    sanitize_files()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Local Stub GitHub API Server
+Serves a synthetic account over plain HTTP for offline benchmarking
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+USERNAME = "vaishnavak2001"
+
+
+def make_repos(count):
+    """Build a deterministic synthetic repository listing"""
+    kinds = ['detection', 'web-app', 'data-analysis', 'rl-agent', 'toolkit']
+    repos = []
+    for i in range(count):
+        name = f"repo-{i:05d}-{kinds[i % len(kinds)]}"
+        repos.append({
+            "name": name,
+            "full_name": f"{USERNAME}/{name}",
+            "description": f"Synthetic project number {i}" if i % 3 else None,
+            "html_url": f"https://github.com/{USERNAME}/{name}",
+            "clone_url": f"https://github.com/{USERNAME}/{name}.git",
+            "fork": i % 17 == 0,
+            "default_branch": "main",
+            "stargazers_count": i % 7,
+            "forks_count": i % 3,
+            "language": "Python" if i % 2 else "Jupyter Notebook",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+            "pushed_at": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+        })
+    return repos
+
+
+def make_files(repo):
+    """Synthetic file contents for a repository, keyed by path"""
+    i = int(repo['name'].split('-')[1])
+    files = {"README.md": f"# {repo['name']}\n\nA deep learning project using a neural network.\n" * (1 + i % 4)}
+    if i % 2:
+        files["requirements.txt"] = "numpy\npandas\ntensorflow\nflask\n"
+    if i % 5 == 1:
+        files["package.json"] = json.dumps({"dependencies": {"react": "^18.0.0", "express": "^4.0.0"}})
+    if i % 4 == 0:
+        files["Dockerfile"] = "FROM python:3.11\n"
+    if i % 6 == 3:
+        files["backend/requirements.txt"] = "django\nscikit-learn\n"
+    files["src/main.py"] = "import numpy as np\n\nprint(np.zeros(3))\n"
+    return files
+
+
+def blob_sha(text):
+    """Git blob object id for a file's contents"""
+    data = text.encode('utf-8')
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def tree_sha(files):
+    """Stand-in tree object id: a digest of the paths and blob ids of a snapshot"""
+    listing = json.dumps(sorted((path, blob_sha(text)) for path, text in files.items()))
+    return hashlib.sha1(listing.encode('utf-8')).hexdigest()
+
+
+def languages_for(files):
+    langs = {"Python": sum(len(c) for p, c in files.items() if p.endswith('.py'))}
+    if 'package.json' in files:
+        langs["JavaScript"] = 1200
+    return langs
+
+
+def tree_entries(files):
+    """Recursive git tree listing: every directory and blob path"""
+    dirs = sorted({'/'.join(p.split('/')[:i]) for p in files for i in range(1, p.count('/') + 1)})
+    entries = [{"path": d, "type": "tree", "sha": "0" * 40} for d in dirs]
+    entries += [{"path": p, "type": "blob", "sha": blob_sha(c), "size": len(c.encode('utf-8'))}
+                for p, c in sorted(files.items())]
+    return entries
+
+
+def graphql_tree(files):
+    """Root Tree object with one level of subdirectory entries, GraphQL-shaped"""
+    entries = tree_entries(files)
+    def children(prefix):
+        return [{"path": e['path'], "type": e['type']} for e in entries
+                if e['path'].startswith(prefix + '/') and '/' not in e['path'][len(prefix) + 1:]]
+    return {"entries": [
+        {"path": e['path'], "type": e['type'],
+         "object": {"entries": children(e['path'])} if e['type'] == 'tree' else {}}
+        for e in entries if '/' not in e['path']
+    ]}
+
+
+class StubGitHub:
+    """In-memory account state plus a threaded HTTP server exposing it"""
+
+    def __init__(self, repo_count=50, latency=0.0, quota=None, window=60.0, secondary_every=0, race_every=0):
+        self.latency = latency
+        # Quota simulation: `quota` requests per `window` seconds, and a
+        # secondary-limit 403 with Retry-After on every Nth request
+        self.quota = quota
+        self.window = window
+        self.secondary_every = secondary_every
+        self.remaining = quota
+        self.reset_at = time.time() + window
+        self.rejected = 0
+        self.repos = make_repos(repo_count)
+        self.files = {r['name']: make_files(r) for r in self.repos}
+        # Git data: snapshots by tree id, commits by id and each default branch's tip.
+        # Every `race_every`th ref update finds the branch moved by another writer.
+        self.race_every = race_every
+        self.ref_updates = 0
+        self.trees = {}
+        self.commits = {}
+        self.heads = {}
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    def commit(self, files, parents, message):
+        """Store a snapshot and a commit of it, returning the commit id (lock held)"""
+        tree = tree_sha(files)
+        self.trees[tree] = dict(files)
+        sha = hashlib.sha1(json.dumps([tree, parents, message, len(self.commits)]).encode('utf-8')).hexdigest()
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def head(self, name):
+        """Tip of a repository's default branch, created from its files on first use (lock held)"""
+        if name not in self.heads:
+            self.heads[name] = self.commit(self.files[name], [], "initial")
+        return self.heads[name]
+
+    def advance(self, name, sha):
+        """Move the default branch and expose its snapshot to the read endpoints (lock held)"""
+        self.heads[name] = sha
+        self.files[name] = dict(self.trees[self.commits[sha]["tree"]])
+
+    def descends(self, sha, ancestor):
+        pending = [sha]
+        while pending:
+            current = pending.pop()
+            if current == ancestor:
+                return True
+            pending.extend(self.commits.get(current, {}).get("parents", []))
+        return False
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        stub = self
+
+        class Handler(StubHandler):
+            state = stub
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, every
+    # keep-alive response would wait out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def throttle(self):
+        """Apply latency and quota rules; True if the request was rejected"""
+        state = self.state
+        with state.lock:
+            state.request_count += 1
+            count = state.request_count
+            self.rate_headers = {}
+            if state.quota is not None:
+                now = time.time()
+                if now >= state.reset_at:
+                    state.remaining = state.quota
+                    state.reset_at = now + state.window
+                if state.remaining > 0:
+                    state.remaining -= 1
+                    exhausted = False
+                else:
+                    exhausted = True
+                self.rate_headers = {"X-RateLimit-Limit": str(state.quota),
+                                     "X-RateLimit-Remaining": str(state.remaining),
+                                     "X-RateLimit-Reset": str(int(state.reset_at + 0.999))}
+        if state.latency:
+            time.sleep(state.latency)
+        if state.quota is not None and exhausted:
+            state.rejected += 1
+            self.send_json(403, {"message": "API rate limit exceeded"})
+            return True
+        if state.secondary_every and count % state.secondary_every == 0:
+            state.rejected += 1
+            self.send_json(403, {"message": "You have exceeded a secondary rate limit"}, {"Retry-After": "1"})
+            return True
+        return False
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        headers = dict(getattr(self, 'rate_headers', {}), **(headers or {}))
+        if status == 200:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            headers = dict(headers, ETag=etag)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.state
+        if self.throttle():
+            return
+
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        path = parts.path
+
+        if re.fullmatch(r"/users/[^/]+/repos", path):
+            per_page = int(query.get('per_page', 30))
+            page = int(query.get('page', 1))
+            start = (page - 1) * per_page
+            last = max(1, -(-len(state.repos) // per_page))
+            links = []
+            if page < last:
+                base = f"http://{self.headers.get('Host')}{path}?per_page={per_page}"
+                links = [f'<{base}&page={page + 1}>; rel="next"', f'<{base}&page={last}>; rel="last"']
+            return self.send_json(200, state.repos[start:start + per_page],
+                                  {"Link": ", ".join(links)} if links else None)
+
+        match = re.fullmatch(r"/repos/[^/]+/([^/]+)", path)
+        if match and match.group(1) in state.files:
+            return self.send_json(200, next(r for r in state.repos if r['name'] == match.group(1)))
+
+        match = re.fullmatch(r"/repos/[^/]+/([^/]+)/git/(ref/heads/(.+)|commits/(\w+))", path)
+        if match and match.group(1) in state.files:
+            return self.git_data_get(match)
+
+        match = re.fullmatch(r"/repos/[^/]+/([^/]+)/(readme|languages|contents/(.+)|git/trees/(.+)|git/blobs/(\w+))", path)
+        if not match or match.group(1) not in state.files:
+            return self.send_json(404, {"message": "Not Found"})
+        files = state.files[match.group(1)]
+
+        if match.group(4):
+            return self.send_json(200, {"sha": tree_sha(files), "truncated": False, "tree": tree_entries(files)})
+        if match.group(5):
+            text = next((c for c in files.values() if blob_sha(c) == match.group(5)), None)
+            if text is None:
+                return self.send_json(404, {"message": "Not Found"})
+            content = base64.b64encode(text.encode('utf-8')).decode('ascii')
+            return self.send_json(200, {"sha": match.group(5), "encoding": "base64", "content": content})
+
+        if match.group(2) == 'languages':
+            return self.send_json(200, languages_for(files))
+
+        file_path = 'README.md' if match.group(2) == 'readme' else match.group(3)
+        if file_path not in files:
+            return self.send_json(404, {"message": "Not Found"})
+        content = base64.b64encode(files[file_path].encode('utf-8')).decode('ascii')
+        return self.send_json(200, {"path": file_path, "encoding": "base64", "content": content})
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+
+    def do_POST(self):
+        if self.throttle():
+            return
+        if self.path == '/graphql':
+            return self.send_json(200, self.graphql(self.read_body()))
+        match = re.fullmatch(r"/repos/[^/]+/([^/]+)/git/(trees|commits)", self.path)
+        if match and match.group(1) in self.state.files:
+            return self.git_data_create(match.group(1), match.group(2), self.read_body())
+        return self.send_json(404, {"message": "Not Found"})
+
+    def do_PATCH(self):
+        if self.throttle():
+            return
+        match = re.fullmatch(r"/repos/[^/]+/([^/]+)/git/refs/heads/(.+)", self.path)
+        if not match or match.group(1) not in self.state.files:
+            return self.send_json(404, {"message": "Not Found"})
+        return self.git_ref_update(match.group(1), match.group(2), self.read_body())
+
+    def default_branch(self, name):
+        return next(r['default_branch'] for r in self.state.repos if r['name'] == name)
+
+    def git_data_get(self, match):
+        state = self.state
+        name = match.group(1)
+        with state.lock:
+            if match.group(3) is not None:
+                if match.group(3) != self.default_branch(name):
+                    return self.send_json(404, {"message": "Not Found"})
+                sha = state.head(name)
+                return self.send_json(200, {"ref": f"refs/heads/{match.group(3)}",
+                                            "object": {"type": "commit", "sha": sha}})
+            commit = state.commits.get(match.group(4))
+            if commit is None:
+                return self.send_json(404, {"message": "Not Found"})
+            return self.send_json(200, {"sha": match.group(4), "message": commit["message"],
+                                        "tree": {"sha": commit["tree"]},
+                                        "parents": [{"sha": p} for p in commit["parents"]]})
+
+    def git_data_create(self, name, kind, body):
+        state = self.state
+        with state.lock:
+            if kind == 'trees':
+                files = dict(state.trees.get(body.get('base_tree'), {}))
+                for entry in body.get('tree', []):
+                    if 'content' not in entry:
+                        return self.send_json(422, {"message": "Only inline content is supported"})
+                    files[entry['path']] = entry['content']
+                sha = tree_sha(files)
+                state.trees[sha] = files
+                return self.send_json(201, {"sha": sha})
+            if body.get('tree') not in state.trees or any(p not in state.commits for p in body.get('parents', [])):
+                return self.send_json(422, {"message": "Tree or parent not found"})
+            sha = state.commit(state.trees[body['tree']], body.get('parents', []), body.get('message', ''))
+            return self.send_json(201, {"sha": sha, "tree": {"sha": body['tree']}})
+
+    def git_ref_update(self, name, branch, body):
+        state = self.state
+        with state.lock:
+            if branch != self.default_branch(name) or body.get('sha') not in state.commits:
+                return self.send_json(422, {"message": "Reference update failed"})
+            state.ref_updates += 1
+            if state.race_every and state.ref_updates % state.race_every == 0:
+                # Another writer lands first
+                current = state.head(name)
+                files = dict(state.trees[state.commits[current]["tree"]])
+                files["CHANGELOG.md"] = files.get("CHANGELOG.md", "") + f"- change {state.ref_updates}\n"
+                state.advance(name, state.commit(files, [current], "concurrent change"))
+            if not body.get('force') and not state.descends(body['sha'], state.head(name)):
+                return self.send_json(422, {"message": "Update is not a fast forward"})
+            state.advance(name, body['sha'])
+            return self.send_json(200, {"ref": f"refs/heads/{branch}",
+                                        "object": {"type": "commit", "sha": body['sha']}})
+
+    def graphql(self, payload):
+        """Answer the batch repository queries; blob aliases are read from the query text"""
+        query = self.query = payload.get('query', '')
+        variables = payload.get('variables') or {}
+        aliases = re.findall(r'(\w+): object\(expression: "HEAD:([^"]+)"\)', query)
+        by_name = {r['name']: r for r in self.state.repos}
+
+        lookups = re.findall(r'(\w+): repository\(owner: \$login, name: "([^"]+)"\) \{ (\S+)', query)
+        if lookups:
+            data = {}
+            for alias, name, first_field in lookups:
+                if name not in by_name:
+                    data[alias] = None
+                elif first_field == '...RepoFields':
+                    data[alias] = self.graphql_node(by_name[name], aliases)
+                else:
+                    files = self.state.files[name]
+                    data[alias] = {a: ({"text": files[p]} if p in files else None) for a, p in aliases}
+            return {"data": data}
+
+        repos = sorted(self.state.repos, key=lambda r: r['name'].lower())
+        start = int(variables.get('after') or 0)
+        end = start + int(variables.get('first', 30))
+        return {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": end < len(repos), "endCursor": str(end)},
+            "nodes": [self.graphql_node(repo, aliases) for repo in repos[start:end]],
+        }}}}
+
+    def graphql_node(self, repo, aliases):
+        files = self.state.files[repo['name']]
+        node = {
+            "name": repo['name'],
+            "description": repo['description'],
+            "url": repo['html_url'],
+            "isFork": repo['fork'],
+            "stargazerCount": repo['stargazers_count'],
+            "forkCount": repo['forks_count'],
+            "createdAt": repo['created_at'],
+            "updatedAt": repo['updated_at'],
+            "pushedAt": repo['pushed_at'],
+            "defaultBranchRef": {"name": repo['default_branch']},
+            "languages": {"edges": [{"size": size, "node": {"name": name}}
+                                    for name, size in languages_for(files).items()]},
+        }
+        for alias, path in aliases:
+            node[alias] = {"text": files[path]} if path in files else None
+        if 'tree: object(expression: "HEAD:")' in self.query:
+            node["tree"] = graphql_tree(files)
+        return node
+
+if __name__ == "__main__":
+    with StubGitHub(repo_count=300) as stub:
+        print(f"Stub GitHub API listening on {stub.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
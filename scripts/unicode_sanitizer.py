@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unicode Sanitizer
+Transliterates text to ASCII ("é" becomes "e", "—" becomes "-") with one
+precomputed str.translate table: the ASCII part of each character's NFKD
+decomposition, plus a mapping for characters NFKD does not fold. Anything
+with no ASCII form is dropped, as encode('ascii', 'ignore') did.
+
+The table is applied through an ASCII codec error handler, so ASCII text
+is copied at C speed and only runs of other characters are translated.
+dump()/dumps() apply it while serializing JSON: objects are encoded as
+they are, nothing is walked or rebuilt beforehand. JSON syntax outside
+strings is ASCII, so every run translated lies inside a string; that
+table's replacements are JSON-escaped accordingly.
+"""
+import codecs
+import json
+import unicodedata
+
+# Characters whose NFKD decomposition has no ASCII part, or the wrong one
+MAPPING = {
+    'ß': 'ss', 'Æ': 'AE', 'æ': 'ae', 'Œ': 'OE', 'œ': 'oe', 'Ø': 'O', 'ø': 'o',
+    'Ł': 'L', 'ł': 'l', 'Đ': 'D', 'đ': 'd', 'Ð': 'D', 'ð': 'd', 'Þ': 'Th', 'þ': 'th', 'ı': 'i',
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'", '“': '"', '”': '"', '„': '"', '″': '"',
+    '«': '<<', '»': '>>', '‹': '<', '›': '>',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-', '−': '-',
+    '⁄': '/', '•': '*', '·': '.', '×': 'x', '÷': '/', '©': '(c)', '®': '(R)', '€': 'EUR',
+    '→': '->', '←': '<-', '↔': '<->', '⇒': '=>', '≤': '<=', '≥': '>=', '≠': '!=',
+}
+# Precomputed for Latin, punctuation, symbols and arrows; other characters are folded on first sight
+PRECOMPUTED = range(0x80, 0x2500)
+
+
+def fold(char):
+    """ASCII form of one character, '' if it has none"""
+    if char in MAPPING:
+        return MAPPING[char]
+    return ''.join(c if c.isascii() else MAPPING.get(c, '') for c in unicodedata.normalize('NFKD', char))
+
+
+class _Table(dict):
+    """code point -> ASCII replacement; filled for PRECOMPUTED, extended on misses"""
+
+    def __init__(self, escape):
+        super().__init__()
+        self.escape = escape
+        for code in PRECOMPUTED:
+            self[code]
+
+    def __missing__(self, code):
+        if code < 0x80:
+            raise LookupError(code)
+        value = fold(chr(code))
+        if self.escape:
+            value = json.dumps(value)[1:-1]
+        self[code] = value
+        return value
+
+
+TEXT_TABLE = _Table(escape=False)
+JSON_TABLE = _Table(escape=True)
+
+
+def _error_handler(table):
+    def translate_run(error):
+        return error.object[error.start:error.end].translate(table), error.end
+    return translate_run
+
+
+codecs.register_error('transliterate', _error_handler(TEXT_TABLE))
+codecs.register_error('transliterate-json', _error_handler(JSON_TABLE))
+
+
+def transliterate(text):
+    if text.isascii():
+        return text
+    return text.encode('ascii', 'transliterate').decode('ascii')
+
+
+def _ascii_json(text):
+    if text.isascii():
+        return text
+    return text.encode('ascii', 'transliterate-json').decode('ascii')
+
+
+def sanitize(obj):
+    """obj with every string transliterated, for callers that need the objects themselves"""
+    if isinstance(obj, str):
+        return transliterate(obj)
+    if isinstance(obj, list):
+        return [sanitize(item) for item in obj]
+    if isinstance(obj, dict):
+        return {sanitize(key): sanitize(value) for key, value in obj.items()}
+    return obj
+
+
+def dumps(obj, indent=None):
+    """json.dumps(sanitize(obj), indent=indent), in one pass"""
+    return _ascii_json(json.dumps(obj, indent=indent, ensure_ascii=False))
+
+
+def dump(obj, fp, indent=None):
+    """json.dump(sanitize(obj), fp, indent=indent), streamed chunk by chunk"""
+    for chunk in json.JSONEncoder(indent=indent, ensure_ascii=False).iterencode(obj):
+        fp.write(_ascii_json(chunk))